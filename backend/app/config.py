@@ -9,15 +9,33 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 class Settings(BaseSettings):
     # ── Database ──────────────────────────────────────────────
     DATABASE_URL: str = f"sqlite:///{BASE_DIR / 'oneresume.db'}"
+    SQLITE_PROFILE: str = "production"  # "production" (WAL and pragmas) or "basic"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # how long a writer waits for the write lock
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_CACHE_SIZE_MB: int = 64  # page cache per connection
+    CACHE_DB_POOL_SIZE: int = 4  # separate connections for the embedding and stage caches
+    CACHE_DB_POOL_TIMEOUT_S: float = 2  # past this a cache lookup counts as a miss
 
     # ── Gemini LLM ────────────────────────────────────────────
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-3-flash-preview"
+    GEMINI_TIMEOUT_S: float = 30  # per-call cap, shortened further by a request deadline
+    GEMINI_MIN_BUDGET_MS: int = 1500  # below this remaining budget, use the local fallback up front
+    STAGE_CACHE_ENABLED: bool = True  # reuse JD analyses and bullet rewrites across generations
+    STAGE_CACHE_SIZE: int = 2048  # in-process LRU entries in front of the DB cache
 
-    # ── Pinecone Embeddings ──────────────────────────────────
+    # ── Embeddings ───────────────────────────────────────────
+    EMBEDDING_PROVIDER: str = "pinecone"  # pinecone | local (offline hashed n-grams)
     PINECONE_API_KEY: str = ""
     EMBEDDING_MODEL: str = "multilingual-e5-large"
     EMBEDDING_DIM: int = 1024
+    EMBEDDING_BATCH_SIZE: int = 96  # max texts per provider request
+    EMBEDDING_BATCH_WINDOW_MS: float = 10  # coalescing window for concurrent calls; 0 disables
+    EMBEDDING_BATCH_FLUSHES: int = 4  # coalesced provider requests in flight at once
+    EMBEDDING_TIMEOUT_S: float = 30  # provider request timeout (Pinecone's client default)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_SIZE: int = 4096  # in-process LRU entries in front of the DB cache
+    PROFILE_MATRIX_CACHE_MB: int = 64  # decoded per-profile bullet matrices
 
     # ── Resume constraints ────────────────────────────────────
     MAX_EXPERIENCE_SECTIONS: int = 3
@@ -25,6 +43,31 @@ class Settings(BaseSettings):
     MAX_BULLETS_PER_SECTION: int = 4
     MAX_SKILLS: int = 12
 
+    # ── Background generation jobs ────────────────────────────
+    JOB_WORKERS: int = 2  # concurrent generate_resume runs
+    JOB_MAX_PENDING: int = 100  # queued + running jobs before submit returns 503
+    JOB_LEASE_S: float = 60  # a running job not renewed for this long is recovered
+    JOB_HEARTBEAT_S: float = 15  # how often a process renews its running jobs' leases
+
+    # ── Batch generation ──────────────────────────────────────
+    BATCH_MAX_JDS: int = 50  # JDs per /generate/batch call
+    BATCH_CONCURRENCY: int = 4  # Gemini / embedding calls in flight per batch
+
+    # ── Circuit breakers (Gemini, Pinecone) ───────────────────
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_WINDOW_S: float = 60  # outcomes older than this are forgotten
+    CIRCUIT_MIN_CALLS: int = 5  # calls in the window before the breaker may open
+    CIRCUIT_FAILURE_RATE: float = 0.5  # share of failed or slow calls that opens it
+    CIRCUIT_SLOW_CALL_MS: int = 15000  # a call slower than this counts as failed
+    CIRCUIT_OPEN_S: float = 30  # fail fast this long, then let one probe call through
+
+    # ── Latency budget ────────────────────────────────────────
+    DEFAULT_DEADLINE_MS: int = 0  # budget when a request sends no X-Deadline-Ms; 0 = none
+    PDFLATEX_TIMEOUT_S: float = 30  # cap on one pdflatex run, shortened by a request deadline
+
+    # ── Observability ─────────────────────────────────────────
+    SLOW_REQUEST_MS: int = 10000  # log per-stage breakdown of requests/runs slower than this
+
     # ── File storage ──────────────────────────────────────────
     OUTPUT_DIR: str = str(BASE_DIR / "output")
 
@@ -1,20 +1,77 @@
-"""SQLAlchemy engine, session, and declarative base."""
+"""SQLAlchemy engine, session, and declarative base.
 
-from sqlalchemy import create_engine
+SQLite runs in one of two profiles (``SQLITE_PROFILE``):
+  - "production": every connection gets WAL journaling, synchronous=NORMAL,
+    foreign keys, a memory map, a larger page cache and a busy timeout
+  - "basic": the driver defaults (rollback journal, no busy handling)
+Other databases ignore the profile. Request sessions use SQLAlchemy's
+default pool; the caches have a small pool of their own (``cache_engine``).
+"""
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # needed for SQLite
-    if "sqlite" in settings.DATABASE_URL
-    else {},
-    echo=False,
-)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_MB) * 1024}")  # in KiB
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = settings.DATABASE_URL,
+                     sqlite_profile: str = settings.SQLITE_PROFILE, **pool) -> Engine:
+    """Engine for ``url``, with the SQLite profile applied to file databases.
+
+    ``pool`` (``pool_size``, ``max_overflow``, ``pool_timeout``) overrides
+    SQLAlchemy's pool defaults.
+    """
+    if "sqlite" not in url:
+        return create_engine(url, echo=False, **pool)
+
+    if ":memory:" in url:
+        return create_engine(url, connect_args={"check_same_thread": False}, echo=False)
+    if sqlite_profile == "basic":
+        return create_engine(url, connect_args={"check_same_thread": False}, echo=False, **pool)
+    if sqlite_profile != "production":
+        raise ValueError(f"Unknown SQLITE_PROFILE: {sqlite_profile!r}")
+
+    engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,  # sessions move between worker threads
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        echo=False,
+        **pool,
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The embedding and stage caches are looked up in the middle of requests
+# that already hold a connection. A small pool of their own keeps every
+# generation at one request connection; their queries are short, so few
+# connections serve many requests.
+cache_engine = create_db_engine(
+    pool_size=settings.CACHE_DB_POOL_SIZE, max_overflow=0,
+    pool_timeout=settings.CACHE_DB_POOL_TIMEOUT_S,
+)
+CacheSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=cache_engine)
+
 
 class Base(DeclarativeBase):
     pass
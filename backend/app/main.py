@@ -1,18 +1,37 @@
 """FastAPI application entry point."""
 
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.database import engine, Base
+from app.migrations import run_migrations
 from app.routers import users, profiles, jd, resumes
+from app.services import metrics
+from app.services.circuit_breaker import OPEN, circuit_breakers
+from app.services.job_queue import job_queue
 
 # Create all tables on startup (dev convenience; use Alembic in production)
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume generation jobs interrupted by the last shutdown
+    job_queue.recover()
+    yield
+    job_queue.shutdown(wait=False)
+
 
 app = FastAPI(
     title="OneResume",
     description="AI-Powered Role-Specific Resume Generation Platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,6 +42,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def _route_label(request: Request) -> str:
+    """Path template of the matched route, e.g. /api/resumes/{resume_id}.
+
+    Depending on the FastAPI version, the route of an included router
+    carries either the full template or only the part after the router
+    prefix; the static prefix is taken from the request path.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path.strip("/").split("/") if route.path.strip("/") else []
+    segments = request.url.path.strip("/").split("/")
+    prefix = segments[:max(0, len(segments) - len(template))]
+    return "/" + "/".join(prefix + template)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    with metrics.request_scope() as traces:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            metrics.observe_request(
+                request.method, _route_label(request),
+                status, time.perf_counter() - start, traces,
+            )
+
+
 # ── Routers ───────────────────────────────────────────────────
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(profiles.router, prefix="/api/profiles", tags=["Profiles"])
@@ -30,6 +82,15 @@ app.include_router(jd.router, prefix="/api/jd", tags=["Job Descriptions"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["Resumes"])
 
 
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Pipeline, outbound-call and HTTP metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/", tags=["Health"])
 def health_check():
-    return {"status": "ok", "app": "OneResume"}
+    """Liveness plus circuit breaker state; ``degraded`` while a breaker is open."""
+    circuits = circuit_breakers.states()
+    status = "degraded" if OPEN in circuits.values() else "ok"
+    return {"status": status, "app": "OneResume", "circuits": circuits}
@@ -0,0 +1,156 @@
+"""Startup migrations for existing databases.
+
+``Base.metadata.create_all`` creates missing tables but never touches
+existing ones. Each migration below upgrades an older database in place;
+applied migrations are recorded in ``schema_migrations`` so every step runs
+exactly once. Migrations must be idempotent in case a run is interrupted.
+"""
+
+import logging
+
+from sqlalchemy import text, inspect
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.schema_migration import SchemaMigration
+from app.services.embedding_service import embedding_from_json, embedding_to_blob
+
+logger = logging.getLogger(__name__)
+
+_BATCH = 500
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Migrations
+# ═══════════════════════════════════════════════════════════════
+
+
+# (table, primary key, column) pairs that moved from JSON text to float32 BLOBs
+_EMBEDDING_COLUMNS = [
+    ("experience_bullets", "id", "embedding"),
+    ("project_bullets", "id", "embedding"),
+    ("experience", "id", "experience_embedding"),
+    ("jd_analysis", "id", "embedding"),
+    ("embedding_cache", "key", "embedding"),
+]
+
+
+def _embeddings_to_blob(conn: Connection):
+    """Rewrite JSON-array embeddings as little-endian float32 BLOBs.
+
+    SQLite's TEXT affinity stores BLOBs verbatim, so no column rebuild is
+    needed — only the values change. Other backends need a column type
+    change first and are left to a manual ALTER.
+    """
+    if conn.dialect.name != "sqlite":
+        logger.warning("Skipping embedding BLOB migration on %s", conn.dialect.name)
+        return
+
+    for table, pk, column in _EMBEDDING_COLUMNS:
+        converted = 0
+        while True:
+            rows = conn.execute(text(
+                f"SELECT {pk}, {column} FROM {table} "
+                f"WHERE typeof({column}) = 'text' LIMIT {_BATCH}"
+            )).all()
+            if not rows:
+                break
+            for row_id, raw in rows:
+                try:
+                    vector = embedding_from_json(raw)
+                    blob = embedding_to_blob(vector) if vector is not None else None
+                except ValueError:
+                    blob = None  # unreadable — will be regenerated on next use
+                conn.execute(
+                    text(f"UPDATE {table} SET {column} = :blob WHERE {pk} = :id"),
+                    {"blob": blob, "id": row_id},
+                )
+            converted += len(rows)
+        if converted:
+            logger.info("Converted %d %s.%s embeddings to float32", converted, table, column)
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl: str):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _profile_content_version(conn: Connection):
+    """Add the profile version stamp used to invalidate derived caches."""
+    _add_column(conn, "profiles", "content_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _resume_input_hash(conn: Connection):
+    """Add the generation result-cache key to resumes, and the force flag to jobs."""
+    _add_column(conn, "resumes", "input_hash", "VARCHAR(64)")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_resumes_input_hash ON resumes (input_hash)"
+    ))
+    _add_column(conn, "generation_jobs", "force", "BOOLEAN NOT NULL DEFAULT 0")
+
+
+# (index, table, columns) for foreign keys and the resume version lookup;
+# names match what the models declare so create_all and this agree
+_FOREIGN_KEY_INDEXES = [
+    ("ix_profiles_user_id", "profiles", "user_id"),
+    ("ix_education_profile_id", "education", "profile_id"),
+    ("ix_skills_profile_id", "skills", "profile_id"),
+    ("ix_experience_profile_id", "experience", "profile_id"),
+    ("ix_experience_bullets_experience_id", "experience_bullets", "experience_id"),
+    ("ix_projects_profile_id", "projects", "profile_id"),
+    ("ix_project_bullets_project_id", "project_bullets", "project_id"),
+    ("ix_certifications_profile_id", "certifications", "profile_id"),
+    ("ix_achievements_profile_id", "achievements", "profile_id"),
+    ("ix_external_profiles_profile_id", "external_profiles", "profile_id"),
+    ("ix_resumes_jd_id", "resumes", "jd_id"),
+    ("ix_resumes_profile_title_version", "resumes", "profile_id, job_title, version"),
+    ("ix_resume_sections_resume_id", "resume_sections", "resume_id"),
+    ("ix_generation_jobs_profile_id", "generation_jobs", "profile_id"),
+]
+
+
+def _foreign_key_indexes(conn: Connection):
+    """Index foreign keys so profile loads and version lookups stop scanning."""
+    for name, table, columns in _FOREIGN_KEY_INDEXES:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def _generation_job_lease(conn: Connection):
+    """Add the claiming queue and its lease to generation jobs."""
+    _add_column(conn, "generation_jobs", "owner", "VARCHAR(64)")
+    _add_column(conn, "generation_jobs", "lease_expires_at", "DATETIME")
+
+
+MIGRATIONS = [
+    ("0001_embeddings_to_float32_blob", _embeddings_to_blob),
+    ("0002_profile_content_version", _profile_content_version),
+    ("0003_resume_input_hash", _resume_input_hash),
+    ("0004_foreign_key_indexes", _foreign_key_indexes),
+    ("0005_generation_job_lease", _generation_job_lease),
+]
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Runner
+# ═══════════════════════════════════════════════════════════════
+
+
+def run_migrations(engine: Engine):
+    """Apply all pending migrations, each in its own transaction."""
+    SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+
+    with engine.connect() as conn:
+        applied = {
+            name for (name,) in conn.execute(
+                text("SELECT name FROM schema_migrations")
+            )
+        }
+
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        logger.info("Applying migration %s", name)
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(SchemaMigration.__table__.insert().values(name=name))
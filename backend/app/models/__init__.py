@@ -6,10 +6,15 @@ from app.models.profile import (
 )
 from app.models.jd import JDAnalysis
 from app.models.resume import Resume, ResumeSection
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.models.schema_migration import SchemaMigration
+from app.models.generation_job import GenerationJob
+from app.models.stage_cache import StageCacheEntry
 
 __all__ = [
     "User", "Profile", "Education", "Skill", "Experience",
     "ExperienceBullet", "Project", "ProjectBullet", "Certification",
     "Achievement", "ExternalProfile", "PersonalInfo",
-    "JDAnalysis", "Resume", "ResumeSection",
+    "JDAnalysis", "Resume", "ResumeSection", "EmbeddingCacheEntry",
+    "SchemaMigration", "GenerationJob", "StageCacheEntry",
 ]
@@ -0,0 +1,20 @@
+"""Content-addressed embedding cache model."""
+
+from datetime import datetime, timezone
+from sqlalchemy import String, DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    # sha256 of (model, input_type, normalized text)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100))
+    input_type: Mapped[str] = mapped_column(String(20))
+    embedding: Mapped[bytes] = mapped_column(LargeBinary)  # float32 BLOB
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,29 @@
+"""Background resume-generation job model."""
+
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Boolean, String, Text, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
+    jd_text: Mapped[str] = mapped_column(Text)
+    force: Mapped[bool] = mapped_column(Boolean, default=False, server_default="0")
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued, running, succeeded, failed
+    result: Mapped[str] = mapped_column(Text, nullable=True)  # JSON, same shape as /generate
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    owner: Mapped[str] = mapped_column(String(64), nullable=True)  # queue instance that claimed it
+    lease_expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)  # renewed while running
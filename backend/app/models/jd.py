@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Text, DateTime
+from sqlalchemy import String, Text, DateTime, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -16,7 +16,7 @@ class JDAnalysis(Base):
     )
     raw_text: Mapped[str] = mapped_column(Text, nullable=True)
     structured_data: Mapped[str] = mapped_column(Text)  # JSONB → Text/JSON for SQLite
-    embedding: Mapped[str] = mapped_column(Text, nullable=True)  # JSON array
+    embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)  # float32 BLOB
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
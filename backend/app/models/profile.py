@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Float
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Float, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -23,11 +23,13 @@ class Profile(Base):
     __tablename__ = "profiles"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=_utcnow, onupdate=_utcnow
     )
+    # Bumped on every section write; stamps derived caches (see profile_matrix_cache)
+    content_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     user = relationship("User", back_populates="profiles")
     education = relationship("Education", back_populates="profile", cascade="all, delete-orphan")
@@ -48,7 +50,7 @@ class Education(Base):
     __tablename__ = "education"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     institution: Mapped[str] = mapped_column(String(255))
     degree: Mapped[str] = mapped_column(String(255))
     field_of_study: Mapped[str] = mapped_column(String(255), nullable=True)
@@ -66,7 +68,7 @@ class Skill(Base):
     __tablename__ = "skills"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     skill_name: Mapped[str] = mapped_column(String(100))
     skill_category: Mapped[str] = mapped_column(String(100), nullable=True)
 
@@ -80,12 +82,12 @@ class Experience(Base):
     __tablename__ = "experience"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     company: Mapped[str] = mapped_column(String(255))
     role: Mapped[str] = mapped_column(String(255))
     start_date: Mapped[str] = mapped_column(String(20), nullable=True)  # YYYY-MM
     end_date: Mapped[str] = mapped_column(String(20), nullable=True)  # YYYY-MM or "Present"
-    experience_embedding: Mapped[str] = mapped_column(Text, nullable=True)  # JSON array
+    experience_embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)  # float32 BLOB
 
     profile = relationship("Profile", back_populates="experience")
     bullets = relationship("ExperienceBullet", back_populates="experience", cascade="all, delete-orphan")
@@ -95,9 +97,9 @@ class ExperienceBullet(Base):
     __tablename__ = "experience_bullets"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    experience_id: Mapped[str] = mapped_column(ForeignKey("experience.id", ondelete="CASCADE"))
+    experience_id: Mapped[str] = mapped_column(ForeignKey("experience.id", ondelete="CASCADE"), index=True)
     bullet_text: Mapped[str] = mapped_column(Text)
-    embedding: Mapped[str] = mapped_column(Text, nullable=True)  # JSON array of floats
+    embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)  # float32 BLOB
 
     experience = relationship("Experience", back_populates="bullets")
 
@@ -109,7 +111,7 @@ class Project(Base):
     __tablename__ = "projects"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     project_title: Mapped[str] = mapped_column(String(255))
     description: Mapped[str] = mapped_column(Text, nullable=True)
     tech_stack: Mapped[str] = mapped_column(Text, nullable=True)  # comma-separated
@@ -122,9 +124,9 @@ class ProjectBullet(Base):
     __tablename__ = "project_bullets"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True)
     bullet_text: Mapped[str] = mapped_column(Text)
-    embedding: Mapped[str] = mapped_column(Text, nullable=True)  # JSON array of floats
+    embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)  # float32 BLOB
 
     project = relationship("Project", back_populates="bullets")
 
@@ -136,7 +138,7 @@ class Certification(Base):
     __tablename__ = "certifications"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     name: Mapped[str] = mapped_column(String(255))
     issuing_organization: Mapped[str] = mapped_column(String(255), nullable=True)
     year: Mapped[int] = mapped_column(Integer, nullable=True)
@@ -151,7 +153,7 @@ class Achievement(Base):
     __tablename__ = "achievements"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     title: Mapped[str] = mapped_column(String(255))
     description: Mapped[str] = mapped_column(Text, nullable=True)
     category: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -166,7 +168,7 @@ class ExternalProfile(Base):
     __tablename__ = "external_profiles"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
-    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
+    profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), index=True)
     platform: Mapped[str] = mapped_column(String(100))
     profile_url: Mapped[str] = mapped_column(String(500))
 
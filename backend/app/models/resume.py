@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -10,15 +10,21 @@ from app.database import Base
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Also serves lookups by profile_id alone (leftmost column)
+        Index("ix_resumes_profile_title_version", "profile_id", "job_title", "version"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
     )
     profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"))
-    jd_id: Mapped[str] = mapped_column(ForeignKey("jd_analysis.id"), nullable=True)
+    jd_id: Mapped[str] = mapped_column(ForeignKey("jd_analysis.id"), nullable=True, index=True)
     job_title: Mapped[str] = mapped_column(String(255))
     version: Mapped[int] = mapped_column(Integer, default=1)
     file_path: Mapped[str] = mapped_column(String(500), nullable=True)
+    # Hash of (profile content version, normalized JD, generation settings)
+    input_hash: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
@@ -33,7 +39,7 @@ class ResumeSection(Base):
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
     )
-    resume_id: Mapped[str] = mapped_column(ForeignKey("resumes.id", ondelete="CASCADE"))
+    resume_id: Mapped[str] = mapped_column(ForeignKey("resumes.id", ondelete="CASCADE"), index=True)
     section_type: Mapped[str] = mapped_column(String(50))  # education, experience, etc.
     content: Mapped[str] = mapped_column(Text)  # JSON
     confidence_flags: Mapped[str] = mapped_column(Text, nullable=True)  # JSON
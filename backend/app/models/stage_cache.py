@@ -0,0 +1,19 @@
+"""Cached outputs of expensive generation stages."""
+
+from datetime import datetime, timezone
+from sqlalchemy import String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class StageCacheEntry(Base):
+    __tablename__ = "stage_cache"
+
+    # sha256 of (stage, stage inputs)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    stage: Mapped[str] = mapped_column(String(50))  # jd_analysis, rewrite
+    value: Mapped[str] = mapped_column(Text)  # JSON
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
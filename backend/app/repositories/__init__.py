@@ -1,6 +1,15 @@
-"""CRUD repositories for all entities."""
+"""CRUD repositories for all entities.
 
-from sqlalchemy.orm import Session
+Each write method commits on its own, unless it runs inside
+``unit_of_work(db)``: then it only flushes (so ids are assigned) and the
+block commits everything once at the end.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.user import User
 from app.models.profile import (
@@ -10,6 +19,7 @@ from app.models.profile import (
 )
 from app.models.jd import JDAnalysis
 from app.models.resume import Resume, ResumeSection
+from app.models.generation_job import GenerationJob
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -25,6 +35,82 @@ def _get_or_404(db: Session, model, id: str):
     return obj
 
 
+_UOW_DEPTH = "unit_of_work_depth"  # key in Session.info
+
+
+@contextmanager
+def unit_of_work(db: Session):
+    """Run repository writes as one transaction.
+
+    Inside the block, repositories flush instead of committing; the
+    outermost block commits once on success and rolls back on error.
+    Blocks may nest.
+    """
+    depth = db.info.get(_UOW_DEPTH, 0)
+    db.info[_UOW_DEPTH] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+    except BaseException:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        db.info[_UOW_DEPTH] = depth
+
+
+def _save(db: Session, *objs):
+    """Commit and refresh ``objs`` — or only flush inside a unit of work."""
+    if db.info.get(_UOW_DEPTH):
+        db.flush()
+        return
+    db.commit()
+    for obj in objs:
+        db.refresh(obj)
+
+
+def _bump_profile_version(db: Session, profile_id: str | None):
+    """Stamp a profile as changed; flushed with the caller's commit."""
+    if not profile_id:
+        return
+    db.query(Profile).filter(Profile.id == profile_id).update(
+        {Profile.content_version: Profile.content_version + 1},
+        synchronize_session=False,
+    )
+
+
+def _parent_profile_id(ParentModel):
+    """Resolve the owning profile of a bullet through its parent section."""
+    def resolve(db: Session, parent_id: str) -> str | None:
+        return db.query(ParentModel.profile_id).filter(
+            ParentModel.id == parent_id
+        ).scalar()
+    return resolve
+
+
+def _same_id(db: Session, parent_id: str) -> str:
+    return parent_id
+
+
+def _drop_stale_embeddings(db: Session, obj, new_text: str | None = None):
+    """Clear vectors derived from a bullet whose text changes or goes away.
+
+    The bullet is re-embedded on the next generation (a cache hit if the
+    text was seen before); an experience centroid is recomputed from its
+    bullets whenever it is missing.
+    """
+    if not isinstance(obj, (ExperienceBullet, ProjectBullet)):
+        return
+    if new_text is not None and new_text == obj.bullet_text:
+        return
+    obj.embedding = None
+    if isinstance(obj, ExperienceBullet):
+        db.query(Experience).filter(Experience.id == obj.experience_id).update(
+            {Experience.experience_embedding: None}, synchronize_session=False,
+        )
+
+
 # ═══════════════════════════════════════════════════════════════
 #  User Repository
 # ═══════════════════════════════════════════════════════════════
@@ -35,8 +121,7 @@ class UserRepository:
     def create(db: Session, username: str, email: str, password_hash: str) -> User:
         user = User(username=username, email=email, password_hash=password_hash)
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        _save(db, user)
         return user
 
     @staticmethod
@@ -55,7 +140,7 @@ class UserRepository:
     def delete(db: Session, user_id: str):
         user = _get_or_404(db, User, user_id)
         db.delete(user)
-        db.commit()
+        _save(db)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -63,20 +148,46 @@ class UserRepository:
 # ═══════════════════════════════════════════════════════════════
 
 
+# Every section ProfileOut and the generation pipeline read, bullets included:
+# one SELECT per relationship however many sections the profile has
+_FULL_PROFILE = (
+    selectinload(Profile.personal_info),
+    selectinload(Profile.education),
+    selectinload(Profile.skills),
+    selectinload(Profile.experience).selectinload(Experience.bullets),
+    selectinload(Profile.projects).selectinload(Project.bullets),
+    selectinload(Profile.certifications),
+    selectinload(Profile.achievements),
+    selectinload(Profile.external_profiles),
+)
+
+
 class ProfileRepository:
     @staticmethod
     def create(db: Session, user_id: str) -> Profile:
         _get_or_404(db, User, user_id)  # ensure user exists
         profile = Profile(user_id=user_id)
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        _save(db, profile)
         return profile
 
     @staticmethod
     def get(db: Session, profile_id: str) -> Profile:
         return _get_or_404(db, Profile, profile_id)
 
+    @staticmethod
+    def get_full(db: Session, profile_id: str) -> Profile:
+        """Profile with all sections and their bullets loaded up front.
+
+        Takes a fixed number of queries regardless of profile size.
+        Sections already loaded in the session are kept as they are.
+        """
+        profile = db.query(Profile).options(*_FULL_PROFILE).filter(Profile.id == profile_id).first()
+        if not profile:
+            from fastapi import HTTPException
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile
+
     @staticmethod
     def get_by_user(db: Session, user_id: str) -> list[Profile]:
         return db.query(Profile).filter(Profile.user_id == user_id).all()
@@ -85,7 +196,7 @@ class ProfileRepository:
     def delete(db: Session, profile_id: str):
         profile = _get_or_404(db, Profile, profile_id)
         db.delete(profile)
-        db.commit()
+        _save(db)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -93,8 +204,12 @@ class ProfileRepository:
 # ═══════════════════════════════════════════════════════════════
 
 
-def _make_section_repo(ModelClass, parent_fk_name="profile_id"):
-    """Creates a standard CRUD repository class for a profile section."""
+def _make_section_repo(ModelClass, parent_fk_name="profile_id", profile_of=_same_id):
+    """Creates a standard CRUD repository class for a profile section.
+
+    Every write bumps the owning profile's ``content_version``;
+    ``profile_of`` maps a parent id to that profile id.
+    """
 
     class Repo:
         @staticmethod
@@ -102,10 +217,21 @@ def _make_section_repo(ModelClass, parent_fk_name="profile_id"):
             kwargs[parent_fk_name] = parent_id
             obj = ModelClass(**kwargs)
             db.add(obj)
-            db.commit()
-            db.refresh(obj)
+            _bump_profile_version(db, profile_of(db, parent_id))
+            _save(db, obj)
             return obj
 
+        @staticmethod
+        def create_many(db: Session, parent_id: str, rows: list[dict]) -> list:
+            """Insert several rows under one parent with a single commit."""
+            objs = [ModelClass(**{**row, parent_fk_name: parent_id}) for row in rows]
+            if not objs:
+                return objs
+            db.add_all(objs)
+            _bump_profile_version(db, profile_of(db, parent_id))
+            _save(db, *objs)
+            return objs
+
         @staticmethod
         def get(db: Session, id: str):
             return _get_or_404(db, ModelClass, id)
@@ -119,18 +245,22 @@ def _make_section_repo(ModelClass, parent_fk_name="profile_id"):
         @staticmethod
         def update(db: Session, id: str, **kwargs):
             obj = _get_or_404(db, ModelClass, id)
+            if kwargs.get("bullet_text") is not None:
+                _drop_stale_embeddings(db, obj, kwargs["bullet_text"])
             for k, v in kwargs.items():
                 if v is not None:
                     setattr(obj, k, v)
-            db.commit()
-            db.refresh(obj)
+            _bump_profile_version(db, profile_of(db, getattr(obj, parent_fk_name)))
+            _save(db, obj)
             return obj
 
         @staticmethod
         def delete(db: Session, id: str):
             obj = _get_or_404(db, ModelClass, id)
+            _bump_profile_version(db, profile_of(db, getattr(obj, parent_fk_name)))
+            _drop_stale_embeddings(db, obj)
             db.delete(obj)
-            db.commit()
+            _save(db)
 
     Repo.__name__ = f"{ModelClass.__name__}Repository"
     return Repo
@@ -139,9 +269,13 @@ def _make_section_repo(ModelClass, parent_fk_name="profile_id"):
 EducationRepo = _make_section_repo(Education)
 SkillRepo = _make_section_repo(Skill)
 ExperienceRepo = _make_section_repo(Experience)
-ExperienceBulletRepo = _make_section_repo(ExperienceBullet, "experience_id")
+ExperienceBulletRepo = _make_section_repo(
+    ExperienceBullet, "experience_id", _parent_profile_id(Experience)
+)
 ProjectRepo = _make_section_repo(Project)
-ProjectBulletRepo = _make_section_repo(ProjectBullet, "project_id")
+ProjectBulletRepo = _make_section_repo(
+    ProjectBullet, "project_id", _parent_profile_id(Project)
+)
 CertificationRepo = _make_section_repo(Certification)
 AchievementRepo = _make_section_repo(Achievement)
 ExternalProfileRepo = _make_section_repo(ExternalProfile)
@@ -153,17 +287,16 @@ class PersonalInfoRepo:
         existing = db.query(PersonalInfo).filter(
             PersonalInfo.profile_id == profile_id
         ).first()
+        _bump_profile_version(db, profile_id)
         if existing:
             for k, v in kwargs.items():
                 if v is not None:
                     setattr(existing, k, v)
-            db.commit()
-            db.refresh(existing)
+            _save(db, existing)
             return existing
         obj = PersonalInfo(profile_id=profile_id, **kwargs)
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        _save(db, obj)
         return obj
 
     @staticmethod
@@ -180,11 +313,10 @@ class PersonalInfoRepo:
 
 class JDAnalysisRepo:
     @staticmethod
-    def create(db: Session, raw_text: str, structured_data: str, embedding: str = None) -> JDAnalysis:
+    def create(db: Session, raw_text: str, structured_data: str, embedding: bytes = None) -> JDAnalysis:
         jd = JDAnalysis(raw_text=raw_text, structured_data=structured_data, embedding=embedding)
         db.add(jd)
-        db.commit()
-        db.refresh(jd)
+        _save(db, jd)
         return jd
 
     @staticmethod
@@ -204,14 +336,14 @@ class JDAnalysisRepo:
 class ResumeRepo:
     @staticmethod
     def create(db: Session, profile_id: str, jd_id: str, job_title: str,
-               version: int = 1, file_path: str = None) -> Resume:
+               version: int = 1, file_path: str = None, input_hash: str = None) -> Resume:
         resume = Resume(
             profile_id=profile_id, jd_id=jd_id,
             job_title=job_title, version=version, file_path=file_path,
+            input_hash=input_hash,
         )
         db.add(resume)
-        db.commit()
-        db.refresh(resume)
+        _save(db, resume)
         return resume
 
     @staticmethod
@@ -222,6 +354,14 @@ class ResumeRepo:
     def list_by_profile(db: Session, profile_id: str) -> list[Resume]:
         return db.query(Resume).filter(Resume.profile_id == profile_id).all()
 
+    @staticmethod
+    def find_by_input_hash(db: Session, profile_id: str, input_hash: str) -> Resume | None:
+        """Newest resume generated from exactly these inputs, if any."""
+        return db.query(Resume).filter(
+            Resume.profile_id == profile_id,
+            Resume.input_hash == input_hash,
+        ).order_by(Resume.created_at.desc(), Resume.version.desc()).first()
+
     @staticmethod
     def get_next_version(db: Session, profile_id: str, job_title: str) -> int:
         existing = db.query(Resume).filter(
@@ -238,6 +378,111 @@ class ResumeRepo:
             content=content, confidence_flags=confidence_flags,
         )
         db.add(section)
-        db.commit()
-        db.refresh(section)
+        _save(db, section)
         return section
+
+    @staticmethod
+    def add_sections(db: Session, resume_id: str, sections: list[dict]) -> list[ResumeSection]:
+        """Insert all sections of a resume with a single commit."""
+        rows = [
+            ResumeSection(
+                resume_id=resume_id, section_type=sec["section_type"],
+                content=sec["content"], confidence_flags=sec.get("confidence_flags"),
+            )
+            for sec in sections
+        ]
+        db.add_all(rows)
+        _save(db, *rows)
+        return rows
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Generation Job Repository
+# ═══════════════════════════════════════════════════════════════
+
+
+class GenerationJobRepo:
+    UNFINISHED = ("queued", "running")
+
+    @staticmethod
+    def create(db: Session, profile_id: str, jd_text: str, force: bool = False) -> GenerationJob:
+        job = GenerationJob(profile_id=profile_id, jd_text=jd_text, force=force, status="queued")
+        db.add(job)
+        _save(db, job)
+        return job
+
+    @staticmethod
+    def get(db: Session, job_id: str) -> GenerationJob:
+        return _get_or_404(db, GenerationJob, job_id)
+
+    @staticmethod
+    def count_unfinished(db: Session) -> int:
+        return db.query(GenerationJob).filter(
+            GenerationJob.status.in_(GenerationJobRepo.UNFINISHED)
+        ).count()
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """Queued, or running under a lease nobody renewed in time."""
+        return or_(
+            GenerationJob.status == "queued",
+            and_(
+                GenerationJob.status == "running",
+                or_(GenerationJob.lease_expires_at.is_(None),
+                    GenerationJob.lease_expires_at < now),
+            ),
+        )
+
+    @staticmethod
+    def list_claimable(db: Session) -> list[GenerationJob]:
+        now = datetime.now(timezone.utc)
+        return db.query(GenerationJob).filter(
+            GenerationJobRepo._claimable(now)
+        ).order_by(GenerationJob.created_at).all()
+
+    @staticmethod
+    def claim(db: Session, job_id: str, owner: str, lease_s: float) -> bool:
+        """Mark a job running under ``owner``; False if it is not claimable.
+
+        A single conditional UPDATE, so two processes never both win.
+        """
+        now = datetime.now(timezone.utc)
+        claimed = db.query(GenerationJob).filter(
+            GenerationJob.id == job_id, GenerationJobRepo._claimable(now),
+        ).update({
+            GenerationJob.status: "running",
+            GenerationJob.owner: owner,
+            GenerationJob.started_at: now,
+            GenerationJob.lease_expires_at: now + timedelta(seconds=lease_s),
+        }, synchronize_session=False)
+        db.commit()
+        return claimed == 1
+
+    @staticmethod
+    def renew_leases(db: Session, owner: str, lease_s: float) -> int:
+        """Extend the lease of every job ``owner`` is running."""
+        renewed = db.query(GenerationJob).filter(
+            GenerationJob.owner == owner, GenerationJob.status == "running",
+        ).update({
+            GenerationJob.lease_expires_at: datetime.now(timezone.utc) + timedelta(seconds=lease_s),
+        }, synchronize_session=False)
+        db.commit()
+        return renewed
+
+    @staticmethod
+    def set_status(db: Session, job: GenerationJob, status: str,
+                   result: str = None, error: str = None) -> GenerationJob:
+        now = datetime.now(timezone.utc)
+        job.status = status
+        if status == "queued":
+            job.started_at = None
+            job.owner = job.lease_expires_at = None
+        elif status == "running":
+            job.started_at = now
+        else:
+            job.finished_at = now
+            job.result = result
+            job.error = error
+            job.lease_expires_at = None
+        _save(db, job)
+        return job
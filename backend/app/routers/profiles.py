@@ -1,6 +1,6 @@
 """Profile and section CRUD routes."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Body, Depends
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -11,10 +11,13 @@ from app.schemas import (
     AchievementCreate, AchievementOut, ExternalProfileCreate, ExternalProfileOut,
     PersonalInfoCreate, PersonalInfoOut,
 )
+from app.services.orchestrator import refresh_profile_embeddings
+from app.services.profile_import import import_profile, parse_document
 from app.repositories import (
     ProfileRepository, EducationRepo, SkillRepo, ExperienceRepo,
     ExperienceBulletRepo, ProjectRepo, ProjectBulletRepo,
     CertificationRepo, AchievementRepo, ExternalProfileRepo, PersonalInfoRepo,
+    unit_of_work,
 )
 
 router = APIRouter()
@@ -34,12 +37,28 @@ def get_profile_by_user(user_id: str, db: Session = Depends(get_db)):
     profiles = ProfileRepository.get_by_user(db, user_id)
     if not profiles:
         raise HTTPException(status_code=404, detail="No profile found for this user")
-    return profiles[0]
+    return ProfileRepository.get_full(db, profiles[0].id)
 
 
 @router.get("/{profile_id}", response_model=ProfileOut)
 def get_profile(profile_id: str, db: Session = Depends(get_db)):
-    return ProfileRepository.get(db, profile_id)
+    return ProfileRepository.get_full(db, profile_id)
+
+
+@router.post("/{profile_id}/import", response_model=ProfileOut, status_code=201)
+def import_profile_document(profile_id: str, background_tasks: BackgroundTasks,
+                            document: dict = Body(...), db: Session = Depends(get_db)):
+    """Import a complete profile: ``ProfileOut`` JSON or a JSON Resume document.
+
+    All sections are bulk-inserted in one transaction and appended to the
+    profile (personal info is replaced). Embeddings for the imported
+    bullets are computed in one batch after the response is sent.
+    """
+    ProfileRepository.get(db, profile_id)
+    data = parse_document(document)
+    if import_profile(db, profile_id, data):
+        background_tasks.add_task(refresh_profile_embeddings, db.get_bind(), profile_id)
+    return ProfileRepository.get_full(db, profile_id)
 
 
 @router.delete("/{profile_id}", status_code=204)
@@ -98,13 +117,15 @@ def delete_skill(skill_id: str, db: Session = Depends(get_db)):
 
 @router.post("/{profile_id}/experience", response_model=ExperienceOut, status_code=201)
 def add_experience(profile_id: str, payload: ExperienceCreate, db: Session = Depends(get_db)):
-    exp = ExperienceRepo.create(
-        db, profile_id,
-        company=payload.company, role=payload.role,
-        start_date=payload.start_date, end_date=payload.end_date,
-    )
-    for b in payload.bullets:
-        ExperienceBulletRepo.create(db, exp.id, bullet_text=b.bullet_text)
+    with unit_of_work(db):
+        exp = ExperienceRepo.create(
+            db, profile_id,
+            company=payload.company, role=payload.role,
+            start_date=payload.start_date, end_date=payload.end_date,
+        )
+        ExperienceBulletRepo.create_many(
+            db, exp.id, [{"bullet_text": b.bullet_text} for b in payload.bullets],
+        )
     db.refresh(exp)
     return exp
 
@@ -124,14 +145,16 @@ def delete_experience(exp_id: str, db: Session = Depends(get_db)):
 
 @router.post("/{profile_id}/projects", response_model=ProjectOut, status_code=201)
 def add_project(profile_id: str, payload: ProjectCreate, db: Session = Depends(get_db)):
-    proj = ProjectRepo.create(
-        db, profile_id,
-        project_title=payload.project_title,
-        description=payload.description,
-        tech_stack=payload.tech_stack,
-    )
-    for b in payload.bullets:
-        ProjectBulletRepo.create(db, proj.id, bullet_text=b.bullet_text)
+    with unit_of_work(db):
+        proj = ProjectRepo.create(
+            db, profile_id,
+            project_title=payload.project_title,
+            description=payload.description,
+            tech_stack=payload.tech_stack,
+        )
+        ProjectBulletRepo.create_many(
+            db, proj.id, [{"bullet_text": b.bullet_text} for b in payload.bullets],
+        )
     db.refresh(proj)
     return proj
 
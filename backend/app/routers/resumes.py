@@ -1,39 +1,256 @@
 """Resume generation and management routes."""
 
-import os
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas import ResumeGenerateRequest, ResumeOut
-from app.services.orchestrator import generate_resume
-from app.repositories import ResumeRepo
+from app.config import settings
+from app.schemas import (
+    ResumeGenerateRequest, ResumePreviewRequest, ResumeBatchRequest, ResumeOut, GenerationJobOut,
+)
+from app.services.artifacts import FORMATS, download_name, get_artifact
+from app.services.deadline import Deadline
+from app.services.job_queue import job_queue
+from app.services.orchestrator import (
+    generate_resume_async, generate_resumes_batch_async, preview_resume_async,
+)
+from app.repositories import ResumeRepo, GenerationJobRepo, ProfileRepository
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _sse(event: str, payload: dict) -> str:
+    """One Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def _deadline(x_deadline_ms: Optional[int] = Header(None, alias="X-Deadline-Ms")) -> Deadline:
+    """Latency budget of this request, counted from its arrival."""
+    return Deadline.from_header(x_deadline_ms)
+
+
 @router.post("/generate", status_code=201)
-def generate(payload: ResumeGenerateRequest, db: Session = Depends(get_db)):
+async def generate(payload: ResumeGenerateRequest, db: Session = Depends(get_db),
+                   deadline: Deadline = Depends(_deadline)):
     """Generate a role-specific resume from a job description.
 
     This is the main endpoint — runs the full AI pipeline:
     JD analysis → embeddings → scoring → selection → rewriting →
-    ATS optimization → assembly → rendering.
+    ATS optimization → assembly. Files are rendered on first download.
+
+    Awaited on the event loop; database, CPU-bound and network stages run
+    in worker threads and occupy them only while they run. An unchanged profile and JD return
+    the stored resume (``cached: true``) unless ``force`` is set.
+
+    With an ``X-Deadline-Ms`` header, Gemini stages that would not fit in
+    the remaining budget use their rule-based fallbacks; ``degraded``
+    lists the stages that did.
     """
-    result = generate_resume(db, payload.profile_id, payload.jd_text)
+    result = await generate_resume_async(
+        db, payload.profile_id, payload.jd_text, force=payload.force, deadline=deadline,
+    )
+    return _generate_response(result)
+
+
+def _generate_response(result: dict) -> dict:
     return {
         "resume_id": result["resume_id"],
         "job_title": result["job_title"],
         "version": result["version"],
-        "pdf_path": result["pdf_path"],
-        "docx_path": result["docx_path"],
         "jd_analysis": result["jd_analysis"],
         "skill_confidence": result["skill_confidence"],
         "keyword_coverage": result["keyword_coverage"],
+        "cached": result["cached"],
+        "degraded": result["degraded"],
+        "downloads": _downloads(result["resume_id"]),
     }
 
 
+def _downloads(resume_id: str) -> dict:
+    """Download links; files are rendered on first request."""
+    return {fmt: f"/api/resumes/{resume_id}/download?format={fmt}" for fmt in FORMATS}
+
+
+def _event_stream(db: Session, produce) -> StreamingResponse:
+    """Run ``produce(session, on_progress)`` and stream its progress as SSE.
+
+    ``produce`` returns the final ``(event, payload)``; an exception ends
+    the stream with an ``error`` event instead. It gets a session of its
+    own on ``db``'s bind: if the client goes away, the generation is
+    cancelled but may still be finishing session work in a worker thread
+    after the request's session has been closed.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        stream_db = Session(bind=db.get_bind())
+        try:
+            queue.put_nowait(await produce(
+                stream_db, lambda event, data: queue.put_nowait((event, data)),
+            ))
+        except Exception as e:
+            logger.exception("Streamed generation failed")
+            detail = e.detail if isinstance(e, HTTPException) else "Resume generation failed"
+            queue.put_nowait(("error", {"detail": detail}))
+        finally:
+            stream_db.close()
+            queue.put_nowait(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while (item := await queue.get()) is not None:
+                yield _sse(*item)
+        finally:
+            if not task.done():  # client went away
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/generate/stream")
+async def generate_stream(payload: ResumeGenerateRequest, db: Session = Depends(get_db),
+                          deadline: Deadline = Depends(_deadline)):
+    """Generate a resume, streaming progress as Server-Sent Events.
+
+    Events, in order of arrival:
+      - ``stage``: a pipeline stage finished (``{"stage", "ms"}``)
+      - ``jd_analysis``: structured JD, as soon as it is parsed
+      - ``selection``: chosen sections, original bullets, skills
+      - ``rewritten``: the same sections with rewritten bullets
+      - ``ats``: keyword coverage
+      - ``complete``: the ``/generate`` response
+      - ``error``: the pipeline failed (``{"detail"}``); ends the stream
+    """
+    await asyncio.to_thread(ProfileRepository.get, db, payload.profile_id)  # plain 404 before streaming
+
+    async def produce(stream_db, on_progress):
+        result = await generate_resume_async(
+            stream_db, payload.profile_id, payload.jd_text,
+            on_progress=on_progress, force=payload.force, deadline=deadline,
+        )
+        return "complete", _generate_response(result)
+
+    return _event_stream(db, produce)
+
+
+@router.post("/preview")
+async def preview(payload: ResumePreviewRequest, db: Session = Depends(get_db),
+                  deadline: Deadline = Depends(_deadline)):
+    """Preview the resume a generation would produce, without keeping it.
+
+    Runs JD analysis, selection, rewriting and ATS optimization and returns
+    the assembled ``resume_data``. Nothing is rendered or stored and no
+    version number is used up; call ``/generate`` to commit the result.
+    """
+    return await preview_resume_async(db, payload.profile_id, payload.jd_text, deadline=deadline)
+
+
+def _batch_response(results: list[dict]) -> dict:
+    items = [
+        {"index": r["index"], "status": "succeeded", **_generate_response(r)}
+        if r["status"] == "succeeded" else r
+        for r in results
+    ]
+    return {
+        "succeeded": sum(1 for r in items if r["status"] == "succeeded"),
+        "failed": sum(1 for r in items if r["status"] == "failed"),
+        "results": items,
+    }
+
+
+def _check_batch(db: Session, payload: ResumeBatchRequest):
+    ProfileRepository.get(db, payload.profile_id)
+    if len(payload.jd_texts) > settings.BATCH_MAX_JDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.BATCH_MAX_JDS} job descriptions per batch",
+        )
+
+
+@router.post("/generate/batch", status_code=201)
+async def generate_batch(payload: ResumeBatchRequest, db: Session = Depends(get_db),
+                         deadline: Deadline = Depends(_deadline)):
+    """Generate one resume per job description for the same profile.
+
+    The profile is loaded and embedded once for the whole batch. Each JD
+    succeeds or fails on its own; results come back in input order.
+    """
+    await asyncio.to_thread(_check_batch, db, payload)
+    results = await generate_resumes_batch_async(
+        db, payload.profile_id, payload.jd_texts, force=payload.force, deadline=deadline,
+    )
+    return _batch_response(results)
+
+
+@router.post("/generate/batch/stream")
+async def generate_batch_stream(payload: ResumeBatchRequest, db: Session = Depends(get_db),
+                                deadline: Deadline = Depends(_deadline)):
+    """Batch generation with per-JD progress as Server-Sent Events.
+
+    Emits the same events as ``/generate/stream``, each tagged with the
+    JD's ``index``, plus ``jd_complete`` / ``jd_failed`` per JD and a
+    final ``complete`` event carrying the ``/generate/batch`` response.
+    """
+    await asyncio.to_thread(_check_batch, db, payload)
+
+    async def produce(stream_db, on_progress):
+        results = await generate_resumes_batch_async(
+            stream_db, payload.profile_id, payload.jd_texts,
+            on_progress=on_progress, force=payload.force, deadline=deadline,
+        )
+        return "complete", _batch_response(results)
+
+    return _event_stream(db, produce)
+
+
+def _job_out(job) -> GenerationJobOut:
+    result = None
+    if job.result:
+        result = json.loads(job.result)
+        result["downloads"] = _downloads(result["resume_id"])
+    return GenerationJobOut(
+        id=job.id,
+        profile_id=job.profile_id,
+        status=job.status,
+        result=result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/jobs", response_model=GenerationJobOut, status_code=202)
+def submit_generation_job(payload: ResumeGenerateRequest, db: Session = Depends(get_db)):
+    """Queue a resume generation and return immediately.
+
+    Poll ``GET /api/resumes/jobs/{job_id}`` until the status is
+    ``succeeded`` (result holds the same fields as ``/generate``) or
+    ``failed``.
+    """
+    job = job_queue.submit(db, payload.profile_id, payload.jd_text, force=payload.force)
+    return _job_out(job)
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobOut)
+def get_generation_job(job_id: str, db: Session = Depends(get_db)):
+    """Status and, once finished, result or error of a generation job."""
+    return _job_out(GenerationJobRepo.get(db, job_id))
+
+
 @router.get("/", response_model=list[ResumeOut])
 def list_resumes(profile_id: str, db: Session = Depends(get_db)):
     """List all resumes for a profile."""
@@ -47,25 +264,26 @@ def get_resume(resume_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{resume_id}/download")
-def download_resume(resume_id: str, format: str = "pdf", db: Session = Depends(get_db)):
-    """Download a generated resume file."""
-    resume = ResumeRepo.get(db, resume_id)
+def download_resume(resume_id: str, format: str = "pdf", db: Session = Depends(get_db),
+                    deadline: Deadline = Depends(_deadline)):
+    """Download a generated resume file.
 
-    if format == "docx":
-        path = resume.file_path
-        if path and path.endswith(".pdf"):
-            path = path.replace(".pdf", ".docx")
-    else:
-        path = resume.file_path
-
-    if not path or not os.path.exists(path):
-        raise HTTPException(status_code=404, detail="Resume file not found")
+    The file is rendered from the stored sections on the first request
+    for each format and served from disk afterwards. A first PDF render
+    is cut off when it would overrun ``X-Deadline-Ms``.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=422, detail="format must be pdf or docx")
+    resume = ResumeRepo.get(db, resume_id)
 
-    media_type = "application/pdf" if format == "pdf" else \
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    try:
+        path = get_artifact(resume, format, deadline)
+    except Exception as e:
+        logger.warning("Rendering %s for resume %s failed: %s", format, resume_id, e)
+        raise HTTPException(status_code=503, detail=f"Could not render {format.upper()}")
 
     return FileResponse(
         path,
-        media_type=media_type,
-        filename=os.path.basename(path),
+        media_type=FORMATS[format],
+        filename=download_name(resume, format),
     )
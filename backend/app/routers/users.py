@@ -6,7 +6,7 @@ from passlib.hash import bcrypt
 
 from app.database import get_db
 from app.schemas import UserCreate, UserOut, LoginOrRegister
-from app.repositories import UserRepository, ProfileRepository
+from app.repositories import UserRepository, ProfileRepository, unit_of_work
 from app.models.user import User as UserModel
 
 router = APIRouter()
@@ -37,9 +37,11 @@ def login_or_register(payload: LoginOrRegister, db: Session = Depends(get_db)):
             counter += 1
 
         password_hash = bcrypt.hash(payload.password)
-        user = UserRepository.create(db, username, payload.email, password_hash)
-        # Auto-create an empty profile for the new user
-        ProfileRepository.create(db, user.id)
+        with unit_of_work(db):
+            user = UserRepository.create(db, username, payload.email, password_hash)
+            # Auto-create an empty profile for the new user
+            ProfileRepository.create(db, user.id)
+        db.refresh(user)
         return user
 
 
@@ -1,7 +1,7 @@
 """Pydantic schemas for all entities."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -198,6 +198,18 @@ class ProfileCreate(BaseModel):
     pass
 
 
+class ProfileImport(BaseModel):
+    """A complete profile document; ``ProfileOut`` JSON is accepted as is."""
+    personal_info: Optional[PersonalInfoCreate] = None
+    education: list[EducationCreate] = []
+    skills: list[SkillCreate] = []
+    experience: list[ExperienceCreate] = []
+    projects: list[ProjectCreate] = []
+    certifications: list[CertificationCreate] = []
+    achievements: list[AchievementCreate] = []
+    external_profiles: list[ExternalProfileCreate] = []
+
+
 class ProfileOut(BaseModel):
     id: str
     user_id: str
@@ -246,6 +258,18 @@ class JDAnalysisOut(BaseModel):
 class ResumeGenerateRequest(BaseModel):
     profile_id: str
     jd_text: str = Field(..., min_length=20)
+    force: bool = False  # regenerate even if an identical resume exists
+
+
+class ResumePreviewRequest(BaseModel):
+    profile_id: str
+    jd_text: str = Field(..., min_length=20)
+
+
+class ResumeBatchRequest(BaseModel):
+    profile_id: str
+    jd_texts: list[Annotated[str, Field(min_length=20)]] = Field(..., min_length=1)
+    force: bool = False
 
 
 class ResumeOut(BaseModel):
@@ -257,3 +281,14 @@ class ResumeOut(BaseModel):
     file_path: Optional[str] = None
     created_at: datetime
     model_config = {"from_attributes": True}
+
+
+class GenerationJobOut(BaseModel):
+    id: str
+    profile_id: str
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
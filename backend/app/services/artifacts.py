@@ -0,0 +1,98 @@
+"""Artifacts — PDF and DOCX files rendered on first download.
+
+Generation stores the assembled resume as sections and stops there;
+pdflatex and python-docx only run when a format is actually requested.
+The rendered file is kept in OUTPUT_DIR under the resume id, so every
+later download is a plain file read. Concurrent requests for the same
+artifact share a single render.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+from app.config import settings
+from app.models.resume import Resume
+from app.services.deadline import Deadline
+from app.services.export_service import export_to_docx
+from app.services.keyed_locks import KeyedLocks
+from app.services.latex_renderer import render_resume_to_pdf
+from app.services.metrics import RENDER_SECONDS
+from app.services.resume_assembler import resume_from_record
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+_render_locks = KeyedLocks()
+
+
+def artifact_path(resume_id: str, fmt: str) -> str:
+    """Where the rendered ``fmt`` file of a resume lives."""
+    return os.path.join(settings.OUTPUT_DIR, f"{resume_id}.{fmt}")
+
+
+def download_name(resume: Resume, fmt: str) -> str:
+    """Human-readable file name, e.g. ``Backend_Engineer_v2.pdf``."""
+    safe_title = "".join(c if c.isalnum() or c in "-_ " else "" for c in resume.job_title)
+    return f"{safe_title}_v{resume.version}.{fmt}".replace(" ", "_")
+
+
+def _legacy_path(resume: Resume, fmt: str) -> Optional[str]:
+    """File rendered at generation time by earlier versions, if still present."""
+    if not resume.file_path:
+        return None
+    path = f"{os.path.splitext(resume.file_path)[0]}.{fmt}"
+    return path if os.path.exists(path) else None
+
+
+def _render(resume: Resume, fmt: str, path: str, deadline: Deadline):
+    resume_data = resume_from_record(resume)
+
+    # Render next to the target and rename, so a reader never sees a partial file
+    os.makedirs(settings.OUTPUT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=settings.OUTPUT_DIR, suffix=f".{fmt}")
+    os.close(fd)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        if fmt == "pdf":
+            timeout = deadline.timeout(settings.PDFLATEX_TIMEOUT_S)
+            render_resume_to_pdf(resume_data, tmp_path, timeout=timeout)
+        else:
+            export_to_docx(resume_data, tmp_path)
+        os.replace(tmp_path, path)
+        outcome = "ok"
+    finally:
+        RENDER_SECONDS.observe(time.perf_counter() - start, format=fmt, outcome=outcome)
+        if outcome != "ok" and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    logger.info("Rendered %s for resume %s", fmt, resume.id)
+
+
+def get_artifact(resume: Resume, fmt: str, deadline: Optional[Deadline] = None) -> str:
+    """Path of the ``fmt`` file for a resume, rendering it if needed.
+
+    pdflatex gets the remaining ``deadline`` budget, at most
+    PDFLATEX_TIMEOUT_S. Raises whatever the renderer raises (e.g.
+    pdflatex missing or timed out).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    legacy = _legacy_path(resume, fmt)
+    if legacy:
+        return legacy
+
+    path = artifact_path(resume.id, fmt)
+    if os.path.exists(path):
+        return path
+    with _render_locks.hold(path):
+        # Whoever held the lock before us may have rendered it already
+        if not os.path.exists(path):
+            _render(resume, fmt, path, deadline or Deadline())
+    return path
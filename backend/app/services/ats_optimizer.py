@@ -9,6 +9,7 @@ Ensures:
 
 from app.domain.resume_draft import ResumeDraft
 from app.config import settings
+from app.services.keyword_matcher import jd_matcher
 
 
 # ── ATS section ordering ──────────────────────────────────────
@@ -38,11 +39,11 @@ def check_keyword_coverage(draft: ResumeDraft) -> dict[str, bool]:
     for skill in draft.selected_skills:
         all_text_parts.append(skill)
 
-    full_text = " ".join(all_text_parts).lower()
+    hits = jd_matcher(draft.jd_data).scan(" ".join(all_text_parts)).keywords
 
     coverage = {}
-    for kw in draft.jd_data.keywords:
-        coverage[kw] = kw.lower() in full_text
+    for i, kw in enumerate(draft.jd_data.keywords):
+        coverage[kw] = i in hits
 
     return coverage
 
@@ -0,0 +1,175 @@
+"""Circuit Breaker — fail fast while an external API is unhealthy.
+
+Every Gemini and Pinecone call runs through the breaker of its service.
+The breaker keeps the outcomes of calls from the last CIRCUIT_WINDOW_S
+seconds; a call counts as bad when it raised or took longer than
+CIRCUIT_SLOW_CALL_MS. States:
+  - closed:    calls go through; once at least CIRCUIT_MIN_CALLS were made
+               in the window and CIRCUIT_FAILURE_RATE of them were bad,
+               the breaker opens
+  - open:      calls raise ``CircuitOpenError`` immediately, so callers
+               take their local fallback without waiting for the remote
+               failure; after CIRCUIT_OPEN_S the breaker half-opens
+  - half_open: one probe call goes through (others still fail fast); a
+               good probe closes the breaker, a bad one reopens it
+
+State is exported as the ``oneresume_circuit_state`` gauge and reported
+by the health endpoint.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable
+
+from app.config import settings
+from app.services.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, track_call
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose breaker is open."""
+
+    def __init__(self, service: str):
+        super().__init__(f"{service} circuit is open")
+        self.service = service
+
+
+class CircuitBreaker:
+    """Error/latency-rate breaker for one external service."""
+
+    def __init__(self, service: str, clock: Callable[[], float] = time.monotonic):
+        self.service = service
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (finished at, bad)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], service=service)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh(self._clock())
+            return self._state
+
+    def reset(self):
+        """Close the breaker and forget recorded outcomes."""
+        with self._lock:
+            self._outcomes.clear()
+            self._probing = False
+            self._transition(CLOSED)
+
+    def _transition(self, state: str):
+        if state != self._state:
+            logger.warning("%s circuit %s -> %s", self.service, self._state, state)
+        self._state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], service=self.service)
+
+    def _refresh(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= settings.CIRCUIT_OPEN_S:
+            self._transition(HALF_OPEN)
+            self._probing = False
+
+    def _acquire(self) -> bool:
+        """Whether a call may go through; True marks it as the half-open probe."""
+        with self._lock:
+            self._refresh(self._clock())
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+        CIRCUIT_REJECTED.inc(service=self.service)
+        raise CircuitOpenError(self.service)
+
+    def _record(self, bad: bool, probe: bool):
+        now = self._clock()
+        with self._lock:
+            if probe:
+                self._probing = False
+                self._outcomes.clear()
+                if bad:
+                    self._opened_at = now
+                    self._transition(OPEN)
+                else:
+                    self._transition(CLOSED)
+                return
+            if self._state != CLOSED:
+                return  # a call started before the breaker opened
+
+            self._outcomes.append((now, bad))
+            while self._outcomes and now - self._outcomes[0][0] > settings.CIRCUIT_WINDOW_S:
+                self._outcomes.popleft()
+            total = len(self._outcomes)
+            failures = sum(1 for _, b in self._outcomes if b)
+            if total >= settings.CIRCUIT_MIN_CALLS and failures / total >= settings.CIRCUIT_FAILURE_RATE:
+                self._outcomes.clear()
+                self._opened_at = now
+                self._transition(OPEN)
+
+    @contextmanager
+    def guard(self):
+        """Run one call under the breaker; raises CircuitOpenError while open."""
+        probe = self._acquire()
+        start = self._clock()
+        try:
+            yield
+        except BaseException:
+            self._record(True, probe)
+            raise
+        slow = (self._clock() - start) * 1000 >= settings.CIRCUIT_SLOW_CALL_MS
+        self._record(slow, probe)
+
+
+class CircuitBreakers:
+    """One breaker per external service, created on first use."""
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(service)
+            if breaker is None:
+                breaker = self._breakers[service] = CircuitBreaker(service)
+            return breaker
+
+    def states(self) -> dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.service: b.state for b in breakers}
+
+    def reset(self):
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
+
+
+circuit_breakers = CircuitBreakers()
+for _service in ("gemini", "pinecone"):
+    circuit_breakers.get(_service)
+
+
+@contextmanager
+def outbound_call(service: str, operation: str):
+    """Guard an outbound call with its service's breaker and time it.
+
+    Calls rejected by an open breaker are counted by
+    ``oneresume_circuit_rejected_total``, not as outbound calls.
+    """
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        with track_call(service, operation):
+            yield
+        return
+    with circuit_breakers.get(service).guard(), track_call(service, operation):
+        yield
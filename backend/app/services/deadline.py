@@ -0,0 +1,61 @@
+"""Deadline — a per-request latency budget carried through the pipeline.
+
+A client may send ``X-Deadline-Ms``; the budget starts counting when the
+request arrives. Stages that call Gemini ask the deadline how long they
+may take: the remaining budget (capped by the stage's normal timeout)
+becomes the call's timeout, and when too little is left the stage uses
+its local fallback up front instead of waiting for Gemini to fail.
+
+A deadline also records which stages fell back (for any reason), so a
+degraded result is reported to the client and not stored in the
+generation result cache.
+"""
+
+import math
+import time
+from typing import Optional
+
+from app.config import settings
+
+
+class Deadline:
+    """Point in time by which the current run should be finished."""
+
+    def __init__(self, budget_ms: Optional[float] = None, *, _expires_at: Optional[float] = None):
+        if _expires_at is None and budget_ms is not None:
+            _expires_at = time.monotonic() + budget_ms / 1000.0
+        self._expires_at = _expires_at
+        self.degraded: list[str] = []
+
+    @classmethod
+    def from_header(cls, value: Optional[int]) -> "Deadline":
+        """Deadline for an ``X-Deadline-Ms`` value; falls back to DEFAULT_DEADLINE_MS."""
+        budget = value if value is not None else settings.DEFAULT_DEADLINE_MS
+        return cls(budget if budget and budget > 0 else None)
+
+    def fork(self) -> "Deadline":
+        """Same expiry, separate record of degraded stages (one per batch item)."""
+        return Deadline(_expires_at=self._expires_at)
+
+    @property
+    def bounded(self) -> bool:
+        return self._expires_at is not None
+
+    def remaining(self) -> float:
+        """Seconds left; ``inf`` when unbounded, never negative."""
+        if self._expires_at is None:
+            return math.inf
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def timeout(self, cap: float, share: float = 1.0) -> float:
+        """Timeout for a stage: its ``share`` of what is left, at most ``cap`` seconds."""
+        return min(cap, self.remaining() * share)
+
+    def allows(self, cap: float, share: float = 1.0) -> bool:
+        """Whether a remote call still has at least GEMINI_MIN_BUDGET_MS to run."""
+        return self.timeout(cap, share) * 1000 >= settings.GEMINI_MIN_BUDGET_MS
+
+    def degrade(self, stage: str):
+        """Record that ``stage`` used its local fallback."""
+        if stage not in self.degraded:
+            self.degraded.append(stage)
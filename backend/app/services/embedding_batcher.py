@@ -0,0 +1,136 @@
+"""Embedding Batcher — coalesces concurrent embedding calls into one request.
+
+Under load many requests each embed a handful of short texts. Instead of
+one provider call per request, callers enqueue their texts and block; a
+collector thread gathers everything that arrives within a short window
+(or until the batch is full) and hands the batch to a small pool of
+flush threads, which send one request per input type and give each
+caller back its own vectors. The collector moves straight on to the next
+batch, so a slow provider request does not hold up the ones after it.
+A caller with nobody else embedding skips the queue, so a lone request
+never waits for the window. Callers wait at most the window plus the
+provider timeout for their batch.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str], str], list[list[float]]]
+
+
+@dataclass
+class _Pending:
+    texts: list[str]
+    input_type: str
+    future: Future
+
+
+class EmbeddingBatcher:
+    """Micro-batcher in front of an ``embed_fn(texts, input_type)`` callable.
+
+    ``window_ms <= 0`` disables coalescing; calls that already fill a batch
+    on their own, or arrive while no other call is in flight, also bypass
+    the queue.
+    """
+
+    def __init__(self, embed_fn: EmbedFn, window_ms: float, max_batch: int,
+                 timeout_s: float = 30, max_flushes: int = 4):
+        self._embed_fn = embed_fn
+        self._window = window_ms / 1000.0
+        self._max_batch = max_batch
+        self._wait_s = self._window + timeout_s
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._flushes = ThreadPoolExecutor(
+            max_workers=max(1, max_flushes), thread_name_prefix="embedding-flush",
+        )
+        self._lock = threading.Lock()
+        self._callers = 0  # calls currently inside embed()
+
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        """Embed ``texts``, sharing the provider request with concurrent callers."""
+        if not texts:
+            return []
+        if self._window <= 0 or len(texts) >= self._max_batch:
+            return self._embed_fn(texts, input_type)
+
+        with self._lock:
+            alone = self._callers == 0
+            self._callers += 1
+        try:
+            if alone:
+                return self._embed_fn(texts, input_type)
+            future: Future = Future()
+            self._queue.put(_Pending(list(texts), input_type, future))
+            self._ensure_worker()
+            try:
+                return future.result(timeout=self._wait_s)
+            except FutureTimeout:
+                raise TimeoutError(
+                    f"Coalesced embedding request did not finish within {self._wait_s:.1f}s"
+                ) from None
+        finally:
+            with self._lock:
+                self._callers -= 1
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            count = len(first.texts)
+            deadline = time.monotonic() + self._window
+            while count < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                count += len(item.texts)
+            self._flushes.submit(self._flush, batch)
+
+    def _flush(self, batch: list[_Pending]):
+        """Send one request per input type and fan results back out."""
+        groups: dict[str, list[_Pending]] = {}
+        for item in batch:
+            groups.setdefault(item.input_type, []).append(item)
+
+        for input_type, items in groups.items():
+            # Callers often share texts (same JD, same skill names)
+            index: dict[str, int] = {}
+            for item in items:
+                for t in item.texts:
+                    index.setdefault(t, len(index))
+            logger.debug(
+                "Coalesced %d calls into one %s request of %d texts",
+                len(items), input_type, len(index),
+            )
+            try:
+                vectors = self._embed_fn(list(index), input_type)
+                results = [[vectors[index[t]] for t in item.texts] for item in items]
+            except Exception as e:
+                # Every caller must be released, or it would block forever
+                for item in items:
+                    item.future.set_exception(e)
+                continue
+            for item, result in zip(items, results):
+                item.future.set_result(result)
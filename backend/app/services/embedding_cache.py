@@ -0,0 +1,59 @@
+"""Embedding Cache — content-addressed cache for text embeddings.
+
+Entries are keyed by (model, input_type, normalized text hash) and stored
+in the ``embedding_cache`` table, with an in-process LRU in front. The same
+JD pasted twice or a bullet shared across profiles is embedded only once.
+"""
+
+import hashlib
+import unicodedata
+
+import numpy as np
+
+from app.config import settings
+from app.database import CacheSessionLocal
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.services.two_level_cache import TwoLevelCache
+
+_DTYPE = np.dtype("<f4")  # same BLOB layout as embedding_service
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for hashing: NFC, collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, input_type: str, text: str) -> str:
+    """Content address for an embedding."""
+    payload = f"{model}\x1f{input_type}\x1f{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(TwoLevelCache):
+    """Embeddings as float32 arrays in memory and float32 BLOBs in the table."""
+
+    name = "Embedding cache"
+    model = EmbeddingCacheEntry
+    value_column = "embedding"
+
+    def __init__(self, session_factory=CacheSessionLocal, max_entries: int = settings.EMBEDDING_CACHE_SIZE):
+        super().__init__(session_factory, max_entries)
+
+    def _encode(self, value: list[float]) -> np.ndarray:
+        return np.asarray(value, dtype=_DTYPE)
+
+    def _decode(self, memo: np.ndarray) -> list[float]:
+        return memo.tolist()
+
+    def _to_stored(self, memo: np.ndarray) -> bytes:
+        return memo.tobytes()
+
+    def _from_stored(self, raw: bytes) -> np.ndarray:
+        return np.frombuffer(raw, dtype=_DTYPE)
+
+    def put_many(self, model: str, input_type: str, entries: dict[str, list[float]]):
+        """Store freshly computed embeddings in both cache layers."""
+        self._put_many(entries, model=model, input_type=input_type)
+
+
+embedding_cache = EmbeddingCache()
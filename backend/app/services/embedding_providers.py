@@ -0,0 +1,157 @@
+"""Embedding Providers — interchangeable backends for the embedding service.
+
+The provider is selected by ``settings.EMBEDDING_PROVIDER``:
+  - "pinecone": Pinecone Inference API (multilingual-e5-large), the default
+  - "local":    hashed n-gram features with a fixed random projection to
+                EMBEDDING_DIM — CPU only, no network, deterministic across
+                processes. Meant for load tests, benchmarks and degraded
+                operation, not for production-quality matching.
+"""
+
+import logging
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+from app.services.circuit_breaker import outbound_call
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingProvider(ABC):
+    """A backend that turns texts into fixed-size vectors."""
+
+    #: Identifies the vector space; part of every embedding cache key.
+    name: str = ""
+    #: Max texts per embed() call.
+    max_batch_size: int = 96
+
+    @abstractmethod
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        """Embed a batch of at most ``max_batch_size`` texts."""
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Pinecone Inference
+# ═══════════════════════════════════════════════════════════════
+
+
+class PineconeProvider(EmbeddingProvider):
+    max_batch_size = 96  # Inference API input limit for multilingual-e5-large
+
+    def __init__(self, api_key: str, model: str):
+        self.name = model
+        self._api_key = api_key
+        self._client = None  # lazy-loaded
+
+    def _get_client(self):
+        """Lazy-load the Pinecone client."""
+        if self._client is None:
+            from pinecone import Pinecone
+            logger.info("Initializing Pinecone client with model: %s", self.name)
+            self._client = Pinecone(api_key=self._api_key)
+        return self._client
+
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        with outbound_call("pinecone", "embed"):
+            result = self._get_client().inference.embed(
+                model=self.name,
+                inputs=[{"text": t} for t in texts],
+                parameters={"input_type": input_type, "truncate": "END"},
+            )
+        return [list(item.values) for item in result.data]
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Local hashed n-grams
+# ═══════════════════════════════════════════════════════════════
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class LocalHashProvider(EmbeddingProvider):
+    """Word + character-trigram features, hashed and randomly projected.
+
+    Texts sharing words or word fragments land close together, which is
+    enough to exercise ranking and similarity thresholds end to end.
+    """
+
+    def __init__(self, dim: int, n_features: int = 4096, seed: int = 1024):
+        self.name = f"local-hash-ngram-v1-{dim}"
+        self.max_batch_size = 1024
+        self._dim = dim
+        self._n_features = n_features
+        self._seed = seed
+        self._projection: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def _get_projection(self) -> np.ndarray:
+        """Fixed Gaussian projection matrix, generated once from the seed."""
+        if self._projection is None:
+            with self._lock:
+                if self._projection is None:
+                    rng = np.random.default_rng(self._seed)
+                    self._projection = rng.standard_normal(
+                        (self._n_features, self._dim), dtype=np.float32
+                    )
+        return self._projection
+
+    def _features(self, text: str) -> dict[int, float]:
+        """Signed hashed counts of words and padded character trigrams."""
+        counts: dict[int, float] = {}
+        for word in _TOKEN_RE.findall(text.lower()):
+            grams = [f"w:{word}"]
+            padded = f"<{word}>"
+            grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+            for gram in grams:
+                h = zlib.crc32(gram.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                idx = h % self._n_features
+                counts[idx] = counts.get(idx, 0.0) + sign
+        return counts
+
+    def embed(self, texts: list[str], input_type: str) -> list[list[float]]:
+        projection = self._get_projection()
+        vectors = []
+        for text in texts:
+            features = self._features(text)
+            if not features:
+                vectors.append([0.0] * self._dim)
+                continue
+            idx = np.fromiter(features.keys(), dtype=np.int64)
+            weights = np.fromiter(features.values(), dtype=np.float32)
+            vec = weights @ projection[idx]
+            norm = np.linalg.norm(vec)
+            vectors.append((vec / norm if norm else vec).tolist())
+        return vectors
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Selection
+# ═══════════════════════════════════════════════════════════════
+
+_provider: Optional[EmbeddingProvider] = None
+_provider_key: Optional[str] = None
+
+
+def _build_provider(kind: str) -> EmbeddingProvider:
+    if kind == "pinecone":
+        return PineconeProvider(settings.PINECONE_API_KEY, settings.EMBEDDING_MODEL)
+    if kind == "local":
+        return LocalHashProvider(settings.EMBEDDING_DIM)
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER: {kind!r}")
+
+
+def get_provider() -> EmbeddingProvider:
+    """Provider for the current settings (rebuilt if the setting changes)."""
+    global _provider, _provider_key
+    kind = settings.EMBEDDING_PROVIDER.lower()
+    if _provider is None or _provider_key != kind:
+        _provider = _build_provider(kind)
+        _provider_key = kind
+    return _provider
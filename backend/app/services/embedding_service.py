@@ -1,74 +1,145 @@
 """Embedding Service — generates and manages text embeddings.
 
-Uses Pinecone Inference API (multilingual-e5-large) for hosted inference.
-Embeddings stored as JSON arrays in SQLite (pgvector-ready).
+Vectors come from the configured EmbeddingProvider — Pinecone Inference
+(multilingual-e5-large) by default, or a local CPU backend.
+Embeddings stored as little-endian float32 BLOBs in SQLite (pgvector-ready).
+Every call goes through the content-addressed embedding cache first; cache
+misses from concurrent requests are coalesced by the embedding batcher.
 """
 
 import json
 import logging
 import numpy as np
-from typing import Optional
+from typing import Optional, Union
 
 from app.config import settings
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import embedding_cache, cache_key, normalize_text
+from app.services.embedding_providers import get_provider
 
 logger = logging.getLogger(__name__)
 
-_client = None  # lazy-loaded singleton
+EMBEDDING_DTYPE = np.dtype("<f4")
 
+def _provider_embed(texts: list[str], input_type: str) -> list[list[float]]:
+    """One request to the configured provider."""
+    return get_provider().embed(texts, input_type)
 
-def _get_client():
-    """Lazy-load the Pinecone client."""
-    global _client
-    if _client is None:
-        from pinecone import Pinecone
-        logger.info("Initializing Pinecone client with model: %s", settings.EMBEDDING_MODEL)
-        _client = Pinecone(api_key=settings.PINECONE_API_KEY)
-    return _client
 
+def _embed_batched(texts: list[str], input_type: str) -> list[list[float]]:
+    """Embed any number of texts, splitting into provider-sized requests."""
+    size = min(settings.EMBEDDING_BATCH_SIZE, get_provider().max_batch_size)
+    vectors = []
+    for i in range(0, len(texts), size):
+        vectors.extend(_provider_embed(texts[i:i + size], input_type))
+    return vectors
 
-def generate_embedding(text: str) -> list[float]:
+
+_batcher = EmbeddingBatcher(
+    lambda texts, input_type: _embed_batched(texts, input_type),
+    window_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+    max_batch=settings.EMBEDDING_BATCH_SIZE,
+    timeout_s=settings.EMBEDDING_TIMEOUT_S,
+    max_flushes=settings.EMBEDDING_BATCH_FLUSHES,
+)
+
+
+def _embed_cached(texts: list[str], input_type: str) -> list[list[float]]:
+    """Resolve embeddings from the cache, embedding only unseen texts."""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return _batcher.embed(texts, input_type)
+
+    model = get_provider().name
+    keys = [cache_key(model, input_type, t) for t in texts]
+    vectors = embedding_cache.get_many(keys)
+
+    # Dedup within the batch as well as against the cache
+    pending: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors and key not in pending:
+            pending[key] = normalize_text(text)
+
+    if pending:
+        fetched = dict(zip(pending, _batcher.embed(list(pending.values()), input_type)))
+        embedding_cache.put_many(model, input_type, fetched)
+        vectors.update(fetched)
+
+    return [vectors[k] for k in keys]
+
+
+def generate_embedding(text: str, input_type: str = "passage") -> list[float]:
     """Generate an embedding vector for a text string."""
-    pc = _get_client()
-    result = pc.inference.embed(
-        model=settings.EMBEDDING_MODEL,
-        inputs=[{"text": text}],
-        parameters={"input_type": "passage", "truncate": "END"},
-    )
-    return list(result.data[0].values)
+    return _embed_cached([text], input_type)[0]
 
 
-def generate_embeddings(texts: list[str]) -> list[list[float]]:
+def generate_embeddings(texts: list[str], input_type: str = "passage") -> list[list[float]]:
     """Batch generate embeddings for multiple texts."""
     if not texts:
         return []
-    pc = _get_client()
-    result = pc.inference.embed(
-        model=settings.EMBEDDING_MODEL,
-        inputs=[{"text": t} for t in texts],
-        parameters={"input_type": "passage", "truncate": "END"},
-    )
-    return [list(item.values) for item in result.data]
-
-
-def embedding_to_json(embedding: list[float]) -> str:
-    """Serialize embedding for storage."""
-    return json.dumps(embedding)
+    return _embed_cached(texts, input_type)
 
 
 def embedding_from_json(json_str: Optional[str]) -> Optional[list[float]]:
-    """Deserialize embedding from storage."""
+    """Deserialize an embedding stored as JSON text before the BLOB migration."""
     if not json_str:
         return None
     return json.loads(json_str)
 
 
+def embedding_to_blob(embedding) -> bytes:
+    """Serialize embedding as a float32 BLOB for storage."""
+    return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def embedding_from_blob(value: Union[bytes, memoryview, str, None]) -> Optional[np.ndarray]:
+    """Deserialize a stored embedding without copying.
+
+    Rows written before the BLOB migration still hold JSON text; those are
+    decoded the slow way so reads never depend on the migration having run.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return np.asarray(embedding_from_json(value), dtype=EMBEDDING_DTYPE)
+    return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
+
+
 def cosine_similarity(a: list[float], b: list[float]) -> float:
     """Compute cosine similarity between two vectors."""
-    a_np = np.array(a)
-    b_np = np.array(b)
+    a_np = np.asarray(a, dtype=np.float64)
+    b_np = np.asarray(b, dtype=np.float64)
     dot = np.dot(a_np, b_np)
     norm_a = np.linalg.norm(a_np)
     norm_b = np.linalg.norm(b_np)
     if norm_a == 0 or norm_b == 0:
         return 0.0
     return float(dot / (norm_a * norm_b))
+
+
+def stack_embeddings(
+    embeddings: list[Optional[np.ndarray]], dim: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Stack optional vectors into an (n, d) matrix plus a presence mask.
+
+    Missing vectors become zero rows with ``False`` in the mask.
+    """
+    present = [e for e in embeddings if e is not None and len(e)]
+    dim = len(present[0]) if present else (dim or 0)
+    matrix = np.zeros((len(embeddings), dim), dtype=EMBEDDING_DTYPE)
+    mask = np.zeros(len(embeddings), dtype=bool)
+    for i, e in enumerate(embeddings):
+        if e is not None and len(e):
+            matrix[i] = e
+            mask[i] = True
+    return matrix, mask
+
+
+def cosine_similarity_matrix(a, b) -> np.ndarray:
+    """Pairwise cosine similarity between the rows of ``a`` and ``b``.
+
+    Returns an (len(a), len(b)) matrix; rows with zero norm score 0.0.
+    """
+    a_np = np.atleast_2d(np.asarray(a, dtype=np.float64))
+    b_np = np.atleast_2d(np.asarray(b, dtype=np.float64))
+    denom = np.outer(np.linalg.norm(a_np, axis=1), np.linalg.norm(b_np, axis=1))
+    return np.divide(a_np @ b_np.T, denom, out=np.zeros_like(denom), where=denom > 0)
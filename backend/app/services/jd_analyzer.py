@@ -1,18 +1,29 @@
 """JD Analyzer — parses raw job description text into structured data.
 
 Uses Google Gemini for intelligent extraction, with a rule-based
-fallback if the API key is not set.
+fallback if the API key is not set. Gemini analyses are kept in the stage
+cache, so regenerating against the same JD does not call Gemini again.
 """
 
 import json
 import re
 import logging
+from dataclasses import asdict
+from typing import Optional
 
 from app.config import settings
 from app.domain.resume_draft import JDData
+from app.services.circuit_breaker import outbound_call
+from app.services.deadline import Deadline
+from app.services.embedding_cache import normalize_text
+from app.services.stage_cache import stage_cache, stage_key
 
 logger = logging.getLogger(__name__)
 
+# JD analysis may use at most this share of the remaining budget; the rest
+# is left for bullet rewriting
+_BUDGET_SHARE = 0.5
+
 
 def _clean_json_response(text: str) -> str:
     """Strip markdown code fences that Gemini sometimes wraps around JSON."""
@@ -23,7 +34,7 @@ def _clean_json_response(text: str) -> str:
     return text.strip()
 
 
-def analyze_jd_with_gemini(raw_text: str) -> JDData:
+def analyze_jd_with_gemini(raw_text: str, timeout: Optional[float] = None) -> JDData:
     """Use Gemini to extract structured data from a raw JD."""
     import google.generativeai as genai
 
@@ -46,7 +57,10 @@ Job Description:
 
 Return ONLY the JSON object, no explanations."""
 
-    response = model.generate_content(prompt)
+    with outbound_call("gemini", "analyze_jd"):
+        response = model.generate_content(
+            prompt, request_options={"timeout": timeout or settings.GEMINI_TIMEOUT_S},
+        )
     cleaned = _clean_json_response(response.text)
     data = json.loads(cleaned)
 
@@ -97,11 +111,34 @@ def analyze_jd_rules(raw_text: str) -> JDData:
     )
 
 
-def analyze_jd(raw_text: str) -> JDData:
-    """Analyze a job description — uses Gemini if available, else rules."""
-    if settings.GEMINI_API_KEY:
+def analyze_jd(raw_text: str, deadline: Optional[Deadline] = None) -> JDData:
+    """Analyze a job description — uses Gemini if available, else rules.
+
+    With a ``deadline``, Gemini gets at most half of the remaining budget,
+    and is skipped in favour of the rules when that is too little.
+    """
+    if not settings.GEMINI_API_KEY:
+        return analyze_jd_rules(raw_text)
+
+    deadline = deadline or Deadline()
+    use_cache = settings.STAGE_CACHE_ENABLED
+    key = stage_key("jd_analysis", settings.GEMINI_MODEL, normalize_text(raw_text))
+    cached = stage_cache.get(key) if use_cache else None
+    if cached is not None:
+        return JDData(**cached)
+
+    if not deadline.allows(settings.GEMINI_TIMEOUT_S, _BUDGET_SHARE):
+        logger.info("Latency budget too small for Gemini JD analysis, using rules")
+    else:
         try:
-            return analyze_jd_with_gemini(raw_text)
+            jd_data = analyze_jd_with_gemini(
+                raw_text, timeout=deadline.timeout(settings.GEMINI_TIMEOUT_S, _BUDGET_SHARE),
+            )
         except Exception as e:
             logger.warning("Gemini JD analysis failed, falling back to rules: %s", e)
+        else:
+            if use_cache:
+                stage_cache.put_many("jd_analysis", {key: asdict(jd_data)})
+            return jd_data
+    deadline.degrade("analyze_jd")
     return analyze_jd_rules(raw_text)
@@ -0,0 +1,148 @@
+"""Job Queue — background resume generation with status polling.
+
+Submitting a job writes a ``generation_jobs`` row and hands its id to a
+bounded worker pool; the HTTP request returns immediately. Each worker
+opens its own DB session, claims the job, runs ``generate_resume`` and
+records the result or error on the job row.
+
+A claimed job carries its queue's ``owner`` id and a lease that a
+heartbeat thread renews while the queue has work. On startup
+``recover()`` picks up queued jobs and running jobs whose lease expired
+(their process died); jobs another live process is running are left
+alone. Claiming is a conditional UPDATE, so only one process runs a job.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.generation_job import GenerationJob
+from app.repositories import GenerationJobRepo, ProfileRepository
+from app.services.orchestrator import generate_resume
+
+logger = logging.getLogger(__name__)
+
+# Fields of the generate_resume result exposed to clients (same as /generate)
+RESULT_FIELDS = (
+    "resume_id", "job_title", "version", "jd_analysis",
+    "skill_confidence", "keyword_coverage", "cached", "degraded",
+)
+
+
+class JobQueue:
+    """Bounded thread pool running persisted generation jobs."""
+
+    def __init__(self, session_factory=SessionLocal, max_workers: int = settings.JOB_WORKERS,
+                 max_pending: int = settings.JOB_MAX_PENDING,
+                 lease_s: float = settings.JOB_LEASE_S,
+                 heartbeat_s: float = settings.JOB_HEARTBEAT_S):
+        self._session_factory = session_factory
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._lease_s = lease_s
+        self._heartbeat_s = heartbeat_s
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._heartbeat_stop: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    def bind(self, session_factory):
+        """Run jobs against a different session factory."""
+        self._session_factory = session_factory
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="generation-job",
+                )
+                self._heartbeat_stop = threading.Event()
+                threading.Thread(
+                    target=self._heartbeat, args=(self._heartbeat_stop,),
+                    name="generation-job-heartbeat", daemon=True,
+                ).start()
+            return self._executor
+
+    def _heartbeat(self, stop: threading.Event):
+        """Renew this queue's leases until ``shutdown``."""
+        while not stop.wait(self._heartbeat_s):
+            db = self._session_factory()
+            try:
+                GenerationJobRepo.renew_leases(db, self.owner, self._lease_s)
+            except Exception:
+                logger.exception("Could not renew generation job leases")
+            finally:
+                db.close()
+
+    def submit(self, db: Session, profile_id: str, jd_text: str,
+               force: bool = False) -> GenerationJob:
+        """Persist a job and schedule it. Raises 503 when the backlog is full."""
+        ProfileRepository.get(db, profile_id)  # 404 before queueing
+        if GenerationJobRepo.count_unfinished(db) >= self._max_pending:
+            raise HTTPException(status_code=503, detail="Generation queue is full, retry later")
+        job = GenerationJobRepo.create(db, profile_id, jd_text, force)
+        self._get_executor().submit(self._run, job.id)
+        return job
+
+    def recover(self) -> int:
+        """Schedule queued jobs and running jobs whose lease has expired."""
+        db = self._session_factory()
+        try:
+            jobs = GenerationJobRepo.list_claimable(db)
+            for job in jobs:
+                self._get_executor().submit(self._run, job.id)
+            if jobs:
+                logger.info("Requeued %d unfinished generation jobs", len(jobs))
+            return len(jobs)
+        finally:
+            db.close()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers, then the heartbeat.
+
+        With ``wait=False`` jobs still running stop being renewed; another
+        process recovers them once their lease expires.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            stop, self._heartbeat_stop = self._heartbeat_stop, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        if stop is not None:
+            stop.set()
+
+    def _run(self, job_id: str):
+        db = self._session_factory()
+        try:
+            if not GenerationJobRepo.claim(db, job_id, self.owner, self._lease_s):
+                return  # finished, or running under another live owner
+            job = db.get(GenerationJob, job_id)
+            try:
+                result = generate_resume(db, job.profile_id, job.jd_text, force=job.force)
+            except Exception as e:
+                logger.exception("Generation job %s failed", job_id)
+                db.rollback()
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                GenerationJobRepo.set_status(db, job, "failed", error=str(detail))
+                return
+            GenerationJobRepo.set_status(
+                db, job, "succeeded",
+                result=json.dumps({k: result[k] for k in RESULT_FIELDS}),
+            )
+        except Exception:
+            logger.exception("Could not record outcome of generation job %s", job_id)
+        finally:
+            db.close()
+
+
+job_queue = JobQueue()
@@ -0,0 +1,63 @@
+"""Keyed Locks — single-flight coordination for work identified by a key.
+
+Identical generations and renders of the same artifact are expensive and
+often requested concurrently (double-clicks, retries, a preview and a
+download racing). Each key gets its own lock, created on first use and
+dropped when its last holder leaves; the second caller waits and then
+finds the first caller's result instead of redoing the work.
+"""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+
+class KeyedLocks:
+    """One lock per key, usable from threads and from coroutines."""
+
+    def __init__(self):
+        self._locks: dict[str, list] = {}  # key -> [lock, holders]
+        self._guard = threading.Lock()
+
+    def _enter(self, key: str) -> threading.Lock:
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _leave(self, key: str):
+        with self._guard:
+            entry = self._locks[key]
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    @contextmanager
+    def hold(self, key: str):
+        lock = self._enter(key)
+        try:
+            lock.acquire()
+        except BaseException:
+            self._leave(key)
+            raise
+        try:
+            yield
+        finally:
+            lock.release()
+            self._leave(key)
+
+    @asynccontextmanager
+    async def hold_async(self, key: str):
+        lock = self._enter(key)
+        try:
+            # Polling keeps the wait cancellable and off the thread pool
+            while not lock.acquire(blocking=False):
+                await asyncio.sleep(0.05)
+        except BaseException:
+            self._leave(key)
+            raise
+        try:
+            yield
+        finally:
+            lock.release()
+            self._leave(key)
@@ -0,0 +1,113 @@
+"""Keyword Matcher — shared, pre-lowered JD keyword and skill search.
+
+Scoring, skill selection and ATS coverage all ask the same question: which
+JD keywords and skills occur (case-insensitively, as substrings) in this
+text? The patterns are lowered once when a matcher is built, and every
+search is a C-level ``in``. Matchers built from a JD are cached, so the
+whole pipeline shares them.
+
+When many texts are scanned together, a pattern that occurs in none of
+them (searched once in the texts joined by NUL) is dropped before the
+per-text checks. The original loops lowered every pattern again for every
+text; a hand-written multi-pattern automaton was slower than both, paying
+a Python-level step per character. See ``benchmarks/keyword_matching.py``.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+
+from app.domain.resume_draft import JDData
+
+
+class KeywordMatcher:
+    """Case-insensitive substring search for many patterns at once.
+
+    ``find(text)`` returns the indices of all patterns that occur in
+    ``text`` — the same answer as ``[i for i, p in enumerate(patterns)
+    if p.lower() in text.lower()]``, including duplicate patterns and the
+    empty pattern (which occurs in every text).
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._lowered = [p.lower() for p in self.patterns]
+
+    def find(self, text: str) -> set[int]:
+        """Indices of all patterns occurring in ``text``."""
+        text = text.lower()
+        return {i for i, p in enumerate(self._lowered) if p in text}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Per-JD matcher
+# ═══════════════════════════════════════════════════════════════
+
+
+@dataclass(slots=True)
+class JDHits:
+    """What one text matched of a JD."""
+    keyword_count: int
+    keywords: frozenset[int]  # indices into JDData.keywords
+    must_have: bool
+    nice_to_have: bool
+
+
+class JDMatcher:
+    """A JD's keywords, must-have and nice-to-have skills, lowered once."""
+
+    def __init__(self, keywords: tuple[str, ...], must_have: tuple[str, ...], nice_to_have: tuple[str, ...]):
+        self._keywords = [k.lower() for k in keywords]
+        self._must_have = [s.lower() for s in must_have]
+        self._nice_to_have = [s.lower() for s in nice_to_have]
+
+    def scan(self, text: str) -> JDHits:
+        has = text.lower().__contains__
+        keywords = frozenset(i for i, k in enumerate(self._keywords) if has(k))
+        return JDHits(
+            keyword_count=len(keywords),
+            keywords=keywords,
+            must_have=any(map(has, self._must_have)),
+            nice_to_have=any(map(has, self._nice_to_have)),
+        )
+
+    def scan_many(self, texts: list[str]) -> tuple[list[int], list[bool], list[bool]]:
+        """Keyword hit counts and must-have / nice-to-have flags per text."""
+        lowered = [t.lower() for t in texts]
+        # Patterns found in none of the texts need no per-text check
+        anywhere = "\0".join(lowered).__contains__
+        keywords = [k for k in self._keywords if "\0" in k or anywhere(k)]
+        must_have = [s for s in self._must_have if "\0" in s or anywhere(s)]
+        nice_to_have = [s for s in self._nice_to_have if "\0" in s or anywhere(s)]
+
+        counts, must, nice = [], [], []
+        for text in lowered:
+            has = text.__contains__
+            counts.append(sum(map(has, keywords)))
+            must.append(any(map(has, must_have)))
+            nice.append(any(map(has, nice_to_have)))
+        return counts, must, nice
+
+
+@lru_cache(maxsize=64)
+def _jd_matcher(keywords: tuple[str, ...], must_have: tuple[str, ...], nice_to_have: tuple[str, ...]) -> JDMatcher:
+    return JDMatcher(keywords, must_have, nice_to_have)
+
+
+def jd_matcher(jd_data: JDData) -> JDMatcher:
+    """Compiled matcher for a JD, shared by every caller that sees the same JD."""
+    return _jd_matcher(
+        tuple(jd_data.keywords),
+        tuple(jd_data.must_have_skills),
+        tuple(jd_data.nice_to_have_skills),
+    )
+
+
+def contained_in_any(patterns: list[str], texts: Iterable[str]) -> set[int]:
+    """Indices of ``patterns`` occurring (case-insensitively) in at least one text."""
+    lowered = [t.lower() for t in texts]
+    joined = "\0".join(lowered)  # one search per pattern across all texts
+    return {
+        i for i, p in enumerate(patterns)
+        if lowered and (p.lower() in joined if "\0" not in p else any(p.lower() in t for t in lowered))
+    }
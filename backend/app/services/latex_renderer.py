@@ -5,9 +5,11 @@ import re
 import subprocess
 import tempfile
 import logging
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 
 from app.config import settings
 
@@ -39,8 +41,9 @@ def latex_escape(text: str) -> str:
     return text
 
 
-def render_latex(resume_data: dict) -> str:
-    """Render resume data into LaTeX source using Jinja2 template."""
+@lru_cache(maxsize=1)
+def _get_template() -> Template:
+    """Compile the resume template once per process (rendering is thread-safe)."""
     env = Environment(
         loader=FileSystemLoader(str(TEMPLATE_DIR)),
         block_start_string="{% ",
@@ -51,16 +54,22 @@ def render_latex(resume_data: dict) -> str:
         comment_end_string=" #}",
     )
     env.filters["latex_escape"] = latex_escape
+    return env.get_template("resume.tex.j2")
+
 
-    template = env.get_template("resume.tex.j2")
-    return template.render(**resume_data)
+def render_latex(resume_data: dict) -> str:
+    """Render resume data into LaTeX source using Jinja2 template."""
+    return _get_template().render(**resume_data)
 
 
-def compile_pdf(latex_source: str, output_path: str) -> str:
+def compile_pdf(latex_source: str, output_path: str, timeout: Optional[float] = None) -> str:
     """Compile LaTeX source to PDF using pdflatex.
 
+    ``timeout`` defaults to PDFLATEX_TIMEOUT_S.
     Returns the path to the generated PDF file.
     """
+    if timeout is None:
+        timeout = settings.PDFLATEX_TIMEOUT_S
     os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
 
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -71,7 +80,7 @@ def compile_pdf(latex_source: str, output_path: str) -> str:
         try:
             result = subprocess.run(
                 ["pdflatex", "-interaction=nonstopmode", "-output-directory", tmpdir, tex_file],
-                capture_output=True, text=True, timeout=30,
+                capture_output=True, text=True, timeout=timeout,
             )
             if result.returncode != 0:
                 logger.error("pdflatex stderr: %s", result.stderr)
@@ -79,6 +88,8 @@ def compile_pdf(latex_source: str, output_path: str) -> str:
         except FileNotFoundError:
             logger.error("pdflatex not found. Install texlive: sudo apt-get install texlive-latex-base texlive-latex-extra")
             raise RuntimeError("pdflatex not installed")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"pdflatex timed out after {timeout:.1f}s")
 
         pdf_source = os.path.join(tmpdir, "resume.pdf")
         if not os.path.exists(pdf_source):
@@ -91,7 +102,7 @@ def compile_pdf(latex_source: str, output_path: str) -> str:
     return output_path
 
 
-def render_resume_to_pdf(resume_data: dict, output_path: str) -> str:
+def render_resume_to_pdf(resume_data: dict, output_path: str, timeout: Optional[float] = None) -> str:
     """Full pipeline: resume data → LaTeX → PDF."""
     latex_source = render_latex(resume_data)
-    return compile_pdf(latex_source, output_path)
+    return compile_pdf(latex_source, output_path, timeout)
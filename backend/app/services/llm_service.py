@@ -5,14 +5,22 @@ Constraints:
   - No fabrication of skills
   - No structural changes
   - Output must follow a predefined schema
+
+Gemini rewrites are cached per bullet: after an edit, only bullets whose
+text (or the target title / keywords) changed are sent to Gemini again.
 """
 
 import json
 import re
 import logging
+from typing import Optional
 
 from app.config import settings
 from app.domain.resume_draft import ResumeDraft, ScoredBullet
+from app.services.circuit_breaker import outbound_call
+from app.services.deadline import Deadline
+from app.services.embedding_cache import normalize_text
+from app.services.stage_cache import stage_cache, stage_key
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +37,7 @@ def rewrite_bullets_with_gemini(
     bullets: list[ScoredBullet],
     job_title: str,
     keywords: list[str],
+    timeout: Optional[float] = None,
 ) -> list[ScoredBullet]:
     """Rewrite bullet points using Gemini for ATS optimization."""
     import google.generativeai as genai
@@ -55,7 +64,10 @@ Original bullets:
 Return ONLY a JSON array of rewritten strings, same length as input.
 Example: ["Rewritten bullet 1", "Rewritten bullet 2"]"""
 
-    response = model.generate_content(prompt)
+    with outbound_call("gemini", "rewrite_bullets"):
+        response = model.generate_content(
+            prompt, request_options={"timeout": timeout or settings.GEMINI_TIMEOUT_S},
+        )
     cleaned = _clean_json_response(response.text)
     rewritten = json.loads(cleaned)
 
@@ -70,6 +82,53 @@ Example: ["Rewritten bullet 1", "Rewritten bullet 2"]"""
     return bullets
 
 
+def rewrite_bullets_incremental(
+    bullets: list[ScoredBullet],
+    job_title: str,
+    keywords: list[str],
+    deadline: Optional[Deadline] = None,
+) -> list[ScoredBullet]:
+    """Gemini rewriting that reuses cached rewrites of unchanged bullets.
+
+    Bullets that still need Gemini get the rule-based rewrite instead when
+    the ``deadline`` leaves too little time for the call.
+    """
+    deadline = deadline or Deadline()
+    use_cache = settings.STAGE_CACHE_ENABLED
+    # Same inputs as the prompt: model, title, the first 10 keywords, the bullet
+    keys = [
+        stage_key("rewrite", settings.GEMINI_MODEL, job_title, keywords[:10], normalize_text(b.text))
+        for b in bullets
+    ]
+    cached = stage_cache.get_many(keys) if use_cache else {}
+    pending = []
+    for bullet, key in zip(bullets, keys):
+        if key in cached:
+            bullet.rewritten_text = cached[key]
+        else:
+            pending.append((bullet, key))
+
+    if not pending:
+        return bullets
+    if not deadline.allows(settings.GEMINI_TIMEOUT_S):
+        logger.info("Latency budget too small for Gemini rewriting, using rules")
+        deadline.degrade("rewrite_bullets")
+        rewrite_bullets_simple([b for b, _ in pending], job_title, keywords)
+        return bullets
+
+    logger.info("Rewriting %d of %d bullets (%d cached)",
+                len(pending), len(bullets), len(bullets) - len(pending))
+    rewrite_bullets_with_gemini(
+        [b for b, _ in pending], job_title, keywords,
+        timeout=deadline.timeout(settings.GEMINI_TIMEOUT_S),
+    )
+    if use_cache:
+        stage_cache.put_many("rewrite", {
+            key: bullet.rewritten_text for bullet, key in pending if bullet.rewritten_text
+        })
+    return bullets
+
+
 def rewrite_bullets_simple(
     bullets: list[ScoredBullet],
     job_title: str,
@@ -95,7 +154,7 @@ def rewrite_bullets_simple(
     return bullets
 
 
-def rewrite_draft_bullets(draft: ResumeDraft) -> ResumeDraft:
+def rewrite_draft_bullets(draft: ResumeDraft, deadline: Optional[Deadline] = None) -> ResumeDraft:
     """Rewrite all bullets in the draft using the best available method."""
     keywords = draft.jd_data.keywords if draft.jd_data else []
     job_title = draft.job_title
@@ -109,9 +168,11 @@ def rewrite_draft_bullets(draft: ResumeDraft) -> ResumeDraft:
 
     if settings.GEMINI_API_KEY:
         try:
-            rewrite_bullets_with_gemini(all_bullets, job_title, keywords)
+            rewrite_bullets_incremental(all_bullets, job_title, keywords, deadline)
         except Exception as e:
             logger.warning("Gemini rewriting failed, using fallback: %s", e)
+            if deadline is not None:
+                deadline.degrade("rewrite_bullets")
             rewrite_bullets_simple(all_bullets, job_title, keywords)
     else:
         rewrite_bullets_simple(all_bullets, job_title, keywords)
@@ -0,0 +1,308 @@
+"""Metrics — in-process counters and histograms in Prometheus text format.
+
+Four things are measured:
+  - every stage of the generation pipeline (``pipeline_stage_seconds``),
+    plus whole runs and their outcome
+  - every outbound Gemini / Pinecone call (``outbound_call_seconds``),
+    plus the state of each service's circuit breaker
+  - every on-demand PDF / DOCX render (``render_seconds``)
+  - every HTTP request (``http_request_seconds``)
+
+``render()`` produces the text exposition format served at ``/metrics``.
+A ``PipelineTrace`` also keeps the per-stage breakdown of one run, so slow
+requests can be logged with the stage that made them slow.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[idx] += 1
+            total[0] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(c), t[0])) for k, (c, t) in self._series.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+PIPELINE_RUNS = REGISTRY.register(Counter(
+    "oneresume_pipeline_runs_total", "Resume generation runs by outcome", ("outcome",),
+))
+PIPELINE_SECONDS = REGISTRY.register(Histogram(
+    "oneresume_pipeline_seconds", "End-to-end resume generation latency",
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "oneresume_pipeline_stage_seconds", "Latency of each generation pipeline stage", ("stage",),
+))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    "oneresume_pipeline_stage_errors_total", "Pipeline stages that raised", ("stage",),
+))
+OUTBOUND_SECONDS = REGISTRY.register(Histogram(
+    "oneresume_outbound_call_seconds", "Latency of calls to external APIs", ("service", "operation"),
+))
+OUTBOUND_CALLS = REGISTRY.register(Counter(
+    "oneresume_outbound_calls_total", "Calls to external APIs by outcome",
+    ("service", "operation", "outcome"),
+))
+CIRCUIT_STATE = REGISTRY.register(Gauge(
+    "oneresume_circuit_state", "Circuit breaker state per service (0 closed, 1 half-open, 2 open)",
+    ("service",),
+))
+CIRCUIT_REJECTED = REGISTRY.register(Counter(
+    "oneresume_circuit_rejected_total", "Calls failed fast by an open circuit breaker", ("service",),
+))
+RENDER_SECONDS = REGISTRY.register(Histogram(
+    "oneresume_render_seconds", "Latency of rendering a resume artifact", ("format", "outcome"),
+))
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "oneresume_http_request_seconds", "HTTP request latency", ("method", "route", "status"),
+))
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format (0.0.4)."""
+    return REGISTRY.render()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Instrumentation helpers
+# ═══════════════════════════════════════════════════════════════
+
+
+@contextmanager
+def track_call(service: str, operation: str):
+    """Time one outbound call and count its outcome."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        OUTBOUND_SECONDS.observe(time.perf_counter() - start, service=service, operation=operation)
+        OUTBOUND_CALLS.inc(service=service, operation=operation, outcome=outcome)
+
+
+# Traces of pipeline runs started while serving the current HTTP request
+_request_traces: ContextVar[Optional[list]] = ContextVar("request_traces", default=None)
+
+
+class PipelineTrace:
+    """Per-stage timings of one pipeline run."""
+
+    def __init__(self, name: str = "generate_resume",
+                 on_stage: Optional[Callable[[str, float], None]] = None):
+        self.name = name
+        self._on_stage = on_stage
+        self.stages: dict[str, float] = {}
+        self._start = time.perf_counter()
+        self.total: Optional[float] = None
+        holder = _request_traces.get()
+        self._in_request = holder is not None
+        if holder is not None:
+            holder.append(self)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; ``on_stage(name, seconds)`` fires when it succeeds."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            STAGE_ERRORS.inc(stage=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            STAGE_SECONDS.observe(elapsed, stage=name)
+        if self._on_stage is not None:
+            self._on_stage(name, elapsed)
+
+    def finish(self, outcome: str = "ok"):
+        self.total = time.perf_counter() - self._start
+        PIPELINE_SECONDS.observe(self.total)
+        PIPELINE_RUNS.inc(outcome=outcome)
+        # Runs inside an HTTP request are reported by the request log instead
+        if not self._in_request and self.total * 1000 >= settings.SLOW_REQUEST_MS:
+            logger.warning("Slow %s: %s", self.name, self.breakdown())
+
+    def breakdown(self) -> str:
+        stages = ", ".join(f"{k}={v * 1000:.0f}ms" for k, v in self.stages.items())
+        total = f"{self.total * 1000:.0f}ms" if self.total is not None else "unfinished"
+        return f"total={total} [{stages}]"
+
+    @contextmanager
+    def run(self):
+        """Wrap a whole pipeline run, recording its outcome."""
+        try:
+            yield self
+        except BaseException:
+            self.finish("error")
+            raise
+        self.finish("ok")
+
+
+@contextmanager
+def request_scope():
+    """Collect pipeline traces started while handling one request."""
+    traces: list[PipelineTrace] = []
+    token = _request_traces.set(traces)
+    try:
+        yield traces
+    finally:
+        _request_traces.reset(token)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float,
+                    traces: list[PipelineTrace]):
+    """Record an HTTP request and log it if it exceeded SLOW_REQUEST_MS."""
+    HTTP_SECONDS.observe(seconds, method=method, route=route, status=str(status))
+    if seconds * 1000 >= settings.SLOW_REQUEST_MS:
+        detail = "; ".join(f"{t.name} {t.breakdown()}" for t in traces)
+        logger.warning(
+            "Slow request %s %s -> %d in %.0fms%s",
+            method, route, status, seconds * 1000, f" | {detail}" if detail else "",
+        )
@@ -3,182 +3,689 @@
 Flow:
   JD text → JD Analysis → Embedding → Profile scoring →
   Relevance selection → LLM rewriting → ATS optimization →
-  Assembly → Rendering → Storage
+  Assembly → Storage
+
+PDF and DOCX files are not part of the pipeline; they are rendered from
+the stored sections on first download (see ``artifacts``).
+
+``generate_resume`` runs the stages serially. ``generate_resume_async``
+runs the same stages on an event loop: network work goes to worker
+threads, and JD analysis + JD embedding run alongside the profile
+embedding refresh. ``generate_resumes_batch_async`` runs many JDs for one
+profile the same way, sharing the profile work. ``preview_resume_async``
+stops after assembly and persists nothing. In the async variants the
+session and the CPU-bound stages (selection, ATS optimization, assembly)
+also run in worker threads, so the event loop only awaits; session work
+is serialized, one call at a time.
 """
 
+import asyncio
+import hashlib
 import json
-import os
 import logging
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.repositories import ProfileRepository, JDAnalysisRepo, ResumeRepo
+from app.models.profile import Profile
+from app.repositories import ProfileRepository, JDAnalysisRepo, ResumeRepo, unit_of_work
 from app.services.jd_analyzer import analyze_jd
 from app.services.embedding_service import (
-    generate_embedding, generate_embeddings, embedding_to_json, embedding_from_json,
+    generate_embedding, generate_embeddings, embedding_to_blob, embedding_from_blob,
 )
+from app.services.embedding_cache import normalize_text
+from app.services.embedding_providers import get_provider
 from app.services.relevance_selector import select_relevant_content
 from app.services.llm_service import rewrite_draft_bullets
 from app.services.ats_optimizer import optimize
-from app.services.resume_assembler import assemble_resume, resume_to_sections_json
-from app.services.latex_renderer import render_resume_to_pdf
-from app.services.export_service import export_to_docx
+from app.services.resume_assembler import (
+    assemble_resume, resume_to_sections_json, resume_from_record,
+)
+from app.services.deadline import Deadline
+from app.services.keyed_locks import KeyedLocks
+from app.services.metrics import PipelineTrace
 
 logger = logging.getLogger(__name__)
 
+# on_progress(event, payload) — called as stages finish, on the caller's thread
+ProgressFn = Callable[[str, dict], None]
+
+
+def _loaded_profile(db: Session, profile):
+    """``profile`` with its sections loaded.
+
+    A commit expires every loaded section; reload the whole aggregate in
+    a fixed number of queries instead of lazily, one section at a time.
+    """
+    state = sa_inspect(profile)
+    if state.expired:
+        return ProfileRepository.get_full(db, state.identity[0])
+    return profile
+
+
+def _missing_bullets(profile) -> list:
+    """Experience and project bullets that have no stored embedding yet."""
+    return [
+        b for section in list(profile.experience) + list(profile.projects)
+        for b in section.bullets if not b.embedding
+    ]
 
-def _ensure_embeddings(db: Session, profile):
-    """Generate and store embeddings for profile bullets that lack them."""
-    changed = False
+
+def _apply_embeddings(db: Session, profile, missing: list, vectors: list):
+    """Store freshly computed bullet vectors and refresh stale centroids."""
+    for bullet, vector in zip(missing, vectors):
+        bullet.embedding = embedding_to_blob(vector)
+
+    refreshed = {b.id for b in missing}
+    changed = bool(missing)
 
     for exp in profile.experience:
-        for bullet in exp.bullets:
-            if not bullet.embedding:
-                emb = generate_embedding(bullet.bullet_text)
-                bullet.embedding = embedding_to_json(emb)
-                changed = True
+        if not exp.bullets:
+            continue
+        stale = any(b.id in refreshed for b in exp.bullets)
+        if exp.experience_embedding and not stale:
+            continue
         # Section-level embedding (average of bullets)
-        if not exp.experience_embedding and exp.bullets:
-            texts = [b.bullet_text for b in exp.bullets]
-            embs = generate_embeddings(texts)
-            import numpy as np
-            avg = np.mean(embs, axis=0).tolist()
-            exp.experience_embedding = embedding_to_json(avg)
-            changed = True
-
-    for proj in profile.projects:
-        for bullet in proj.bullets:
-            if not bullet.embedding:
-                emb = generate_embedding(bullet.bullet_text)
-                bullet.embedding = embedding_to_json(emb)
-                changed = True
+        vectors = [embedding_from_blob(b.embedding) for b in exp.bullets]
+        exp.experience_embedding = embedding_to_blob(np.mean(vectors, axis=0))
+        changed = True
 
     if changed:
         db.commit()
 
 
+def _ensure_embeddings(db: Session, profile):
+    """Generate and store embeddings for profile bullets that lack them.
+
+    Every missing bullet across experience and projects is embedded in a
+    single batched pass. Experience centroids are averaged from the stored
+    bullet vectors instead of re-embedding the bullet texts.
+    """
+    missing = _missing_bullets(profile)
+    vectors = generate_embeddings([b.bullet_text for b in missing]) if missing else []
+    _apply_embeddings(db, profile, missing, vectors)
+
+
+def refresh_profile_embeddings(bind, profile_id: str):
+    """Background task: embed a profile's new bullets in one batched pass.
+
+    Opens its own session on ``bind`` (the request's session is closed by
+    the time background tasks run). Failures are only logged; bullets
+    left without vectors are embedded by the next generation.
+    """
+    db = Session(bind=bind)
+    try:
+        _ensure_embeddings(db, ProfileRepository.get_full(db, profile_id))
+    except Exception as e:
+        logger.warning("Embedding refresh for profile %s failed: %s", profile_id, e)
+    finally:
+        db.close()
+
+
+# ── Pipeline stages ───────────────────────────────────────────
+
+
+def _jd_summary(jd_data) -> dict:
+    return {
+        "role_title": jd_data.role_title,
+        "experience_level": jd_data.experience_level,
+        "must_have_skills": jd_data.must_have_skills,
+        "nice_to_have_skills": jd_data.nice_to_have_skills,
+        "keywords": jd_data.keywords,
+        "role_category": jd_data.role_category,
+    }
+
+
+def _section_payload(section, rewritten: bool = False) -> dict:
+    return {
+        "id": section.id,
+        "title": section.title,
+        "subtitle": section.subtitle,
+        "section_type": section.section_type,
+        "score": section.score,
+        "bullets": [
+            (b.rewritten_text or b.text) if rewritten else b.text
+            for b in section.bullets
+        ],
+    }
+
+
+def _selection_payload(draft) -> dict:
+    return {
+        "experience": [_section_payload(s) for s in draft.experience_sections],
+        "projects": [_section_payload(s) for s in draft.project_sections],
+        "skills": draft.selected_skills,
+        "skill_confidence": draft.skill_confidence,
+    }
+
+
+def _rewrite_payload(draft) -> dict:
+    return {
+        "experience": [_section_payload(s, rewritten=True) for s in draft.experience_sections],
+        "projects": [_section_payload(s, rewritten=True) for s in draft.project_sections],
+    }
+
+
+def _progress_trace(name: str, on_progress: Optional[ProgressFn]) -> tuple[PipelineTrace, ProgressFn]:
+    """Trace whose finished stages are also reported as progress events."""
+    if on_progress is None:
+        return PipelineTrace(name), lambda event, payload: None
+
+    def stage_done(stage: str, seconds: float):
+        on_progress("stage", {"stage": stage, "ms": round(seconds * 1000)})
+
+    return PipelineTrace(name, on_stage=stage_done), on_progress
+
+
+def _jd_embedding_text(jd_data) -> str:
+    return f"{jd_data.role_title} {' '.join(jd_data.must_have_skills)} {' '.join(jd_data.keywords)}"
+
+
+def _store_jd_analysis(db: Session, jd_text: str, jd_data, jd_embedding):
+    return JDAnalysisRepo.create(
+        db, raw_text=jd_text,
+        structured_data=json.dumps(_jd_summary(jd_data)),
+        embedding=embedding_to_blob(jd_embedding),
+    )
+
+
+def _store_resume(db: Session, profile_id: str, jd_id: str, job_title: str,
+                  version: int, resume_data: dict, input_hash: str, deadline: Deadline):
+    # A result degraded by the latency budget must not be served from the cache
+    resume_record = ResumeRepo.create(
+        db, profile_id=profile_id, jd_id=jd_id,
+        job_title=job_title, version=version,
+        input_hash=None if deadline.degraded else input_hash,
+    )
+    ResumeRepo.add_sections(db, resume_record.id, resume_to_sections_json(resume_data))
+    return resume_record
+
+
+def _store_generation(db: Session, profile_id: str, jd_text: str, jd_data, jd_embedding,
+                      draft, version: int, resume_data: dict, input_hash: str,
+                      deadline: Deadline) -> dict:
+    """Store JD analysis, resume record and sections in one transaction.
+
+    Files are rendered on download. Returns the generation result.
+    """
+    draft.version = version
+    with unit_of_work(db):
+        jd_record = _store_jd_analysis(db, jd_text, jd_data, jd_embedding)
+        draft.jd_id = jd_record.id
+        resume_record = _store_resume(
+            db, profile_id, jd_record.id, jd_data.role_title, version,
+            resume_data, input_hash, deadline,
+        )
+    return _result(resume_record, jd_data, draft, resume_data, deadline)
+
+
+def _result(resume_record, jd_data, draft, resume_data: dict, deadline: Deadline) -> dict:
+    return {
+        "resume_id": resume_record.id,
+        "job_title": jd_data.role_title,
+        "version": resume_record.version,
+        "resume_data": resume_data,
+        "jd_analysis": _jd_summary(jd_data),
+        "skill_confidence": draft.skill_confidence,
+        "keyword_coverage": draft.keyword_coverage,
+        "cached": False,
+        "degraded": list(deadline.degraded),
+    }
+
+
+# ── Result cache ──────────────────────────────────────────────
+
+
+def generation_key(db: Session, profile_id: str, jd_text: str) -> str:
+    """Result-cache key: profile content, normalized JD and generation settings.
+
+    The profile's ``content_version`` changes on every section write, so it
+    stands in for a hash of the profile content.
+    """
+    content_version = db.query(Profile.content_version).filter(
+        Profile.id == profile_id
+    ).scalar() or 0
+    payload = json.dumps({
+        "profile": [profile_id, content_version],
+        "jd": normalize_text(jd_text),
+        "constraints": [
+            settings.MAX_EXPERIENCE_SECTIONS, settings.MAX_PROJECT_SECTIONS,
+            settings.MAX_BULLETS_PER_SECTION, settings.MAX_SKILLS,
+        ],
+        "llm": settings.GEMINI_MODEL if settings.GEMINI_API_KEY else "rule-based",
+        "embeddings": get_provider().name,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _find_cached(db: Session, profile_id: str, input_hash: str) -> Optional[dict]:
+    """Result of an earlier identical generation, if there is one."""
+    resume = ResumeRepo.find_by_input_hash(db, profile_id, input_hash)
+    if resume is None:
+        return None
+
+    resume_data = resume_from_record(resume)
+    jd_analysis = json.loads(JDAnalysisRepo.get(db, resume.jd_id).structured_data) \
+        if resume.jd_id else {}
+    logger.info("Returning cached resume %s (v%d)", resume.id, resume.version)
+    return {
+        "resume_id": resume.id,
+        "job_title": resume.job_title,
+        "version": resume.version,
+        "resume_data": resume_data,
+        "jd_analysis": jd_analysis,
+        "skill_confidence": resume_data["skill_confidence"],
+        "keyword_coverage": resume_data["keyword_coverage"],
+        "cached": True,
+        "degraded": [],
+    }
+
+
+# Concurrent identical requests wait for the first; forced runs skip it
+_generation_locks = KeyedLocks()
+
+
+# ── Entry points ──────────────────────────────────────────────
+
+
 def generate_resume(
     db: Session,
     profile_id: str,
     jd_text: str,
+    on_progress: Optional[ProgressFn] = None,
+    force: bool = False,
+    deadline: Optional[Deadline] = None,
 ) -> dict:
     """Run the full resume generation pipeline.
 
+    Every stage is timed into the pipeline metrics. ``on_progress``
+    receives a ``stage`` event per finished stage and partial results
+    (``jd_analysis``, ``selection``, ``rewritten``, ``ats``) as soon as
+    they exist.
+
+    If the same profile content was already generated against the same
+    JD with the same settings, that resume is returned (``cached: True``)
+    without rerunning anything; ``force=True`` always regenerates.
+
+    With a ``deadline``, Gemini stages get timeouts from the remaining
+    budget and switch to their local fallbacks up front when it runs low.
+    Stages that fell back are listed in ``degraded``.
+
     Returns:
-        dict with keys: resume_id, job_title, version, pdf_path, docx_path, resume_data
+        dict with keys: resume_id, job_title, version, resume_data, jd_analysis,
+        skill_confidence, keyword_coverage, cached, degraded
     """
+    deadline = deadline or Deadline()
+    trace, emit = _progress_trace("generate_resume", on_progress)
+    with trace.run():
+        # Identical input and an unchanged profile → reuse the earlier result
+        input_hash = generation_key(db, profile_id, jd_text)
+        if force:
+            return _generate_sync(db, profile_id, jd_text, trace, emit, input_hash, deadline)
+        with _generation_locks.hold(input_hash):
+            cached = _find_cached(db, profile_id, input_hash)
+            if cached is not None:
+                emit("cached", {"resume_id": cached["resume_id"]})
+                return cached
+            return _generate_sync(db, profile_id, jd_text, trace, emit, input_hash, deadline)
+
+
+def _generate_sync(db: Session, profile_id: str, jd_text: str, trace: PipelineTrace,
+                   emit: ProgressFn, input_hash: str, deadline: Deadline) -> dict:
+    """The whole pipeline, run serially."""
     # 1. Get profile
-    profile = ProfileRepository.get(db, profile_id)
+    with trace.stage("load_profile"):
+        profile = ProfileRepository.get_full(db, profile_id)
 
     # 2. Analyze JD
     logger.info("Step 1: Analyzing job description...")
-    jd_data = analyze_jd(jd_text)
+    with trace.stage("analyze_jd"):
+        jd_data = analyze_jd(jd_text, deadline)
+    emit("jd_analysis", _jd_summary(jd_data))
 
-    # 3. Store JD analysis
-    jd_record = JDAnalysisRepo.create(
-        db, raw_text=jd_text,
-        structured_data=json.dumps({
-            "role_title": jd_data.role_title,
-            "experience_level": jd_data.experience_level,
-            "must_have_skills": jd_data.must_have_skills,
-            "nice_to_have_skills": jd_data.nice_to_have_skills,
-            "keywords": jd_data.keywords,
-            "role_category": jd_data.role_category,
-        }),
-    )
-
-    # 4. Generate JD embedding
+    # 3. Generate JD embedding
     logger.info("Step 2: Generating embeddings...")
-    jd_combined = f"{jd_data.role_title} {' '.join(jd_data.must_have_skills)} {' '.join(jd_data.keywords)}"
-    jd_embedding = generate_embedding(jd_combined)
+    with trace.stage("embed_jd"):
+        jd_embedding = generate_embedding(_jd_embedding_text(jd_data))
 
-    # Store JD embedding
-    jd_record.embedding = embedding_to_json(jd_embedding)
-    db.commit()
+    # 4. Ensure profile has embeddings
+    with trace.stage("embed_profile"):
+        profile = _loaded_profile(db, profile)
+        _ensure_embeddings(db, profile)
+        profile = _loaded_profile(db, profile)
 
-    # 5. Ensure profile has embeddings
-    _ensure_embeddings(db, profile)
-    db.refresh(profile)
-
-    # 6. Select relevant content
+    # 5. Select relevant content
     logger.info("Step 3: Selecting relevant content...")
-    draft = select_relevant_content(db, profile, jd_data, jd_embedding)
-    draft.jd_id = jd_record.id
+    with trace.stage("select_content"):
+        draft = select_relevant_content(db, profile, jd_data, jd_embedding)
+    emit("selection", _selection_payload(draft))
 
-    # 7. LLM rewriting
+    # 6. LLM rewriting
     logger.info("Step 4: Rewriting bullets...")
-    draft = rewrite_draft_bullets(draft)
+    with trace.stage("rewrite_bullets"):
+        draft = rewrite_draft_bullets(draft, deadline)
+    emit("rewritten", _rewrite_payload(draft))
 
-    # 8. ATS optimization
+    # 7. ATS optimization
     logger.info("Step 5: ATS optimization...")
-    draft = optimize(draft)
+    with trace.stage("ats_optimize"):
+        draft = optimize(draft)
+    emit("ats", {"keyword_coverage": draft.keyword_coverage})
 
-    # 9. Assemble resume
+    # 8. Assemble resume
     logger.info("Step 6: Assembling resume...")
-    resume_data = assemble_resume(draft)
+    with trace.stage("assemble"):
+        resume_data = assemble_resume(draft)
 
-    # 10. Determine version
+    # 9. Determine version
     version = ResumeRepo.get_next_version(db, profile_id, jd_data.role_title)
-    draft.version = version
 
-    # 11. Render to files
-    output_dir = settings.OUTPUT_DIR
-    os.makedirs(output_dir, exist_ok=True)
+    # 10. Store JD analysis, resume record and sections in one transaction
+    with trace.stage("store_resume"):
+        return _store_generation(db, profile_id, jd_text, jd_data, jd_embedding,
+                                 draft, version, resume_data, input_hash, deadline)
 
-    safe_title = "".join(c if c.isalnum() or c in "-_ " else "" for c in jd_data.role_title)
-    base_name = f"{safe_title}_v{version}".replace(" ", "_")
 
-    pdf_path = os.path.join(output_dir, f"{base_name}.pdf")
-    docx_path = os.path.join(output_dir, f"{base_name}.docx")
+async def _to_thread_to_end(fn, *args):
+    """``asyncio.to_thread`` that, if cancelled, waits for the thread to finish.
 
-    # Try PDF (requires pdflatex)
+    A worker thread cannot be stopped. Session work cancelled halfway
+    would otherwise still be using the session (and, through the caller,
+    its generation lock) after the caller has let go of both.
+    """
+    work = asyncio.ensure_future(asyncio.to_thread(fn, *args))
     try:
-        render_resume_to_pdf(resume_data, pdf_path)
-        logger.info("PDF generated: %s", pdf_path)
-    except Exception as e:
-        logger.warning("PDF generation failed: %s", e)
-        pdf_path = None
+        return await asyncio.shield(work)
+    except asyncio.CancelledError:
+        await asyncio.gather(work, return_exceptions=True)
+        raise
 
-    # Always generate DOCX
-    try:
-        export_to_docx(resume_data, docx_path)
-        logger.info("DOCX generated: %s", docx_path)
-    except Exception as e:
-        logger.warning("DOCX generation failed: %s", e)
-        docx_path = None
 
-    # 12. Store resume record
-    file_path = pdf_path or docx_path or ""
-    resume_record = ResumeRepo.create(
-        db, profile_id=profile_id, jd_id=jd_record.id,
-        job_title=jd_data.role_title, version=version,
-        file_path=file_path,
-    )
+class _ProfileRun:
+    """State shared by every JD generated for one profile in one call.
+
+    The profile is loaded once, into a session of its own that does not
+    expire it on commit, so storing one JD's resume never forces a reload
+    for the next. Its missing embeddings are refreshed once (in the
+    background, while the first JDs are being analyzed) through that same
+    session. Network stages share one semaphore, so a batch never has
+    more than ``concurrency`` Gemini or embedding calls in flight. Session
+    work goes through ``in_db``: a worker thread, one call at a time,
+    since a ``Session`` is not safe for concurrent use.
+    """
+
+    def __init__(self, db: Session, snapshot: Session, profile, concurrency: int):
+        self.db = db
+        self.profile_id = profile.id
+        self.profile = profile
+        self._snapshot = snapshot
+        self._limit = asyncio.Semaphore(max(1, concurrency))
+        self._db_lock = asyncio.Lock()
+        self._reserved_versions: dict[str, int] = {}
+        self.embeddings_ready: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def open(cls, db: Session, profile_id: str, concurrency: int) -> "_ProfileRun":
+        snapshot = Session(bind=db.get_bind(), expire_on_commit=False)
+        try:
+            profile = await _to_thread_to_end(ProfileRepository.get_full, snapshot, profile_id)
+        except BaseException:
+            snapshot.close()
+            raise
+        return cls(db, snapshot, profile, concurrency)
+
+    async def in_thread(self, trace: PipelineTrace, stage: str, fn, *args):
+        """Network call in a worker thread, within the concurrency limit."""
+        async with self._limit:
+            with trace.stage(stage):
+                return await asyncio.to_thread(fn, *args)
 
-    # 13. Store resume sections
-    for sec in resume_to_sections_json(resume_data):
-        ResumeRepo.add_section(
-            db, resume_record.id,
-            section_type=sec["section_type"],
-            content=sec["content"],
-            confidence_flags=sec.get("confidence_flags"),
+    async def in_db(self, fn, *args):
+        """Session work in a worker thread, serialized with all other session work.
+
+        Cancelling the caller returns only once the work is done.
+        """
+        async with self._db_lock:
+            return await _to_thread_to_end(fn, *args)
+
+    def start_embedding_refresh(self, trace: PipelineTrace):
+        """Start the refresh once; later calls are no-ops."""
+        if self.embeddings_ready is not None:
+            return
+        self.embeddings_ready = asyncio.ensure_future(self._refresh_embeddings(trace))
+        # Failures surface through whoever awaits it; don't also warn if nobody does
+        self.embeddings_ready.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def close(self):
+        """Wait for the background refresh, then close the profile's session."""
+        if self.embeddings_ready is not None:
+            await asyncio.gather(self.embeddings_ready, return_exceptions=True)
+        await self.in_db(self._snapshot.close)
+
+    async def _refresh_embeddings(self, trace: PipelineTrace):
+        missing, texts = await self.in_db(self._missing_texts)
+        vectors = []
+        if missing:
+            vectors = await self.in_thread(trace, "embed_profile", generate_embeddings, texts)
+        with trace.stage("store_embeddings"):
+            await self.in_db(self._store_embeddings, missing, vectors)
+
+    def _missing_texts(self) -> tuple[list, list[str]]:
+        missing = _missing_bullets(self.profile)
+        return missing, [b.bullet_text for b in missing]
+
+    def _store_embeddings(self, missing: list, vectors: list):
+        _apply_embeddings(self._snapshot, self.profile, missing, vectors)
+
+    def next_version(self, job_title: str) -> int:
+        """Next version for a title, counting versions reserved in this run.
+
+        Queries; call through ``in_db``.
+        """
+        version = max(
+            ResumeRepo.get_next_version(self.db, self.profile_id, job_title),
+            self._reserved_versions.get(job_title, 0) + 1,
         )
+        self._reserved_versions[job_title] = version
+        return version
 
-    return {
-        "resume_id": resume_record.id,
-        "job_title": jd_data.role_title,
-        "version": version,
-        "pdf_path": pdf_path,
-        "docx_path": docx_path,
-        "resume_data": resume_data,
-        "jd_analysis": {
-            "role_title": jd_data.role_title,
-            "experience_level": jd_data.experience_level,
-            "must_have_skills": jd_data.must_have_skills,
-            "nice_to_have_skills": jd_data.nice_to_have_skills,
-            "keywords": jd_data.keywords,
-            "role_category": jd_data.role_category,
-        },
-        "skill_confidence": draft.skill_confidence,
-        "keyword_coverage": draft.keyword_coverage,
-    }
+    def select_content(self, jd_data, jd_embedding):
+        """Selection against the current profile. Call through ``in_db``."""
+        return select_relevant_content(self.db, self.profile, jd_data, jd_embedding)
+
+
+async def _cached_or_generate(in_db, db: Session, profile_id: str, jd_text: str,
+                              emit: ProgressFn, force: bool, generate) -> dict:
+    """The cached result for one JD, or ``await generate(input_hash)`` on a miss.
+
+    ``in_db`` runs the cache lookups; nothing is loaded before the lookup.
+    """
+    input_hash = await in_db(generation_key, db, profile_id, jd_text)
+    if force:
+        return await generate(input_hash)
+    async with _generation_locks.hold_async(input_hash):
+        cached = await in_db(_find_cached, db, profile_id, input_hash)
+        if cached is not None:
+            emit("cached", {"resume_id": cached["resume_id"]})
+            return cached
+        return await generate(input_hash)
+
+
+async def _draft_resume(run: _ProfileRun, jd_text: str, trace: PipelineTrace,
+                        emit: ProgressFn, deadline: Deadline):
+    """JD analysis through assembly. Writes nothing but profile embeddings.
+
+    Returns ``(jd_data, jd_embedding, draft, resume_data)``.
+    """
+    run.start_embedding_refresh(trace)
+    logger.info("Steps 1-2: Analyzing JD and embedding it...")
+    jd_data = await run.in_thread(trace, "analyze_jd", analyze_jd, jd_text, deadline)
+    emit("jd_analysis", _jd_summary(jd_data))
+    jd_embedding = await run.in_thread(trace, "embed_jd", generate_embedding, _jd_embedding_text(jd_data))
+
+    await run.embeddings_ready
+
+    logger.info("Step 3: Selecting relevant content...")
+    with trace.stage("select_content"):
+        draft = await run.in_db(run.select_content, jd_data, jd_embedding)
+    emit("selection", _selection_payload(draft))
+
+    logger.info("Step 4: Rewriting bullets...")
+    draft = await run.in_thread(trace, "rewrite_bullets", rewrite_draft_bullets, draft, deadline)
+    emit("rewritten", _rewrite_payload(draft))
+
+    # CPU-only stages: off the loop, but outside the network limit
+    logger.info("Steps 5-6: ATS optimization and assembly...")
+    with trace.stage("ats_optimize"):
+        draft = await asyncio.to_thread(optimize, draft)
+    emit("ats", {"keyword_coverage": draft.keyword_coverage})
+    with trace.stage("assemble"):
+        resume_data = await asyncio.to_thread(assemble_resume, draft)
+
+    return jd_data, jd_embedding, draft, resume_data
+
+
+async def _generate_pipeline(run: _ProfileRun, jd_text: str, trace: PipelineTrace,
+                             emit: ProgressFn, input_hash: str, deadline: Deadline) -> dict:
+    jd_data, jd_embedding, draft, resume_data = await _draft_resume(run, jd_text, trace, emit, deadline)
+
+    version = await run.in_db(run.next_version, jd_data.role_title)
+    with trace.stage("store_resume"):
+        return await run.in_db(
+            _store_generation, run.db, run.profile_id, jd_text, jd_data,
+            jd_embedding, draft, version, resume_data, input_hash, deadline,
+        )
+
+
+async def generate_resume_async(
+    db: Session,
+    profile_id: str,
+    jd_text: str,
+    on_progress: Optional[ProgressFn] = None,
+    force: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """Async variant of ``generate_resume`` with the same result and events.
+
+    Blocking calls (Gemini, the embedding provider) run in worker threads;
+    independent stages are awaited together. Stages are timed under the
+    same names as in ``generate_resume``.
+    """
+    deadline = deadline or Deadline()
+    trace, emit = _progress_trace("generate_resume_async", on_progress)
+
+    async def generate(input_hash: str) -> dict:
+        with trace.stage("load_profile"):
+            # Two slots: the profile refresh runs beside JD analysis
+            run = await _ProfileRun.open(db, profile_id, concurrency=2)
+        try:
+            return await _generate_pipeline(run, jd_text, trace, emit, input_hash, deadline)
+        finally:
+            await run.close()
+
+    with trace.run():
+        return await _cached_or_generate(
+            _to_thread_to_end, db, profile_id, jd_text, emit, force, generate,
+        )
+
+
+async def preview_resume_async(
+    db: Session,
+    profile_id: str,
+    jd_text: str,
+    on_progress: Optional[ProgressFn] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """Run the pipeline up to assembly and return the draft without keeping it.
+
+    Nothing is rendered, no JD analysis, ``Resume`` or ``ResumeSection``
+    row is written and no version is allocated; only missing profile
+    embeddings are stored, as they would be by any generation. If the
+    same inputs were already generated, the stored resume's data is
+    returned instead (``cached: True``).
+
+    Returns:
+        dict with keys: job_title, resume_data, jd_analysis,
+        skill_confidence, keyword_coverage, cached, degraded
+    """
+    deadline = deadline or Deadline()
+    trace, emit = _progress_trace("preview_resume", on_progress)
+    with trace.run():
+        input_hash = await _to_thread_to_end(generation_key, db, profile_id, jd_text)
+        cached = await _to_thread_to_end(_find_cached, db, profile_id, input_hash)
+        if cached is not None:
+            return {k: v for k, v in cached.items() if k not in ("resume_id", "version")}
+
+        with trace.stage("load_profile"):
+            run = await _ProfileRun.open(db, profile_id, concurrency=2)
+        try:
+            jd_data, _, draft, resume_data = await _draft_resume(run, jd_text, trace, emit, deadline)
+        finally:
+            await run.close()
+        return {
+            "job_title": jd_data.role_title,
+            "resume_data": resume_data,
+            "jd_analysis": _jd_summary(jd_data),
+            "skill_confidence": draft.skill_confidence,
+            "keyword_coverage": draft.keyword_coverage,
+            "cached": False,
+            "degraded": list(deadline.degraded),
+        }
+
+
+async def generate_resumes_batch_async(
+    db: Session,
+    profile_id: str,
+    jd_texts: list[str],
+    on_progress: Optional[ProgressFn] = None,
+    concurrency: Optional[int] = None,
+    force: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> list[dict]:
+    """Generate one resume per JD for the same profile.
+
+    The profile and its embedding matrix are shared across the batch;
+    JD analyses, embeddings and rewrites run with at most ``concurrency``
+    (default ``BATCH_CONCURRENCY``) in flight. A ``deadline`` covers the
+    whole batch. A failing JD does not stop the others. Returns one entry per JD, in
+    input order: ``{"index", "status": "succeeded", ...result}`` or
+    ``{"index", "status": "failed", "error"}``. Progress events carry the
+    JD's ``index``; each JD ends with ``jd_complete`` or ``jd_failed``.
+    JDs already generated for the unchanged profile come back cached, as
+    in ``generate_resume``, unless ``force`` is set.
+    """
+    deadline = deadline or Deadline()
+    batch_trace = PipelineTrace("generate_resume_batch")
+    with batch_trace.run():
+        with batch_trace.stage("load_profile"):
+            run = await _ProfileRun.open(db, profile_id, concurrency or settings.BATCH_CONCURRENCY)
+
+        async def one(index: int, jd_text: str) -> dict:
+            item_progress = None
+            if on_progress is not None:
+                def item_progress(event: str, payload: dict):
+                    on_progress(event, {"index": index, **payload})
+            trace, emit = _progress_trace("generate_resume_batch_item", item_progress)
+            try:
+                item_deadline = deadline.fork()
+                with trace.run():
+                    result = await _cached_or_generate(
+                        run.in_db, run.db, run.profile_id, jd_text, emit, force,
+                        lambda input_hash: _generate_pipeline(
+                            run, jd_text, trace, emit, input_hash, item_deadline,
+                        ),
+                    )
+            except Exception as e:
+                logger.warning("Batch item %d failed: %s", index, e)
+                emit("jd_failed", {"error": str(e)})
+                return {"index": index, "status": "failed", "error": str(e)}
+            emit("jd_complete", {"resume_id": result["resume_id"], "version": result["version"]})
+            return {"index": index, "status": "succeeded", **result}
+
+        try:
+            return list(await asyncio.gather(*(one(i, t) for i, t in enumerate(jd_texts))))
+        finally:
+            await run.close()
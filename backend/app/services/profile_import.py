@@ -0,0 +1,152 @@
+"""Profile Import — load a complete profile document in one transaction.
+
+Two document shapes are accepted:
+  - our own ``ProfileOut`` / ``ProfileImport`` JSON (ids are ignored)
+  - the JSON Resume schema (https://jsonresume.org/schema), recognised by
+    its ``basics`` / ``work`` keys and mapped onto our sections
+
+Every section is written with one bulk insert and the whole import is a
+single commit. Bullet embeddings are not computed here; the caller queues
+``refresh_profile_embeddings`` once for all imported bullets.
+"""
+
+import logging
+import re
+from typing import Optional
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.models.profile import ExperienceBullet, ProjectBullet
+from app.repositories import (
+    AchievementRepo, CertificationRepo, EducationRepo, ExperienceRepo,
+    ExternalProfileRepo, PersonalInfoRepo, ProjectRepo, SkillRepo, unit_of_work,
+)
+from app.schemas import ProfileImport
+
+logger = logging.getLogger(__name__)
+
+_JSON_RESUME_KEYS = ("basics", "work")
+_YEAR_RE = re.compile(r"\d{4}")
+
+
+def is_json_resume(doc: dict) -> bool:
+    return any(key in doc for key in _JSON_RESUME_KEYS)
+
+
+def _year(date: Optional[str]) -> Optional[int]:
+    """Year of a JSON Resume ISO date (``2019``, ``2019-06``, ``2019-06-01``)."""
+    match = _YEAR_RE.match(date or "")
+    return int(match.group()) if match else None
+
+
+def from_json_resume(doc: dict) -> dict:
+    """Map a JSON Resume document onto the ``ProfileImport`` shape."""
+    basics = doc.get("basics") or {}
+    profile: dict = {
+        "education": [
+            {
+                "institution": e.get("institution", ""),
+                "degree": e.get("studyType") or "",
+                "field_of_study": e.get("area"),
+                "start_year": _year(e.get("startDate")),
+                "end_year": _year(e.get("endDate")),
+                "grade": e.get("score"),
+            }
+            for e in doc.get("education") or []
+        ],
+        # A JSON Resume skill is a group ("Backend") of keywords ("Python", …)
+        "skills": [
+            {"skill_name": name, "skill_category": group.get("name")}
+            for group in doc.get("skills") or []
+            for name in (group.get("keywords") or [group.get("name")])
+            if name
+        ],
+        "experience": [
+            {
+                "company": w.get("name") or w.get("company") or "",
+                "role": w.get("position") or "",
+                "start_date": w.get("startDate"),
+                "end_date": w.get("endDate"),
+                "bullets": [{"bullet_text": h} for h in w.get("highlights") or []],
+            }
+            for w in doc.get("work") or []
+        ],
+        "projects": [
+            {
+                "project_title": p.get("name", ""),
+                "description": p.get("description"),
+                "tech_stack": ", ".join(p.get("keywords") or []) or None,
+                "bullets": [{"bullet_text": h} for h in p.get("highlights") or []],
+            }
+            for p in doc.get("projects") or []
+        ],
+        "certifications": [
+            {"name": c.get("name", ""), "issuing_organization": c.get("issuer"), "year": _year(c.get("date"))}
+            for c in doc.get("certificates") or []
+        ],
+        "achievements": [
+            {"title": a.get("title", ""), "description": a.get("summary"), "category": "award"}
+            for a in doc.get("awards") or []
+        ],
+        "external_profiles": [
+            {"platform": p.get("network", ""), "profile_url": p.get("url", "")}
+            for p in basics.get("profiles") or [] if p.get("url")
+        ],
+    }
+    if basics.get("name"):
+        profile["personal_info"] = {
+            "full_name": basics["name"],
+            "email": basics.get("email"),
+            "phone_number": basics.get("phone"),
+        }
+    return profile
+
+
+def parse_document(doc: dict) -> ProfileImport:
+    """Validate a document of either shape. Raises 422 on invalid input."""
+    try:
+        return ProfileImport.model_validate(from_json_resume(doc) if is_json_resume(doc) else doc)
+    except ValidationError as e:
+        from fastapi import HTTPException
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+
+def import_profile(db: Session, profile_id: str, data: ProfileImport) -> int:
+    """Add every section of ``data`` to the profile in one transaction.
+
+    Sections are appended to what the profile already has; personal info
+    is replaced. Returns the number of imported bullets.
+    """
+    with unit_of_work(db):
+        if data.personal_info is not None:
+            PersonalInfoRepo.upsert(db, profile_id, **data.personal_info.model_dump())
+        for repo, rows in (
+            (EducationRepo, data.education),
+            (SkillRepo, data.skills),
+            (CertificationRepo, data.certifications),
+            (AchievementRepo, data.achievements),
+            (ExternalProfileRepo, data.external_profiles),
+        ):
+            repo.create_many(db, profile_id, [row.model_dump() for row in rows])
+
+        # Bullets are inserted together with their parent via the relationship
+        ExperienceRepo.create_many(db, profile_id, [
+            {
+                **exp.model_dump(exclude={"bullets"}),
+                "bullets": [ExperienceBullet(bullet_text=b.bullet_text) for b in exp.bullets],
+            }
+            for exp in data.experience
+        ])
+        ProjectRepo.create_many(db, profile_id, [
+            {
+                **proj.model_dump(exclude={"bullets"}),
+                "bullets": [ProjectBullet(bullet_text=b.bullet_text) for b in proj.bullets],
+            }
+            for proj in data.projects
+        ])
+
+    bullets = sum(len(e.bullets) for e in data.experience) + sum(len(p.bullets) for p in data.projects)
+    logger.info("Imported profile %s: %d experience, %d projects, %d bullets",
+                profile_id, len(data.experience), len(data.projects), bullets)
+    return bullets
@@ -0,0 +1,157 @@
+"""Profile Matrix Cache — decoded bullet embeddings and their norms per profile.
+
+Decoding every bullet BLOB on every generation is wasted work when the same
+profile is matched against several JDs in a row. This module keeps an
+in-process, memory-bounded LRU of per-profile float32 matrices of bullet
+vectors, with each row's float64 norm. Rows are kept as stored rather
+than normalized, so scoring from the cache gives exactly the scores of
+``score_bullet``. Entries are stamped with the profile's
+``content_version``, which the repositories bump on every section write, so
+a stale entry is never served.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.profile import Profile
+from app.services.embedding_service import embedding_from_blob, stack_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileMatrix:
+    """All bullet vectors of one profile, stacked in selection order."""
+    version: int
+    bullet_ids: list[str]
+    matrix: np.ndarray  # (n, d) float32; zero rows where missing
+    has_embedding: np.ndarray  # (n,) bool
+    section_embeddings: dict[str, Optional[np.ndarray]] = field(default_factory=dict)
+    row_of: dict[str, int] = field(default_factory=dict)
+    norms: Optional[np.ndarray] = None  # (n,) float64 row norms
+
+    def __post_init__(self):
+        if not self.row_of:
+            self.row_of = {bid: i for i, bid in enumerate(self.bullet_ids)}
+        if self.norms is None:
+            self.norms = np.linalg.norm(self.matrix.astype(np.float64), axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        sections = sum(v.nbytes for v in self.section_embeddings.values() if v is not None)
+        return self.matrix.nbytes + self.has_embedding.nbytes + self.norms.nbytes + sections
+
+    def rows_for(self, bullet_ids: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Matrix rows, mask and norms for ``bullet_ids``.
+
+        Views when the order already matches. Ids not in the matrix get a
+        zero row and a False mask entry, so they are scored like bullets
+        without an embedding.
+        """
+        if bullet_ids == self.bullet_ids:
+            return self.matrix, self.has_embedding, self.norms
+        idx = np.array([self.row_of.get(bid, -1) for bid in bullet_ids], dtype=np.intp)
+        known = idx >= 0
+        if known.all():
+            return self.matrix[idx], self.has_embedding[idx], self.norms[idx]
+        matrix = np.zeros((len(idx), self.matrix.shape[1]), dtype=self.matrix.dtype)
+        matrix[known] = self.matrix[idx[known]]
+        mask = np.zeros(len(idx), dtype=bool)
+        mask[known] = self.has_embedding[idx[known]]
+        norms = np.zeros(len(idx))
+        norms[known] = self.norms[idx[known]]
+        return matrix, mask, norms
+
+
+def profile_bullets(profile: Profile) -> list:
+    """Every bullet of a profile, experience first — the canonical row order."""
+    return [b for exp in profile.experience for b in exp.bullets] + \
+           [b for proj in profile.projects for b in proj.bullets]
+
+
+def build_profile_matrix(profile: Profile, version: int) -> ProfileMatrix:
+    """Decode all bullet embeddings of a profile; norms are computed once here."""
+    bullets = profile_bullets(profile)
+    matrix, mask = stack_embeddings([embedding_from_blob(b.embedding) for b in bullets])
+    return ProfileMatrix(
+        version=version,
+        bullet_ids=[b.id for b in bullets],
+        matrix=matrix,
+        has_embedding=mask,
+        section_embeddings={
+            exp.id: embedding_from_blob(exp.experience_embedding)
+            for exp in profile.experience
+        },
+    )
+
+
+class ProfileMatrixCache:
+    """LRU of ProfileMatrix entries bounded by total array bytes."""
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, ProfileMatrix] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, profile_id: str, version: int) -> Optional[ProfileMatrix]:
+        with self._lock:
+            entry = self._entries.get(profile_id)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(profile_id)
+            return entry
+
+    def put(self, profile_id: str, entry: ProfileMatrix):
+        with self._lock:
+            self._drop(profile_id)
+            if entry.nbytes > self._max_bytes:
+                return
+            self._entries[profile_id] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def invalidate(self, profile_id: str):
+        with self._lock:
+            self._drop(profile_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, profile_id: str):
+        entry = self._entries.pop(profile_id, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def get_or_build(self, db: Session, profile: Profile) -> ProfileMatrix:
+        """Cached matrix for the profile's current version, building on a miss.
+
+        Call after the profile's embeddings are up to date — filling missing
+        embeddings does not bump the version.
+        """
+        version = db.query(Profile.content_version).filter(
+            Profile.id == profile.id
+        ).scalar() or 0
+        entry = self.get(profile.id, version)
+        # Rows that were missing at build time may have been filled since,
+        # and a bullet written without a version bump (or between reading
+        # the version and loading the profile) is not in the matrix yet
+        if (entry is None or not entry.has_embedding.all()
+                or entry.bullet_ids != [b.id for b in profile_bullets(profile)]):
+            entry = build_profile_matrix(profile, version)
+            self.put(profile.id, entry)
+        return entry
+
+
+profile_matrices = ProfileMatrixCache(settings.PROFILE_MATRIX_CACHE_MB * 1024 * 1024)
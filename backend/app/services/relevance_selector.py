@@ -10,6 +10,9 @@ Resume generation NEVER fails due to missing skills.
 
 import json
 import logging
+from typing import Optional
+
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -19,46 +22,74 @@ from app.models.profile import (
 )
 from app.domain.resume_draft import ResumeDraft, JDData, ScoredSection, ScoredBullet
 from app.services.embedding_service import (
-    generate_embedding, embedding_from_json, cosine_similarity,
+    generate_embeddings, cosine_similarity_matrix,
 )
-from app.services.scoring_engine import score_bullet, score_section
+from app.services.keyword_matcher import KeywordMatcher, contained_in_any
+from app.services.profile_matrix_cache import profile_matrices
+from app.services.scoring_engine import bullet_features, score_bullets, score_section
 
 logger = logging.getLogger(__name__)
 
 
+def _skill_overlap(skills: list[str], others: list[str]) -> set[int]:
+    """Indices of ``skills`` that contain, or are contained in, any of ``others``.
+
+    Case-insensitive; each direction is one multi-pattern pass.
+    """
+    if not skills or not others:
+        return set()
+    overlap = contained_in_any(skills, others)
+    other_matcher = KeywordMatcher(others)
+    for i, skill in enumerate(skills):
+        if i not in overlap and other_matcher.find(skill):
+            overlap.add(i)
+    return overlap
+
+
 def _check_skill_confidence(
-    skill: str,
+    skills: list[str],
     profile_skills: list[str],
     all_bullet_texts: list[str],
-    jd_embedding: list[float],
-) -> str:
-    """Determine confidence level for a must-have skill."""
-    skill_lower = skill.lower()
-
-    # 1. Direct match
-    for ps in profile_skills:
-        if skill_lower == ps.lower():
-            return "strong"
-        if skill_lower in ps.lower() or ps.lower() in skill_lower:
-            return "strong"
-
-    # 2. Semantic inference from bullet texts
-    for bullet in all_bullet_texts:
-        if skill_lower in bullet.lower():
-            return "inferred"
-
-    # 3. Semantic similarity check
-    try:
-        skill_emb = generate_embedding(skill)
-        for bullet in all_bullet_texts[:20]:  # limit for performance
-            bullet_emb = generate_embedding(bullet)
-            sim = cosine_similarity(skill_emb, bullet_emb)
-            if sim > 0.6:
-                return "inferred"
-    except Exception:
-        pass
-
-    return "weak"
+    bullet_matrix: Optional[np.ndarray],
+) -> dict[str, str]:
+    """Determine confidence levels for all must-have skills at once.
+
+    ``bullet_matrix`` holds the stored vectors of the profile's bullets,
+    one row per embedded bullet.
+    """
+    confidence: dict[str, str] = {}
+    direct = _skill_overlap(skills, profile_skills)
+    in_bullets = contained_in_any(skills, all_bullet_texts)
+    unresolved = []
+
+    for i, skill in enumerate(skills):
+        # 1. Direct match
+        if i in direct:
+            confidence[skill] = "strong"
+        # 2. Semantic inference from bullet texts
+        elif i in in_bullets:
+            confidence[skill] = "inferred"
+        else:
+            unresolved.append(skill)
+
+    if not unresolved:
+        return confidence
+
+    # 3. Semantic similarity check — one batched call embeds the remaining
+    # skills; bullets reuse their stored vectors, so the whole
+    # skill × bullet comparison is a single matrix product.
+    best = np.zeros(len(unresolved))
+    if bullet_matrix is not None and len(bullet_matrix):
+        try:
+            skill_matrix = generate_embeddings(unresolved)
+            best = cosine_similarity_matrix(skill_matrix, bullet_matrix).max(axis=1)
+        except Exception as e:
+            logger.warning("Skill similarity check failed: %s", e)
+
+    for skill, sim in zip(unresolved, best):
+        confidence[skill] = "inferred" if sim > 0.6 else "weak"
+
+    return confidence
 
 
 def select_relevant_content(
@@ -75,44 +106,61 @@ def select_relevant_content(
 
     # ── Gather all profile data ───────────────────────────────
     profile_skills = [s.skill_name for s in profile.skills]
-    all_bullet_texts = []
+    experiences = list(profile.experience)
+    projects = list(profile.projects)
+
+    # (bullet, section_type, end_date) for every bullet, experience first
+    bullet_rows = [
+        (b, "experience", exp.end_date) for exp in experiences for b in exp.bullets
+    ] + [
+        (b, "project", None) for proj in projects for b in proj.bullets
+    ]
+    all_bullet_texts = [b.bullet_text for b, _, _ in bullet_rows]
+
+    # Decoded bullet vectors and their norms (cached per profile version)
+    vectors = profile_matrices.get_or_build(db, profile)
+    matrix, has_embedding, norms = vectors.rows_for([b.id for b, _, _ in bullet_rows])
+
+    # ── Score all bullets in one vectorized pass ──────────────
+    keyword_hits, importance = bullet_features(all_bullet_texts, jd_data)
+    scores = score_bullets(
+        matrix, jd_embedding,
+        [t for _, t, _ in bullet_rows], [d for _, _, d in bullet_rows],
+        keyword_hits, importance, has_embedding=has_embedding, row_norms=norms,
+    )
+    bullet_scores = {b.id: float(sc) for (b, _, _), sc in zip(bullet_rows, scores)}
+
+    def _top_bullets(bullets) -> list[ScoredBullet]:
+        scored = [
+            ScoredBullet(
+                id=b.id, text=b.bullet_text,
+                score=bullet_scores[b.id], confidence="strong",
+            )
+            for b in bullets
+        ]
+        # Sort bullets by score, keep top K
+        scored.sort(key=lambda b: b.score, reverse=True)
+        return scored[:settings.MAX_BULLETS_PER_SECTION]
 
     # ── Score Experience Sections ─────────────────────────────
     scored_exp_sections: list[ScoredSection] = []
 
-    for exp in profile.experience:
+    for exp in experiences:
         section_text = f"{exp.role} at {exp.company}"
-        section_emb = embedding_from_json(exp.experience_embedding)
+        section_emb = vectors.section_embeddings.get(exp.id)
 
         sec_score = score_section(
             section_text, section_emb, jd_embedding,
             jd_data, "experience", exp.end_date,
         )
 
-        scored_bullets: list[ScoredBullet] = []
-        for bullet in exp.bullets:
-            all_bullet_texts.append(bullet.bullet_text)
-            b_emb = embedding_from_json(bullet.embedding)
-            b_score = score_bullet(
-                bullet.bullet_text, b_emb, jd_embedding,
-                jd_data, "experience", exp.end_date,
-            )
-            scored_bullets.append(ScoredBullet(
-                id=bullet.id, text=bullet.bullet_text,
-                score=b_score, confidence="strong",
-            ))
-
-        # Sort bullets by score, keep top K
-        scored_bullets.sort(key=lambda b: b.score, reverse=True)
-        scored_bullets = scored_bullets[:settings.MAX_BULLETS_PER_SECTION]
-
         scored_exp_sections.append(ScoredSection(
             id=exp.id,
             title=f"{exp.role}",
             subtitle=f"{exp.company} | {exp.start_date or ''} – {exp.end_date or 'Present'}",
             section_type="experience",
             score=sec_score,
-            bullets=scored_bullets,
+            bullets=_top_bullets(exp.bullets),
         ))
 
     # Sort and keep top N experience sections
@@ -122,36 +170,20 @@ def select_relevant_content(
     # ── Score Project Sections ────────────────────────────────
     scored_proj_sections: list[ScoredSection] = []
 
-    for proj in profile.projects:
+    for proj in projects:
         section_text = f"{proj.project_title}: {proj.description or ''}"
         sec_score = score_section(
             section_text, None, jd_embedding,
             jd_data, "project", None,
         )
 
-        scored_bullets: list[ScoredBullet] = []
-        for bullet in proj.bullets:
-            all_bullet_texts.append(bullet.bullet_text)
-            b_emb = embedding_from_json(bullet.embedding)
-            b_score = score_bullet(
-                bullet.bullet_text, b_emb, jd_embedding,
-                jd_data, "project", None,
-            )
-            scored_bullets.append(ScoredBullet(
-                id=bullet.id, text=bullet.bullet_text,
-                score=b_score, confidence="strong",
-            ))
-
-        scored_bullets.sort(key=lambda b: b.score, reverse=True)
-        scored_bullets = scored_bullets[:settings.MAX_BULLETS_PER_SECTION]
-
         scored_proj_sections.append(ScoredSection(
             id=proj.id,
             title=proj.project_title,
             subtitle=proj.tech_stack or "",
             section_type="project",
             score=sec_score,
-            bullets=scored_bullets,
+            bullets=_top_bullets(proj.bullets),
         ))
 
     scored_proj_sections.sort(key=lambda s: s.score, reverse=True)
@@ -159,18 +191,17 @@ def select_relevant_content(
 
     # ── Select Skills (dedup + limit) ─────────────────────────
     all_jd_skills = jd_data.must_have_skills + jd_data.nice_to_have_skills
+    jd_matching = _skill_overlap(profile_skills, all_jd_skills)
     selected = []
     seen = set()
     # Prioritize JD-matching skills
-    for skill in profile_skills:
+    for i, skill in enumerate(profile_skills):
         skill_lower = skill.lower()
         if skill_lower in seen:
             continue
-        for jd_skill in all_jd_skills:
-            if jd_skill.lower() in skill_lower or skill_lower in jd_skill.lower():
-                selected.append(skill)
-                seen.add(skill_lower)
-                break
+        if i in jd_matching:
+            selected.append(skill)
+            seen.add(skill_lower)
     # Fill remaining with other profile skills
     for skill in profile_skills:
         if skill.lower() not in seen:
@@ -179,11 +210,10 @@ def select_relevant_content(
     draft.selected_skills = selected[:settings.MAX_SKILLS]
 
     # ── Must-Have Skill Confidence ────────────────────────────
-    for skill in jd_data.must_have_skills:
-        confidence = _check_skill_confidence(
-            skill, profile_skills, all_bullet_texts, jd_embedding,
-        )
-        draft.skill_confidence[skill] = confidence
+    draft.skill_confidence = _check_skill_confidence(
+        jd_data.must_have_skills, profile_skills,
+        all_bullet_texts, matrix[has_embedding],
+    )
 
     # ── Education, Certs, Achievements, etc. ──────────────────
     draft.education = [
@@ -105,4 +105,56 @@ def resume_to_sections_json(resume: dict) -> list[dict]:
             "confidence_flags": None,
         })
 
+    if resume.get("external_profiles"):
+        sections.append({
+            "section_type": "external_profiles",
+            "content": json.dumps(resume["external_profiles"]),
+            "confidence_flags": None,
+        })
+
+    if resume.get("keyword_coverage"):
+        sections.append({
+            "section_type": "keyword_coverage",
+            "content": json.dumps(resume["keyword_coverage"]),
+            "confidence_flags": None,
+        })
+
     return sections
+
+
+def sections_to_resume(job_title: str, sections: list[dict]) -> dict:
+    """Rebuild the assembled resume dict from stored sections.
+
+    Inverse of ``resume_to_sections_json``: sections that were not stored
+    come back empty, exactly as ``assemble_resume`` would have produced them.
+    """
+    resume = {
+        "job_title": job_title,
+        "personal_info": {},
+        "external_profiles": [],
+        "education": [],
+        "experience": [],
+        "projects": [],
+        "skills": [],
+        "certifications": [],
+        "achievements": [],
+        "skill_confidence": {},
+        "keyword_coverage": {},
+    }
+    for section in sections:
+        key = section["section_type"]
+        if key not in resume:
+            continue
+        resume[key] = json.loads(section["content"])
+        if key == "skills" and section.get("confidence_flags"):
+            resume["skill_confidence"] = json.loads(section["confidence_flags"])
+    return resume
+
+
+def resume_from_record(resume) -> dict:
+    """``sections_to_resume`` for a stored ``Resume`` row."""
+    return sections_to_resume(resume.job_title, [
+        {"section_type": s.section_type, "content": s.content,
+         "confidence_flags": s.confidence_flags}
+        for s in resume.sections
+    ])
@@ -10,9 +10,13 @@ Formula (conceptual):
 
 import re
 from datetime import datetime
+from typing import Optional, Sequence
+
+import numpy as np
 
 from app.domain.resume_draft import JDData
 from app.services.embedding_service import cosine_similarity
+from app.services.keyword_matcher import JDHits, jd_matcher
 
 
 # ── Weight configuration ──────────────────────────────────────
@@ -31,12 +35,20 @@ SKILL_IMPORTANCE = {
 }
 
 KEYWORD_BONUS = 0.05  # per matching keyword
+KEYWORD_BONUS_CAP = 0.3
+
+DEFAULT_SEMANTIC = 0.3  # used when either side has no embedding
 
 
 # ── Scoring functions ─────────────────────────────────────────
 
 
-def compute_recency_weight(end_date: str | None) -> float:
+def _has_vector(v) -> bool:
+    """True for a non-empty list or array (arrays have no truth value)."""
+    return v is not None and len(v) > 0
+
+
+def compute_recency_weight(end_date: str | None, current_year: int | None = None) -> float:
     """Compute a recency weight (1.0 for current/recent, decaying for older).
 
     Expects end_date in 'YYYY-MM' format or 'Present'.
@@ -45,7 +57,7 @@ def compute_recency_weight(end_date: str | None) -> float:
         return 1.0
     try:
         year = int(end_date.split("-")[0])
-        current_year = datetime.now().year
+        current_year = current_year or datetime.now().year
         years_ago = max(0, current_year - year)
         # Decay: 1.0 for current, 0.6 minimum for very old
         return max(0.6, 1.0 - (years_ago * 0.05))
@@ -53,31 +65,40 @@ def compute_recency_weight(end_date: str | None) -> float:
         return 0.8
 
 
-def compute_keyword_bonus(text: str, jd_data: JDData) -> float:
-    """Count how many JD keywords appear in the text."""
-    text_lower = text.lower()
-    bonus = 0.0
-    for kw in jd_data.keywords:
-        if kw.lower() in text_lower:
-            bonus += KEYWORD_BONUS
-    return min(bonus, 0.3)  # cap at 0.3
+def _keyword_bonus_table() -> np.ndarray:
+    """Bonus for 0..k keyword hits: KEYWORD_BONUS per hit, capped."""
+    table, bonus = [0.0], 0.0
+    while bonus < KEYWORD_BONUS_CAP:
+        bonus += KEYWORD_BONUS
+        table.append(min(bonus, KEYWORD_BONUS_CAP))
+    return np.array(table)
 
 
-def compute_skill_importance(bullet_text: str, jd_data: JDData) -> float:
-    """Check if the bullet mentions must-have or nice-to-have skills."""
-    text_lower = bullet_text.lower()
+_KEYWORD_BONUS_TABLE = _keyword_bonus_table()
+
 
-    for skill in jd_data.must_have_skills:
-        if skill.lower() in text_lower:
-            return SKILL_IMPORTANCE["must_have"]
+def _bonus_for_hits(count: int) -> float:
+    return float(_KEYWORD_BONUS_TABLE[min(count, len(_KEYWORD_BONUS_TABLE) - 1)])
 
-    for skill in jd_data.nice_to_have_skills:
-        if skill.lower() in text_lower:
-            return SKILL_IMPORTANCE["nice_to_have"]
 
+def _importance_for_hits(hits: JDHits) -> float:
+    if hits.must_have:
+        return SKILL_IMPORTANCE["must_have"]
+    if hits.nice_to_have:
+        return SKILL_IMPORTANCE["nice_to_have"]
     return 1.0  # neutral
 
 
+def compute_keyword_bonus(text: str, jd_data: JDData) -> float:
+    """Count how many JD keywords appear in the text."""
+    return _bonus_for_hits(jd_matcher(jd_data).scan(text).keyword_count)
+
+
+def compute_skill_importance(bullet_text: str, jd_data: JDData) -> float:
+    """Check if the bullet mentions must-have or nice-to-have skills."""
+    return _importance_for_hits(jd_matcher(jd_data).scan(bullet_text))
+
+
 def score_bullet(
     bullet_text: str,
     bullet_embedding: list[float] | None,
@@ -88,16 +109,17 @@ def score_bullet(
 ) -> float:
     """Compute composite score for a single bullet point."""
     # Semantic similarity
-    if bullet_embedding and jd_embedding:
+    if _has_vector(bullet_embedding) and _has_vector(jd_embedding):
         semantic = cosine_similarity(bullet_embedding, jd_embedding)
     else:
-        semantic = 0.3  # default if no embeddings
+        semantic = DEFAULT_SEMANTIC
 
-    # Weights
-    importance = compute_skill_importance(bullet_text, jd_data)
+    # Weights — one scan of the text yields both skill and keyword hits
+    hits = jd_matcher(jd_data).scan(bullet_text)
+    importance = _importance_for_hits(hits)
     priority = SECTION_PRIORITY.get(section_type, 0.7)
     recency = compute_recency_weight(end_date)
-    kw_bonus = compute_keyword_bonus(bullet_text, jd_data)
+    kw_bonus = _bonus_for_hits(hits.keyword_count)
 
     final = semantic * importance * priority * recency + kw_bonus
     return round(final, 4)
@@ -112,13 +134,76 @@ def score_section(
     end_date: str | None = None,
 ) -> float:
     """Compute a section-level score (used for ranking sections)."""
-    if section_embedding and jd_embedding:
+    if _has_vector(section_embedding) and _has_vector(jd_embedding):
         semantic = cosine_similarity(section_embedding, jd_embedding)
     else:
-        semantic = 0.3
+        semantic = DEFAULT_SEMANTIC
 
     priority = SECTION_PRIORITY.get(section_type, 0.7)
     recency = compute_recency_weight(end_date)
     kw_bonus = compute_keyword_bonus(section_text, jd_data)
 
     return round(semantic * priority * recency + kw_bonus, 4)
+
+
+# ── Batch scoring ─────────────────────────────────────────────
+
+
+def bullet_features(texts: Sequence[str], jd_data: JDData) -> tuple[np.ndarray, np.ndarray]:
+    """Per-bullet JD keyword hit counts and skill-importance weights."""
+    counts, must_have, nice_to_have = jd_matcher(jd_data).scan_many(list(texts))
+    must, nice = SKILL_IMPORTANCE["must_have"], SKILL_IMPORTANCE["nice_to_have"]
+    importance = [must if m else nice if n else 1.0 for m, n in zip(must_have, nice_to_have)]
+    return np.array(counts, dtype=np.int64), np.array(importance, dtype=np.float64)
+
+
+def score_bullets(
+    embeddings: np.ndarray,
+    jd_embedding,
+    section_types: Sequence[str],
+    end_dates: Sequence[Optional[str]],
+    keyword_hits: np.ndarray,
+    importance: np.ndarray,
+    has_embedding: Optional[np.ndarray] = None,
+    row_norms: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Score many bullets at once; matches score_bullet element-wise.
+
+    ``embeddings`` is an (n, d) matrix whose rows are bullet vectors; rows
+    where ``has_embedding`` is False get the default semantic score.
+    ``row_norms`` are the rows' float64 norms, if already known.
+    """
+    n = len(section_types)
+    if n == 0:
+        return np.zeros(0)
+
+    jd = np.asarray(jd_embedding, dtype=np.float64)
+    if has_embedding is None:
+        has_embedding = np.ones(n, dtype=bool)
+
+    semantic = np.full(n, DEFAULT_SEMANTIC)
+    if jd.size and has_embedding.any():
+        matrix = np.asarray(embeddings, dtype=np.float64)
+        dots = matrix @ jd
+        if row_norms is None:
+            row_norms = np.linalg.norm(matrix, axis=1)
+        denom = row_norms * np.linalg.norm(jd)
+        cosine = np.divide(dots, denom, out=np.zeros(n), where=denom != 0)
+        semantic = np.where(has_embedding, cosine, DEFAULT_SEMANTIC)
+
+    current_year = datetime.now().year
+    recency_of: dict[Optional[str], float] = {}
+    recency = np.empty(n)
+    priority = np.empty(n)
+    for i, (section_type, end_date) in enumerate(zip(section_types, end_dates)):
+        if end_date not in recency_of:
+            recency_of[end_date] = compute_recency_weight(end_date, current_year)
+        recency[i] = recency_of[end_date]
+        priority[i] = SECTION_PRIORITY.get(section_type, 0.7)
+
+    table = _KEYWORD_BONUS_TABLE
+    kw_bonus = table[np.minimum(np.asarray(keyword_hits), len(table) - 1)]
+
+    final = semantic * importance * priority * recency + kw_bonus
+    # Python's round (not np.round) so ties resolve exactly as in score_bullet
+    return np.array([round(v, 4) for v in final.tolist()])
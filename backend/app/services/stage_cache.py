@@ -0,0 +1,51 @@
+"""Stage Cache — reuse outputs of expensive pipeline stages across runs.
+
+Iterative editing regenerates the same JD over and over with one bullet
+changed. Each cached stage records its output under a hash of exactly the
+inputs it depends on, so a rerun only pays for what the edit touched:
+  - "jd_analysis": Gemini JD extraction, keyed by model + normalized JD
+  - "rewrite":     Gemini rewrite of one bullet, keyed by model, job title,
+                   prompt keywords and the normalized bullet text
+
+Entries live in the ``stage_cache`` table with an in-process LRU in front,
+like the embedding cache. Rule-based fallbacks are cheap and not cached.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from app.config import settings
+from app.database import CacheSessionLocal
+from app.models.stage_cache import StageCacheEntry
+from app.services.two_level_cache import TwoLevelCache
+
+
+def stage_key(stage: str, *inputs: Any) -> str:
+    """Content address for one stage output. ``inputs`` must be JSON-serializable."""
+    payload = json.dumps([stage, *inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageCache(TwoLevelCache):
+    """JSON values, kept as JSON text in memory and in the table."""
+
+    name = "Stage cache"
+    model = StageCacheEntry
+    value_column = "value"
+
+    def __init__(self, session_factory=CacheSessionLocal, max_entries: int = settings.STAGE_CACHE_SIZE):
+        super().__init__(session_factory, max_entries)
+
+    def _encode(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def _decode(self, memo: str) -> Any:
+        return json.loads(memo)
+
+    def put_many(self, stage: str, entries: dict[str, Any]):
+        """Store fresh stage outputs in both cache layers."""
+        self._put_many(entries, stage=stage)
+
+
+stage_cache = StageCache()
@@ -0,0 +1,148 @@
+"""Two-level cache — an in-process LRU in front of a key/value table.
+
+Shared by the embedding cache and the stage cache. Subclasses name the ORM
+model and value column, and convert between three forms of a value:
+  - the caller's value (what ``get_many`` returns and ``put_many`` takes)
+  - the in-memory form held by the LRU
+  - the stored form written to the table
+
+The table is reached through ``CacheSessionLocal``, a small pool separate
+from request sessions. Database errors degrade to a miss (lookup) or a
+memory-only entry (write); anything else propagates.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeout
+
+from app.database import CacheSessionLocal
+
+logger = logging.getLogger(__name__)
+
+_QUERY_CHUNK = 500  # stay well below SQLite's bound-parameter limit
+
+
+class TwoLevelCache:
+    """In-process LRU backed by a table with a string ``key`` primary key."""
+
+    name = "cache"  # used in log messages
+    model = None  # ORM class of the backing table
+    value_column = ""  # column holding the stored form
+
+    def __init__(self, session_factory=CacheSessionLocal, max_entries: int = 1000):
+        self._session_factory = session_factory
+        self._max_entries = max_entries
+        self._lru: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ── Conversions (override) ────────────────────────────────
+
+    def _encode(self, value):
+        """Caller's value -> in-memory form."""
+        return value
+
+    def _decode(self, memo):
+        """In-memory form -> caller's value."""
+        return memo
+
+    def _to_stored(self, memo):
+        """In-memory form -> column value."""
+        return memo
+
+    def _from_stored(self, raw):
+        """Column value -> in-memory form."""
+        return raw
+
+    # ── Cache operations ──────────────────────────────────────
+
+    def bind(self, session_factory):
+        """Point the persistent layer at a different session factory."""
+        self._session_factory = session_factory
+        self.clear_memory()
+
+    def clear_memory(self):
+        with self._lock:
+            self._lru.clear()
+
+    def _remember(self, key: str, memo):
+        with self._lock:
+            self._lru[key] = memo
+            self._lru.move_to_end(key)
+            while len(self._lru) > self._max_entries:
+                self._lru.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Return cached values for whichever keys are present."""
+        found: dict[str, Any] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                memo = self._lru.get(key)
+                if memo is None:
+                    missing.append(key)
+                else:
+                    self._lru.move_to_end(key)
+                    found[key] = self._decode(memo)
+
+        if not missing:
+            return found
+
+        key_col = self.model.key
+        value_col = getattr(self.model, self.value_column)
+        try:
+            db = self._session_factory()
+            try:
+                for i in range(0, len(missing), _QUERY_CHUNK):
+                    chunk = missing[i:i + _QUERY_CHUNK]
+                    for key, raw in db.query(key_col, value_col).filter(key_col.in_(chunk)):
+                        memo = self._from_stored(raw)
+                        self._remember(key, memo)
+                        found[key] = self._decode(memo)
+            finally:
+                db.close()
+        except PoolTimeout:
+            logger.warning("%s lookup timed out waiting for a connection; "
+                           "treating %d keys as misses", self.name, len(missing))
+        except SQLAlchemyError as e:
+            logger.warning("%s lookup failed: %s", self.name, e)
+
+        return found
+
+    def get(self, key: str) -> Any:
+        """Cached value for ``key``, or None."""
+        return self.get_many([key]).get(key)
+
+    def _put_many(self, entries: dict[str, Any], **fields):
+        """Store fresh values in both layers; ``fields`` fill the other columns."""
+        if not entries:
+            return
+        encoded = {key: self._encode(value) for key, value in entries.items()}
+        for key, memo in encoded.items():
+            self._remember(key, memo)
+
+        key_col = self.model.key
+        try:
+            db = self._session_factory()
+            try:
+                keys = list(encoded)
+                existing = set()
+                for i in range(0, len(keys), _QUERY_CHUNK):
+                    chunk = keys[i:i + _QUERY_CHUNK]
+                    existing.update(k for (k,) in db.query(key_col).filter(key_col.in_(chunk)))
+                db.add_all([
+                    self.model(key=key, **{self.value_column: self._to_stored(memo)}, **fields)
+                    for key, memo in encoded.items() if key not in existing
+                ])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except SQLAlchemyError as e:
+            # A concurrent writer may have inserted the same key — the
+            # in-process layer already has the value, so this is harmless.
+            logger.warning("%s write failed: %s", self.name, e)
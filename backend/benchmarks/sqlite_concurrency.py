@@ -0,0 +1,147 @@
+"""Concurrent generation throughput, one SQLite engine knob at a time.
+
+Runs ``generate_resume`` from several threads against a fresh SQLite file
+and reports throughput, latency and how many runs failed (pool timeouts
+or "database is locked"). Gemini is off and embeddings are local, so the
+database is the only shared resource. Each configuration changes one knob
+from the baseline engine (driver defaults, SQLAlchemy's default pool):
+  - pool: a larger request pool (10 + 20 overflow)
+  - production: the production profile's pragmas (WAL, synchronous, mmap,
+    page cache, busy timeout)
+
+    cd backend
+    python -m benchmarks.sqlite_concurrency --workers 8 --runs 64
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+os.environ["GEMINI_API_KEY"] = ""
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, create_db_engine  # noqa: E402
+from app.models import (  # noqa: E402
+    User, Profile, PersonalInfo, Skill, Experience, ExperienceBullet, Project, ProjectBullet,
+)
+from app.services.embedding_cache import embedding_cache  # noqa: E402
+from app.services.orchestrator import _ensure_embeddings, generate_resume  # noqa: E402
+from app.services.stage_cache import stage_cache  # noqa: E402
+
+JDS = [
+    "Senior Python Backend Engineer. Must have Python, FastAPI, PostgreSQL and Docker.",
+    "Data Engineer. Must have Python, Spark, Airflow and SQL. Nice to have Kafka.",
+    "Platform Engineer. Must have Kubernetes, Terraform, Go and AWS.",
+    "Machine Learning Engineer. Must have Python, PyTorch, MLOps and Docker.",
+]
+
+
+def _seed(db) -> str:
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    profile = Profile(user_id=user.id)
+    db.add(profile)
+    db.flush()
+    db.add(PersonalInfo(profile_id=profile.id, full_name="Bench Mark", email="bench@example.com"))
+    for name in ("Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Go", "Spark", "AWS"):
+        db.add(Skill(profile_id=profile.id, skill_name=name))
+    for i in range(4):
+        exp = Experience(profile_id=profile.id, company=f"Company {i}", role="Software Engineer")
+        exp.bullets = [
+            ExperienceBullet(bullet_text=f"Built service {i}.{j} with Python and PostgreSQL serving 10k rps")
+            for j in range(5)
+        ]
+        db.add(exp)
+    for i in range(3):
+        proj = Project(profile_id=profile.id, project_title=f"Project {i}", tech_stack="Go, Docker")
+        proj.bullets = [ProjectBullet(bullet_text=f"Deployed project {i}.{j} on Kubernetes") for j in range(3)]
+        db.add(proj)
+    db.commit()
+    _ensure_embeddings(db, profile)  # time generation, not the first embedding pass
+    return profile.id
+
+
+# config -> (SQLITE_PROFILE, request pool arguments)
+CONFIGS = {
+    "baseline": ("basic", {}),
+    "pool": ("basic", {"pool_size": 10, "max_overflow": 20}),
+    "production": ("production", {}),
+}
+
+
+def run_config(config: str, workers: int, runs: int) -> dict:
+    sqlite_profile, pool = CONFIGS[config]
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        engine = create_db_engine(url, sqlite_profile, **pool)
+        cache_engine = create_db_engine(url, sqlite_profile, pool_size=settings.CACHE_DB_POOL_SIZE,
+                                        max_overflow=0, pool_timeout=settings.CACHE_DB_POOL_TIMEOUT_S)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        CacheSession = sessionmaker(autocommit=False, autoflush=False, bind=cache_engine)
+        embedding_cache.bind(CacheSession)
+        stage_cache.bind(CacheSession)
+
+        with Session() as db:
+            profile_id = _seed(db)
+
+        def one(i: int):
+            start = time.perf_counter()
+            db = Session()
+            try:
+                generate_resume(db, profile_id, JDS[i % len(JDS)], force=True)
+                return time.perf_counter() - start, None
+            except Exception as e:
+                return time.perf_counter() - start, type(e).__name__ + ": " + str(e).splitlines()[0]
+            finally:
+                db.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(one, range(runs)))
+        wall = time.perf_counter() - start
+        engine.dispose()
+        cache_engine.dispose()
+
+    latencies = sorted(s for s, err in results if err is None)
+    errors = [err for _, err in results if err is not None]
+    return {
+        "config": config,
+        "ok": len(latencies),
+        "failed": len(errors),
+        "runs_per_s": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else float("nan"),
+        "first_error": errors[0] if errors else "",
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=64)
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    args = parser.parse_args(argv)
+    logging.getLogger("app").setLevel(logging.ERROR)  # slow-run and cache-race warnings
+
+    print(f"{args.runs} generations, {args.workers} threads")
+    print(f"{'config':<12}{'ok':>5}{'failed':>8}{'runs/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for config in args.configs:
+        r = run_config(config, args.workers, args.runs)
+        print(f"{r['config']:<12}{r['ok']:>5}{r['failed']:>8}{r['runs_per_s']:>9.1f}"
+              f"{r['p50_ms']:>9.0f}{r['p95_ms']:>9.0f}")
+        if r["first_error"]:
+            print(f"  first error: {r['first_error']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,24 @@
 """Test fixtures — test database, synthetic profiles, and sample JDs."""
 
 import json
+import os
 import pytest
+
+# Offline embeddings unless a run explicitly opts into a hosted provider
+os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.config import settings
 from app.database import Base, get_db
 from app.main import app
 from app.models import *  # noqa: F401, F403 — ensure all models are registered
+from app.services.circuit_breaker import circuit_breakers
+from app.services.embedding_cache import embedding_cache
+from app.services.job_queue import job_queue
+from app.services.profile_matrix_cache import profile_matrices
+from app.services.stage_cache import stage_cache
 
 # ── Test database ─────────────────────────────────────────────
 
@@ -21,10 +32,16 @@ TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 def db():
     """Create fresh tables for each test, yield a session, then drop."""
     Base.metadata.create_all(bind=engine)
+    embedding_cache.bind(TestSession)
+    stage_cache.bind(TestSession)
+    job_queue.bind(TestSession)
+    profile_matrices.clear()
+    circuit_breakers.reset()
     session = TestSession()
     try:
         yield session
     finally:
+        job_queue.shutdown()
         session.close()
         Base.metadata.drop_all(bind=engine)
 
@@ -148,6 +165,17 @@ def weak_fit_profile_data():
     }
 
 
+# One-line JD for pipeline tests; fully covered by strong_fit_profile_data
+BACKEND_JD = "Senior Python Backend Engineer. Must have Python, FastAPI, PostgreSQL and Docker."
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    """Rule-based LLM stages and a throwaway output directory."""
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "")
+
+
 @pytest.fixture
 def sample_jd_text():
     """Sample job description for a Python Backend Engineer role."""
@@ -248,3 +276,46 @@ def create_full_profile(client, user_data, profile_data):
         client.post(f"/api/profiles/{profile_id}/external-profiles", json=ep)
 
     return user_id, profile_id
+
+
+def seed_profile(db, profile_data, username="seeded", email="seeded@example.com"):
+    """Helper to insert a user + profile with all sections directly via the ORM."""
+    from app.models import (
+        User, Profile, PersonalInfo, Education, Skill, Experience,
+        ExperienceBullet, Project, ProjectBullet, Certification,
+        Achievement, ExternalProfile,
+    )
+
+    user = User(username=username, email=email, password_hash="x")
+    db.add(user)
+    db.flush()
+    profile = Profile(user_id=user.id)
+    db.add(profile)
+    db.flush()
+
+    if "personal_info" in profile_data:
+        db.add(PersonalInfo(profile_id=profile.id, **profile_data["personal_info"]))
+    for edu in profile_data.get("education", []):
+        db.add(Education(profile_id=profile.id, **edu))
+    for skill in profile_data.get("skills", []):
+        db.add(Skill(profile_id=profile.id, **skill))
+    for exp in profile_data.get("experience", []):
+        fields = {k: v for k, v in exp.items() if k != "bullets"}
+        row = Experience(profile_id=profile.id, **fields)
+        row.bullets = [ExperienceBullet(**b) for b in exp.get("bullets", [])]
+        db.add(row)
+    for proj in profile_data.get("projects", []):
+        fields = {k: v for k, v in proj.items() if k != "bullets"}
+        row = Project(profile_id=profile.id, **fields)
+        row.bullets = [ProjectBullet(**b) for b in proj.get("bullets", [])]
+        db.add(row)
+    for cert in profile_data.get("certifications", []):
+        db.add(Certification(profile_id=profile.id, **cert))
+    for ach in profile_data.get("achievements", []):
+        db.add(Achievement(profile_id=profile.id, **ach))
+    for ep in profile_data.get("external_profiles", []):
+        db.add(ExternalProfile(profile_id=profile.id, **ep))
+
+    db.commit()
+    db.refresh(profile)
+    return profile
@@ -0,0 +1,89 @@
+"""Tests for on-demand PDF/DOCX rendering."""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.resume import Resume
+from app.services import artifacts, orchestrator
+from app.services.artifacts import artifact_path, get_artifact
+from tests.conftest import BACKEND_JD, seed_profile
+
+
+@pytest.fixture
+def pdf_renders(monkeypatch):
+    """Fake pdflatex: writes a stub file and records each render."""
+    calls = []
+
+    def fake_render(data, path, timeout=None):
+        calls.append(data["job_title"])
+        time.sleep(0.05)
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4 stub")
+        return path
+
+    monkeypatch.setattr(artifacts, "render_resume_to_pdf", fake_render)
+    return calls
+
+
+@pytest.fixture
+def resume(db, offline, strong_fit_profile_data):
+    profile = seed_profile(db, strong_fit_profile_data)
+    result = orchestrator.generate_resume(db, profile.id, BACKEND_JD)
+    return db.get(Resume, result["resume_id"])
+
+
+class TestGetArtifact:
+    def test_rendered_once_then_served_from_disk(self, resume, pdf_renders):
+        path = get_artifact(resume, "pdf")
+        assert path == artifact_path(resume.id, "pdf")
+        assert get_artifact(resume, "pdf") == path
+        assert len(pdf_renders) == 1
+
+    def test_concurrent_requests_share_one_render(self, resume, pdf_renders):
+        start = threading.Barrier(4)
+
+        def download():
+            start.wait()
+            return get_artifact(resume, "pdf")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(lambda _: download(), range(4)))
+
+        assert len(set(paths)) == 1
+        assert len(pdf_renders) == 1
+
+    def test_docx_rendered_from_stored_sections(self, resume):
+        path = get_artifact(resume, "docx")
+        assert os.path.getsize(path) > 0
+
+    def test_failed_render_leaves_no_file(self, resume, monkeypatch):
+        def broken(data, path, timeout=None):
+            with open(path, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("pdflatex not installed")
+
+        monkeypatch.setattr(artifacts, "render_resume_to_pdf", broken)
+        with pytest.raises(RuntimeError):
+            get_artifact(resume, "pdf")
+        assert not os.listdir(orchestrator.settings.OUTPUT_DIR)
+
+
+class TestDownloadEndpoint:
+    def test_download_renders_on_demand(self, client, resume, pdf_renders):
+        resp = client.get(f"/api/resumes/{resume.id}/download?format=pdf")
+        assert resp.status_code == 200
+        assert resp.content.startswith(b"%PDF")
+        assert resp.headers["content-disposition"].endswith('_v1.pdf"')
+
+    def test_render_failure_is_503(self, client, resume, monkeypatch):
+        monkeypatch.setattr(artifacts, "render_resume_to_pdf",
+                            lambda data, path, timeout=None: (_ for _ in ()).throw(RuntimeError("no pdflatex")))
+        resp = client.get(f"/api/resumes/{resume.id}/download?format=pdf")
+        assert resp.status_code == 503
+
+    def test_unknown_format_rejected(self, client, resume):
+        assert client.get(f"/api/resumes/{resume.id}/download?format=txt").status_code == 422
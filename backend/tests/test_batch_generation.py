@@ -0,0 +1,121 @@
+"""Tests for batch generation: one profile, many JDs."""
+
+import json
+import threading
+import time
+
+from app.services import orchestrator
+from app.services.orchestrator import generate_resumes_batch_async
+from tests.conftest import BACKEND_JD, seed_profile
+
+DATA_JD = "Data Engineer building Spark and Airflow pipelines. Must have SQL and Python."
+
+
+class TestBatchOrchestrator:
+    async def test_results_in_order_with_distinct_versions(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        results = await generate_resumes_batch_async(
+            db, profile.id, [BACKEND_JD, DATA_JD, BACKEND_JD], force=True,
+        )
+
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert all(r["status"] == "succeeded" for r in results)
+        assert results[0]["job_title"] == results[2]["job_title"]
+        assert {results[0]["version"], results[2]["version"]} == {1, 2}
+        assert results[0]["resume_id"] != results[2]["resume_id"]
+
+    async def test_repeated_jd_is_served_from_cache(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        results = await generate_resumes_batch_async(db, profile.id, [BACKEND_JD, BACKEND_JD])
+
+        assert results[0]["resume_id"] == results[1]["resume_id"]
+        assert sorted(r["cached"] for r in results) == [False, True]
+
+    async def test_profile_loaded_once(self, db, offline, monkeypatch, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        loads = []
+        real_get = orchestrator.ProfileRepository.get_full
+        monkeypatch.setattr(orchestrator.ProfileRepository, "get_full",
+                            staticmethod(lambda db, pid: loads.append(pid) or real_get(db, pid)))
+
+        # Each stored resume commits; none of them may force a reload
+        results = await generate_resumes_batch_async(
+            db, profile.id, [BACKEND_JD, DATA_JD] * 3, concurrency=1, force=True,
+        )
+        assert all(r["status"] == "succeeded" for r in results)
+        assert loads == [profile.id]
+
+    async def test_concurrency_is_bounded(self, db, offline, monkeypatch, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+        real_analyze = orchestrator.analyze_jd
+
+        def tracked_analyze(text, deadline=None):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return real_analyze(text)
+
+        monkeypatch.setattr(orchestrator, "analyze_jd", tracked_analyze)
+        await generate_resumes_batch_async(
+            db, profile.id, [BACKEND_JD] * 6, concurrency=2, force=True,
+        )
+        assert peak[0] == 2
+
+    async def test_failures_are_isolated_and_reported(self, db, offline, monkeypatch, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        real_analyze = orchestrator.analyze_jd
+
+        def flaky_analyze(text, deadline=None):
+            if text == DATA_JD:
+                raise RuntimeError("gemini quota exceeded")
+            return real_analyze(text)
+
+        monkeypatch.setattr(orchestrator, "analyze_jd", flaky_analyze)
+        events = []
+        results = await generate_resumes_batch_async(
+            db, profile.id, [BACKEND_JD, DATA_JD],
+            on_progress=lambda event, payload: events.append((event, payload)),
+        )
+
+        assert [r["status"] for r in results] == ["succeeded", "failed"]
+        assert results[1]["error"] == "gemini quota exceeded"
+        assert ("jd_failed", {"index": 1, "error": "gemini quota exceeded"}) in events
+        assert any(e == "jd_complete" and p["index"] == 0 for e, p in events)
+        assert all("index" in p for _, p in events)
+
+
+class TestBatchRoutes:
+    def test_batch_endpoint(self, client, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/generate/batch",
+                           json={"profile_id": profile.id, "jd_texts": [BACKEND_JD, DATA_JD]})
+        assert resp.status_code == 201
+        body = resp.json()
+        assert body["succeeded"] == 2 and body["failed"] == 0
+        assert "resume_data" not in body["results"][0]
+        assert body["results"][0]["downloads"]["docx"].endswith("format=docx")
+
+    def test_batch_size_limit(self, client, db, monkeypatch, strong_fit_profile_data):
+        monkeypatch.setattr(orchestrator.settings, "BATCH_MAX_JDS", 1)
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/generate/batch",
+                           json={"profile_id": profile.id, "jd_texts": [BACKEND_JD, DATA_JD]})
+        assert resp.status_code == 422
+
+    def test_batch_stream_tags_events_with_index(self, client, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/generate/batch/stream",
+                           json={"profile_id": profile.id, "jd_texts": [BACKEND_JD, DATA_JD]})
+        blocks = [dict(line.split(": ", 1) for line in b.splitlines())
+                  for b in resp.text.strip().split("\n\n")]
+        events = [(b["event"], json.loads(b["data"])) for b in blocks]
+
+        assert events[-1][0] == "complete"
+        assert events[-1][1]["succeeded"] == 2
+        done = sorted(p["index"] for e, p in events if e == "jd_complete")
+        assert done == [0, 1]
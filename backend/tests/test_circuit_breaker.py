@@ -0,0 +1,120 @@
+"""Unit tests for the Gemini / Pinecone circuit breakers."""
+
+import pytest
+
+from app.services import jd_analyzer, metrics
+from app.services.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, circuit_breakers,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock, monkeypatch):
+    for name, value in {
+        "CIRCUIT_WINDOW_S": 60, "CIRCUIT_MIN_CALLS": 4, "CIRCUIT_FAILURE_RATE": 0.5,
+        "CIRCUIT_SLOW_CALL_MS": 1000, "CIRCUIT_OPEN_S": 30,
+    }.items():
+        monkeypatch.setattr(jd_analyzer.settings, name, value)
+    return CircuitBreaker("test-service", clock=clock)
+
+
+def call(breaker, clock=None, fail=False, seconds=0.0):
+    with breaker.guard():
+        if clock is not None:
+            clock.now += seconds
+        if fail:
+            raise RuntimeError("upstream error")
+
+
+def fail(breaker):
+    with pytest.raises(RuntimeError):
+        call(breaker, fail=True)
+
+
+class TestCircuitBreaker:
+    def test_opens_at_failure_rate(self, breaker):
+        call(breaker)
+        call(breaker)
+        fail(breaker)
+        assert breaker.state == CLOSED  # below CIRCUIT_MIN_CALLS
+        fail(breaker)
+        assert breaker.state == OPEN
+
+    def test_slow_calls_count_as_failures(self, breaker, clock):
+        for _ in range(4):
+            call(breaker, clock, seconds=2.0)
+        assert breaker.state == OPEN
+
+    def test_old_outcomes_leave_the_window(self, breaker, clock):
+        fail(breaker)
+        fail(breaker)
+        clock.now += 61
+        call(breaker)
+        call(breaker)
+        fail(breaker)
+        assert breaker.state == CLOSED
+
+    def test_open_breaker_fails_fast(self, breaker):
+        for _ in range(4):
+            fail(breaker)
+        before = metrics.CIRCUIT_REJECTED.value(service="test-service")
+        with pytest.raises(CircuitOpenError):
+            call(breaker)
+        assert metrics.CIRCUIT_REJECTED.value(service="test-service") == before + 1
+        assert metrics.CIRCUIT_STATE.value(service="test-service") == 2
+
+    def test_half_open_probe_closes_on_success(self, breaker, clock):
+        for _ in range(4):
+            fail(breaker)
+        clock.now += 30
+        assert breaker.state == HALF_OPEN
+
+        with breaker.guard():
+            with pytest.raises(CircuitOpenError):  # only one probe at a time
+                call(breaker)
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_reopens_on_failure(self, breaker, clock):
+        for _ in range(4):
+            fail(breaker)
+        clock.now += 30
+        fail(breaker)
+        assert breaker.state == OPEN
+        clock.now += 29
+        with pytest.raises(CircuitOpenError):
+            call(breaker)
+
+
+class TestIntegration:
+    def test_open_gemini_circuit_falls_back_without_calling(self, monkeypatch):
+        monkeypatch.setattr(jd_analyzer.settings, "GEMINI_API_KEY", "test-key")
+        monkeypatch.setattr(jd_analyzer.settings, "CIRCUIT_MIN_CALLS", 1)
+        gemini = circuit_breakers.get("gemini")
+        fail(gemini)
+        assert gemini.state == OPEN
+
+        jd = "Backend Engineer. Must have Python and Docker."
+        assert jd_analyzer.analyze_jd(jd) == jd_analyzer.analyze_jd_rules(jd)
+
+    def test_health_reports_circuits(self, client, monkeypatch):
+        monkeypatch.setattr(jd_analyzer.settings, "CIRCUIT_MIN_CALLS", 1)
+        assert client.get("/").json()["circuits"] == {"gemini": CLOSED, "pinecone": CLOSED}
+
+        fail(circuit_breakers.get("pinecone"))
+        body = client.get("/").json()
+        assert body["status"] == "degraded"
+        assert body["circuits"]["pinecone"] == OPEN
+        assert 'oneresume_circuit_state{service="pinecone"} 2.0' in client.get("/metrics").text
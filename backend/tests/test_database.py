@@ -0,0 +1,82 @@
+"""Tests for the SQLite engine profiles."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_db_engine
+from app.models.user import User
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def make(profile: str):
+        engine = create_db_engine(f"sqlite:///{tmp_path}/{profile}.db", profile)
+        User.__table__.create(bind=engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def _add_user(session, name: str):
+    session.add(User(username=name, email=f"{name}@example.com", password_hash="x"))
+    session.flush()
+
+
+class TestProfiles:
+    def test_production_pragmas(self, make_engine):
+        engine = make_engine("production")
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "foreign_keys") == 1
+        assert _pragma(engine, "busy_timeout") > 0
+
+    def test_basic_keeps_driver_defaults(self, make_engine):
+        engine = make_engine("basic")
+        assert _pragma(engine, "journal_mode") == "delete"
+        assert _pragma(engine, "foreign_keys") == 0
+
+    def test_unknown_profile_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_db_engine(f"sqlite:///{tmp_path}/x.db", "turbo")
+
+
+class TestConcurrentWriters:
+    def test_second_writer_waits_instead_of_failing(self, make_engine):
+        engine = make_engine("production")
+        Session = sessionmaker(bind=engine, autoflush=False)
+        first_wrote, order = threading.Event(), []
+
+        def slow_writer():
+            with Session() as db:
+                _add_user(db, "slow")
+                first_wrote.set()
+                time.sleep(0.3)
+                db.commit()
+                order.append("slow")
+
+        thread = threading.Thread(target=slow_writer)
+        thread.start()
+        first_wrote.wait()
+        with Session() as db:
+            _add_user(db, "fast")  # waits out the busy timeout
+            db.commit()
+            order.append("fast")
+        thread.join()
+
+        assert order == ["slow", "fast"]
+        with Session() as db:
+            assert db.query(User).count() == 2
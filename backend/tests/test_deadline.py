@@ -0,0 +1,119 @@
+"""Unit tests for request deadlines and budget-driven fallbacks."""
+
+import subprocess
+
+import pytest
+
+from app.domain.resume_draft import JDData, ScoredBullet
+from app.services import jd_analyzer, latex_renderer, llm_service, orchestrator
+from app.services.deadline import Deadline
+from app.services.orchestrator import generate_resume_async
+from tests.conftest import BACKEND_JD, seed_profile
+
+
+@pytest.fixture
+def gemini(monkeypatch, tmp_path):
+    """Gemini "configured"; any call that is not faked by the test fails it."""
+    monkeypatch.setattr(orchestrator.settings, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(jd_analyzer.settings, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(jd_analyzer, "analyze_jd_with_gemini",
+                        lambda text, timeout=None: pytest.fail("Gemini JD analysis called"))
+    monkeypatch.setattr(llm_service, "rewrite_bullets_with_gemini",
+                        lambda *args, **kwargs: pytest.fail("Gemini rewrite called"))
+
+
+class TestDeadline:
+    def test_unbounded_by_default(self):
+        deadline = Deadline()
+        assert not deadline.bounded
+        assert deadline.timeout(30) == 30
+        assert deadline.allows(30)
+
+    def test_timeout_is_share_of_remaining_capped(self):
+        deadline = Deadline(10_000)
+        assert 4.5 < deadline.timeout(30, 0.5) <= 5
+        assert deadline.timeout(2) == 2
+
+    def test_small_budget_disallows_remote_calls(self, monkeypatch):
+        monkeypatch.setattr(jd_analyzer.settings, "GEMINI_MIN_BUDGET_MS", 1500)
+        assert not Deadline(1000).allows(30)
+        assert not Deadline(2000).allows(30, 0.5)
+        assert Deadline(5000).allows(30, 0.5)
+
+    def test_from_header_uses_default(self, monkeypatch):
+        monkeypatch.setattr(jd_analyzer.settings, "DEFAULT_DEADLINE_MS", 0)
+        assert not Deadline.from_header(None).bounded
+        assert Deadline.from_header(5000).bounded
+        monkeypatch.setattr(jd_analyzer.settings, "DEFAULT_DEADLINE_MS", 8000)
+        assert Deadline.from_header(None).bounded
+
+    def test_fork_shares_expiry_not_degradations(self):
+        deadline = Deadline(5000)
+        deadline.degrade("analyze_jd")
+        fork = deadline.fork()
+        assert fork.bounded and fork.degraded == []
+        assert deadline.degraded == ["analyze_jd"]
+
+
+class TestFallbacks:
+    def test_jd_analysis_skips_gemini_when_budget_is_short(self, gemini):
+        deadline = Deadline(100)
+        jd_data = jd_analyzer.analyze_jd(BACKEND_JD, deadline)
+        assert jd_data == jd_analyzer.analyze_jd_rules(BACKEND_JD)
+        assert deadline.degraded == ["analyze_jd"]
+
+    def test_jd_analysis_timeout_from_budget(self, gemini, monkeypatch):
+        timeouts = []
+
+        def fake_gemini(text, timeout=None):
+            timeouts.append(timeout)
+            return JDData(role_title="Backend Engineer")
+
+        monkeypatch.setattr(jd_analyzer, "analyze_jd_with_gemini", fake_gemini)
+        deadline = Deadline(10_000)
+        jd_analyzer.analyze_jd(BACKEND_JD, deadline)
+        assert 4.5 < timeouts[0] <= 5
+        assert deadline.degraded == []
+
+    def test_rewrite_falls_back_only_for_uncached_bullets(self, gemini):
+        bullets = [ScoredBullet(id="1", text="Built APIs"), ScoredBullet(id="2", text="Tuned queries")]
+        key = llm_service.stage_key(
+            "rewrite", llm_service.settings.GEMINI_MODEL, "Engineer", ["Python"], "Built APIs",
+        )
+        llm_service.stage_cache.put_many("rewrite", {key: "Cached rewrite"})
+
+        deadline = Deadline(100)
+        llm_service.rewrite_bullets_incremental(bullets, "Engineer", ["Python"], deadline)
+
+        assert bullets[0].rewritten_text == "Cached rewrite"
+        assert bullets[1].rewritten_text
+        assert deadline.degraded == ["rewrite_bullets"]
+
+    def test_pdflatex_timeout_is_reported(self, monkeypatch, tmp_path):
+        def hang(*args, timeout=None, **kwargs):
+            raise subprocess.TimeoutExpired("pdflatex", timeout)
+
+        monkeypatch.setattr(latex_renderer.subprocess, "run", hang)
+        with pytest.raises(RuntimeError, match="timed out"):
+            latex_renderer.compile_pdf("", str(tmp_path / "out.pdf"), timeout=0.5)
+
+
+class TestDegradedGeneration:
+    async def test_degraded_result_is_not_cached(self, db, gemini, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        first = await generate_resume_async(db, profile.id, BACKEND_JD, deadline=Deadline(100))
+        assert first["degraded"] == ["analyze_jd", "rewrite_bullets"]
+
+        second = await generate_resume_async(db, profile.id, BACKEND_JD, deadline=Deadline(100))
+        assert second["cached"] is False
+        assert second["version"] == 2
+
+    def test_header_sets_budget(self, client, db, gemini, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post(
+            "/api/resumes/generate",
+            json={"profile_id": profile.id, "jd_text": BACKEND_JD},
+            headers={"X-Deadline-Ms": "100"},
+        )
+        assert resp.status_code == 201
+        assert resp.json()["degraded"] == ["analyze_jd", "rewrite_bullets"]
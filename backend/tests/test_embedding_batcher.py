@@ -0,0 +1,166 @@
+"""Unit tests for the cross-request embedding micro-batcher."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingEmbedder:
+    """Fake provider: returns [len(text)] per text and records every call."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+
+    def __call__(self, texts, input_type):
+        with self._lock:
+            self.calls.append((list(texts), input_type))
+        self.entered.set()
+        self.release.wait()
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(t))] for t in texts]
+
+
+def _run_concurrently(batcher, embedder, requests):
+    """Run ``requests`` together while another call holds the provider.
+
+    A lone caller goes straight to the provider, so coalescing only starts
+    once a call is in flight. That first call is dropped from ``calls``.
+    """
+    embedder.release.clear()
+    with ThreadPoolExecutor(max_workers=len(requests) + 1) as pool:
+        blocker = pool.submit(batcher.embed, ["in flight"], "passage")
+        embedder.entered.wait()
+        embedder.calls.clear()
+        futures = [pool.submit(batcher.embed, *args) for args in requests]
+        while batcher._callers < len(requests) + 1:
+            time.sleep(0.001)
+        embedder.release.set()
+        blocker.exception()
+        return [f.exception() or f.result() for f in futures]
+
+
+class GatedEmbedder(RecordingEmbedder):
+    """Fake provider that holds any call containing a gated text until released."""
+
+    def __init__(self, *gated):
+        super().__init__()
+        self.gates = {text: threading.Event() for text in gated}
+        self.arrived = {text: threading.Event() for text in gated}
+
+    def __call__(self, texts, input_type):
+        for text in texts:
+            if text in self.gates:
+                self.arrived[text].set()
+                self.gates[text].wait()
+        return [[float(len(t))] for t in texts]
+
+    def open_gates(self):
+        for gate in self.gates.values():
+            gate.set()
+
+
+class TestEmbeddingBatcher:
+    def test_concurrent_calls_share_one_request(self):
+        embedder = RecordingEmbedder()
+        batcher = EmbeddingBatcher(embedder, window_ms=200, max_batch=100)
+        requests = [([f"text {i}", "x" * i], "passage") for i in range(1, 6)]
+
+        results = _run_concurrently(batcher, embedder, requests)
+
+        assert len(embedder.calls) == 1
+        for (texts, _), vectors in zip(requests, results):
+            assert vectors == [[float(len(t))] for t in texts]
+
+    def test_duplicate_texts_sent_once(self):
+        embedder = RecordingEmbedder()
+        batcher = EmbeddingBatcher(embedder, window_ms=200, max_batch=100)
+
+        _run_concurrently(batcher, embedder, [(["python", "go"], "query"), (["python"], "query")])
+
+        sent = [t for texts, _ in embedder.calls for t in texts]
+        assert sorted(sent) == ["go", "python"]
+
+    def test_input_types_not_mixed(self):
+        embedder = RecordingEmbedder()
+        batcher = EmbeddingBatcher(embedder, window_ms=200, max_batch=100)
+
+        _run_concurrently(batcher, embedder, [(["a"], "query"), (["b"], "passage")])
+
+        assert sorted(input_type for _, input_type in embedder.calls) == ["passage", "query"]
+
+    def test_errors_reach_every_caller(self):
+        embedder = RecordingEmbedder(fail=True)
+        batcher = EmbeddingBatcher(embedder, window_ms=50, max_batch=100)
+
+        results = _run_concurrently(batcher, embedder, [(["a"], "passage"), (["b"], "passage")])
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher._callers == 0
+
+    def test_slow_flush_does_not_hold_up_the_next_batch(self):
+        embedder = GatedEmbedder("in flight", "slow")
+        batcher = EmbeddingBatcher(embedder, window_ms=20, max_batch=100)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            try:
+                blocker = pool.submit(batcher.embed, ["in flight"], "passage")  # goes direct
+                assert embedder.arrived["in flight"].wait(timeout=5)
+                slow = pool.submit(batcher.embed, ["slow"], "passage")
+                assert embedder.arrived["slow"].wait(timeout=5)  # its batch is at the provider
+
+                fast = pool.submit(batcher.embed, ["fast"], "passage")
+                assert fast.result(timeout=2) == [[4.0]]
+                assert not slow.done()
+            finally:
+                embedder.open_gates()
+            assert slow.result(timeout=5) == [[4.0]]
+            blocker.result(timeout=5)
+
+    def test_waiting_caller_gives_up_after_the_provider_timeout(self):
+        embedder = GatedEmbedder("in flight", "hung")
+        batcher = EmbeddingBatcher(embedder, window_ms=10, max_batch=100, timeout_s=0.2)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            try:
+                blocker = pool.submit(batcher.embed, ["in flight"], "passage")
+                assert embedder.arrived["in flight"].wait(timeout=5)
+
+                start = time.perf_counter()
+                with pytest.raises(TimeoutError):
+                    batcher.embed(["hung"], "passage")
+                assert time.perf_counter() - start < 2
+            finally:
+                embedder.open_gates()
+            blocker.result(timeout=5)
+        assert batcher._callers == 0
+
+    def test_lone_call_skips_the_window(self):
+        embedder = RecordingEmbedder()
+        batcher = EmbeddingBatcher(embedder, window_ms=1000, max_batch=100)
+
+        start = time.perf_counter()
+        assert batcher.embed(["abc"], "passage") == [[3.0]]
+        assert time.perf_counter() - start < 0.5
+        assert batcher._worker is None
+
+    def test_zero_window_calls_through(self):
+        embedder = RecordingEmbedder()
+        batcher = EmbeddingBatcher(embedder, window_ms=0, max_batch=100)
+
+        assert batcher.embed(["abc"], "passage") == [[3.0]]
+        assert batcher._worker is None
+
+    def test_full_batch_bypasses_queue(self):
+        embedder = RecordingEmbedder()
+        batcher = EmbeddingBatcher(embedder, window_ms=1000, max_batch=2)
+
+        assert batcher.embed(["a", "bb"], "passage") == [[1.0], [2.0]]
+        assert batcher._worker is None
@@ -0,0 +1,89 @@
+"""Unit tests for the content-addressed embedding cache."""
+
+import pytest
+
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.services import embedding_service
+from app.services.embedding_cache import embedding_cache, cache_key, normalize_text
+
+
+@pytest.fixture
+def remote_calls(monkeypatch):
+    """Replace the Pinecone call with a deterministic fake that records inputs."""
+    calls = []
+
+    def _fake_remote(texts, input_type):
+        calls.append((list(texts), input_type))
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+    monkeypatch.setattr(embedding_service, "_provider_embed", _fake_remote)
+    return calls
+
+
+class TestCacheKey:
+    def test_whitespace_is_normalized(self):
+        assert normalize_text("  Python   backend\n engineer ") == "Python backend engineer"
+        assert cache_key("m", "passage", "a  b") == cache_key("m", "passage", " a b ")
+
+    def test_model_and_input_type_are_part_of_key(self):
+        base = cache_key("m1", "passage", "text")
+        assert cache_key("m2", "passage", "text") != base
+        assert cache_key("m1", "query", "text") != base
+
+
+class TestCachedEmbedding:
+    def test_repeat_text_hits_memory(self, remote_calls):
+        first = embedding_service.generate_embedding("Senior Python Engineer")
+        second = embedding_service.generate_embedding("Senior  Python Engineer ")
+        assert first == second
+        assert len(remote_calls) == 1
+
+    def test_persistent_layer_survives_memory_eviction(self, db, remote_calls):
+        embedding_service.generate_embedding("Kubernetes operator")
+        embedding_cache.clear_memory()
+        embedding_service.generate_embedding("Kubernetes operator")
+        assert len(remote_calls) == 1
+        assert db.query(EmbeddingCacheEntry).count() == 1
+
+    def test_batch_embeds_only_unseen_texts(self, remote_calls):
+        embedding_service.generate_embedding("Python developer")
+        embs = embedding_service.generate_embeddings(
+            ["Python developer", "Java developer", "Java developer"]
+        )
+        assert len(embs) == 3
+        assert embs[1] == embs[2]
+        assert remote_calls[-1] == (["Java developer"], "passage")
+
+    def test_input_type_is_separate_namespace(self, remote_calls):
+        embedding_service.generate_embedding("Go", input_type="query")
+        embedding_service.generate_embedding("Go", input_type="passage")
+        assert [c[1] for c in remote_calls] == ["query", "passage"]
+
+
+class TestCacheConnections:
+    def test_caches_have_their_own_pool(self):
+        from app.database import cache_engine, engine
+        from app.services.embedding_cache import EmbeddingCache
+        from app.services.stage_cache import StageCache
+
+        assert cache_engine.pool is not engine.pool
+        for cache in (EmbeddingCache(), StageCache()):
+            assert cache._session_factory.kw["bind"] is cache_engine
+
+    def test_exhausted_pool_is_a_logged_miss(self, tmp_path, caplog):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.database import Base
+        from app.services.embedding_cache import EmbeddingCache
+
+        tiny = create_engine(f"sqlite:///{tmp_path / 'cache.db'}", pool_size=1, max_overflow=0, pool_timeout=0.1)
+        Base.metadata.create_all(bind=tiny, tables=[EmbeddingCacheEntry.__table__])
+        cache = EmbeddingCache(sessionmaker(bind=tiny))
+        cache.put_many("m", "passage", {"k": [1.0]})
+        cache.clear_memory()
+
+        with tiny.connect():  # the only connection
+            assert cache.get_many(["k"]) == {}
+        assert "timed out waiting for a connection" in caplog.text
+        assert cache.get_many(["k"]) == {"k": [1.0]}
+        tiny.dispose()
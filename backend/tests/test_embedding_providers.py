@@ -0,0 +1,62 @@
+"""Unit tests for the pluggable embedding providers."""
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.embedding_providers import (
+    LocalHashProvider, PineconeProvider, get_provider,
+)
+
+
+class TestLocalHashProvider:
+    def test_shape_and_unit_norm(self):
+        provider = LocalHashProvider(dim=64)
+        vectors = provider.embed(["Python backend developer", "Go"], "passage")
+        assert [len(v) for v in vectors] == [64, 64]
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+    def test_deterministic_across_instances(self):
+        a = LocalHashProvider(dim=32).embed(["FastAPI microservices"], "passage")
+        b = LocalHashProvider(dim=32).embed(["FastAPI microservices"], "passage")
+        assert a == b
+
+    def test_related_texts_are_closer(self):
+        provider = LocalHashProvider(dim=256)
+        base, related, unrelated = np.array(provider.embed(
+            ["Built Python REST APIs", "Designed REST APIs in Python", "Watercolor painting"],
+            "passage",
+        ))
+        assert base @ related > base @ unrelated
+
+    def test_empty_text_is_zero_vector(self):
+        assert LocalHashProvider(dim=8).embed(["  "], "passage") == [[0.0] * 8]
+
+
+class TestProviderSelection:
+    def test_setting_selects_provider(self, monkeypatch):
+        monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "local")
+        assert isinstance(get_provider(), LocalHashProvider)
+        monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "pinecone")
+        provider = get_provider()
+        assert isinstance(provider, PineconeProvider)
+        assert provider.name == settings.EMBEDDING_MODEL
+
+    def test_unknown_provider_rejected(self, monkeypatch):
+        monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "bogus")
+        with pytest.raises(ValueError):
+            get_provider()
+
+    def test_cache_keys_are_provider_specific(self, monkeypatch):
+        from app.services import embedding_service
+        seen = []
+        real = embedding_service.embedding_cache.get_many
+        monkeypatch.setattr(embedding_service.embedding_cache, "get_many",
+                            lambda keys: seen.extend(keys) or real(keys))
+        monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "local")
+        embedding_service.generate_embedding("same text")
+        monkeypatch.setattr(embedding_service, "_provider_embed",
+                            lambda texts, input_type: [[1.0] for _ in texts])
+        monkeypatch.setattr(settings, "EMBEDDING_PROVIDER", "pinecone")
+        embedding_service.generate_embedding("same text")
+        assert seen[0] != seen[1]
@@ -43,16 +43,38 @@ class TestEmbeddingService:
         sim_unrelated = cosine_similarity(e1, e3)
         assert sim_related > sim_unrelated
 
-    def test_serialization(self):
-        from app.services.embedding_service import (
-            embedding_to_json, embedding_from_json,
-        )
-        original = [0.1, 0.2, 0.3, 0.4]
-        serialized = embedding_to_json(original)
-        deserialized = embedding_from_json(serialized)
-        assert deserialized == original
+    def test_legacy_json_deserialization(self):
+        from app.services.embedding_service import embedding_from_blob, embedding_from_json
+        original = [0.25, 0.5, 0.75, 1.0]
+        assert embedding_from_json(json.dumps(original)) == original
+        assert embedding_from_blob(json.dumps(original)).tolist() == original
 
     def test_deserialization_none(self):
         from app.services.embedding_service import embedding_from_json
         assert embedding_from_json(None) is None
         assert embedding_from_json("") is None
+
+    def test_blob_roundtrip(self):
+        import numpy as np
+        from app.services.embedding_service import embedding_to_blob, embedding_from_blob
+        blob = embedding_to_blob([0.1, 0.2, 0.3])
+        assert len(blob) == 12  # float32
+        assert np.allclose(embedding_from_blob(blob), [0.1, 0.2, 0.3])
+
+    def test_blob_decoder_reads_legacy_json(self):
+        import numpy as np
+        from app.services.embedding_service import embedding_from_blob
+        assert np.allclose(embedding_from_blob("[0.1, 0.2]"), [0.1, 0.2])
+        assert embedding_from_blob(None) is None
+
+    def test_cosine_similarity_matrix(self):
+        import numpy as np
+        from app.services.embedding_service import cosine_similarity, cosine_similarity_matrix
+        a = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]
+        b = [[1, 1, 0], [0, 0, 3]]
+        sims = cosine_similarity_matrix(a, b)
+        assert sims.shape == (3, 2)
+        for i in range(2):
+            for j in range(2):
+                assert abs(sims[i, j] - cosine_similarity(a[i], b[j])) < 1e-9
+        assert np.all(sims[2] == 0.0)
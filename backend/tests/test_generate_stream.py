@@ -0,0 +1,55 @@
+"""Tests for the Server-Sent Events generation stream."""
+
+import json
+
+from app.services import orchestrator
+from tests.conftest import BACKEND_JD, seed_profile
+
+
+def _parse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestGenerateStream:
+    def test_partial_results_then_complete(self, client, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/generate/stream",
+                           json={"profile_id": profile.id, "jd_text": BACKEND_JD})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+
+        events = _parse(resp.text)
+        names = [name for name, _ in events if name != "stage"]
+        assert names == ["jd_analysis", "selection", "rewritten", "ats", "complete"]
+
+        payloads = dict(events)
+        assert payloads["jd_analysis"]["role_title"]
+        assert payloads["selection"]["experience"][0]["bullets"]
+        complete = payloads["complete"]
+        assert complete["resume_id"]
+        assert set(complete["downloads"]) == {"pdf", "docx"}
+
+        stages = [p["stage"] for name, p in events if name == "stage"]
+        assert "analyze_jd" in stages and stages[-1] == "store_resume"
+
+    def test_unknown_profile_is_plain_404(self, client):
+        resp = client.post("/api/resumes/generate/stream",
+                           json={"profile_id": "missing", "jd_text": BACKEND_JD})
+        assert resp.status_code == 404
+
+    def test_failure_ends_with_error_event(self, client, db, offline, monkeypatch, strong_fit_profile_data):
+        def boom(draft, deadline=None):
+            raise RuntimeError("gemini exploded")
+
+        monkeypatch.setattr(orchestrator, "rewrite_draft_bullets", boom)
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/generate/stream",
+                           json={"profile_id": profile.id, "jd_text": BACKEND_JD})
+
+        events = _parse(resp.text)
+        assert events[-1] == ("error", {"detail": "Resume generation failed"})
+        assert "selection" in [name for name, _ in events]
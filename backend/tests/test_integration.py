@@ -67,6 +67,7 @@ class TestFullPipeline:
         resp2 = client.post("/api/resumes/generate", json={
             "profile_id": profile_id,
             "jd_text": sample_jd_text,
+            "force": True,
         })
         v2 = resp2.json()["version"]
 
@@ -0,0 +1,146 @@
+"""Tests for background resume generation jobs."""
+
+import json
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.generation_job import GenerationJob
+from app.repositories import GenerationJobRepo
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import JobQueue
+from tests.conftest import BACKEND_JD, TestSession, seed_profile
+
+
+@pytest.fixture
+def queue():
+    q = JobQueue(session_factory=TestSession, max_workers=2, max_pending=3)
+    yield q
+    q.shutdown()
+
+
+def _status(job_id):
+    db = TestSession()
+    try:
+        return db.get(GenerationJob, job_id)
+    finally:
+        db.close()
+
+
+class TestJobQueue:
+    def test_job_runs_to_success(self, db, queue, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        job = queue.submit(db, profile.id, BACKEND_JD)
+        assert job.status == "queued"
+
+        queue.shutdown()  # waits for the worker
+        finished = _status(job.id)
+        assert finished.status == "succeeded"
+        assert finished.started_at and finished.finished_at
+        result = json.loads(finished.result)
+        assert result["resume_id"] and result["version"] == 1
+        assert "resume_data" not in result
+
+    def test_failure_is_recorded(self, db, queue, monkeypatch, strong_fit_profile_data):
+        def boom(db, profile_id, jd_text, force=False):
+            raise RuntimeError("renderer exploded")
+
+        monkeypatch.setattr(job_queue_module, "generate_resume", boom)
+        profile = seed_profile(db, strong_fit_profile_data)
+        job = queue.submit(db, profile.id, BACKEND_JD)
+
+        queue.shutdown()
+        finished = _status(job.id)
+        assert finished.status == "failed"
+        assert finished.error == "renderer exploded"
+
+    def test_unknown_profile_is_rejected_upfront(self, db, queue):
+        with pytest.raises(HTTPException) as exc:
+            queue.submit(db, "no-such-profile", BACKEND_JD)
+        assert exc.value.status_code == 404
+        assert db.query(GenerationJob).count() == 0
+
+    def test_backlog_limit(self, db, queue, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        for _ in range(3):
+            GenerationJobRepo.create(db, profile.id, BACKEND_JD)
+        with pytest.raises(HTTPException) as exc:
+            queue.submit(db, profile.id, BACKEND_JD)
+        assert exc.value.status_code == 503
+
+    def test_recover_requeues_interrupted_jobs(self, db, queue, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        interrupted = GenerationJobRepo.create(db, profile.id, BACKEND_JD)
+        assert GenerationJobRepo.claim(db, interrupted.id, "dead-process", lease_s=-1)
+        waiting = GenerationJobRepo.create(db, profile.id, BACKEND_JD)
+
+        assert queue.recover() == 2
+        queue.shutdown()
+        assert _status(interrupted.id).status == "succeeded"
+        assert _status(interrupted.id).owner == queue.owner
+        assert _status(waiting.id).status == "succeeded"
+
+    def test_recover_leaves_live_leases_alone(self, db, queue, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        elsewhere = GenerationJobRepo.create(db, profile.id, BACKEND_JD)
+        assert GenerationJobRepo.claim(db, elsewhere.id, "other-process", lease_s=60)
+
+        assert queue.recover() == 0
+        queue.shutdown()
+        job = _status(elsewhere.id)
+        assert job.status == "running" and job.owner == "other-process"
+
+    def test_a_job_is_claimed_once(self, db, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        job = GenerationJobRepo.create(db, profile.id, BACKEND_JD)
+
+        assert GenerationJobRepo.claim(db, job.id, "first", lease_s=60)
+        assert not GenerationJobRepo.claim(db, job.id, "second", lease_s=60)
+        assert _status(job.id).owner == "first"
+
+    def test_heartbeat_renews_running_leases(self, db, monkeypatch, strong_fit_profile_data):
+        started, release = threading.Event(), threading.Event()
+
+        def blocked(db, profile_id, jd_text, force=False):
+            started.set()
+            assert release.wait(timeout=5)
+            raise RuntimeError("released")
+
+        monkeypatch.setattr(job_queue_module, "generate_resume", blocked)
+        queue = JobQueue(session_factory=TestSession, max_workers=1, lease_s=1, heartbeat_s=0.05)
+        profile = seed_profile(db, strong_fit_profile_data)
+        job = queue.submit(db, profile.id, BACKEND_JD)
+        try:
+            assert started.wait(timeout=5)
+            first = _status(job.id).lease_expires_at
+            deadline = time.monotonic() + 5
+            while _status(job.id).lease_expires_at == first and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert _status(job.id).lease_expires_at > first
+        finally:
+            release.set()
+            queue.shutdown()
+        assert _status(job.id).lease_expires_at is None  # cleared on finish
+
+
+class TestJobRoutes:
+    def test_submit_and_poll(self, client, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/jobs", json={"profile_id": profile.id, "jd_text": BACKEND_JD})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+
+        deadline = time.monotonic() + 30
+        while True:
+            body = client.get(f"/api/resumes/jobs/{job_id}").json()
+            if body["status"] not in ("queued", "running") or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+
+        assert body["status"] == "succeeded"
+        assert body["result"]["job_title"]
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/resumes/jobs/missing").status_code == 404
@@ -0,0 +1,77 @@
+"""Unit tests for the shared keyword matcher."""
+
+import random
+
+from app.domain.resume_draft import JDData
+from app.services.keyword_matcher import KeywordMatcher, contained_in_any, jd_matcher
+
+
+def _naive(patterns, text):
+    return {i for i, p in enumerate(patterns) if p.lower() in text.lower()}
+
+
+class TestKeywordMatcher:
+    def test_finds_overlapping_patterns(self):
+        matcher = KeywordMatcher(["Java", "JavaScript", "script", "SQL", "go"])
+        assert matcher.find("Wrote javascript and PostgreSQL") == {0, 1, 2, 3}
+
+    def test_duplicates_and_empty_pattern(self):
+        matcher = KeywordMatcher(["api", "API", ""])
+        assert matcher.find("REST APIs") == {0, 1, 2}
+        assert matcher.find("nothing here") == {2}
+
+    def test_matches_substring_semantics(self):
+        rng = random.Random(7)
+        alphabet = "abAB c"
+        for _ in range(2000):
+            patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+                        for _ in range(rng.randint(1, 6))]
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            assert KeywordMatcher(patterns).find(text) == _naive(patterns, text)
+
+    def test_contained_in_any(self):
+        texts = ["Built services in Go", "Deployed with Docker"]
+        assert contained_in_any(["docker", "Go", "Rust"], texts) == {0, 1}
+        assert contained_in_any(["", "go"], []) == set()
+
+    def test_contained_in_any_matches_naive(self):
+        rng = random.Random(11)
+        alphabet = "abAB c"
+        for _ in range(1000):
+            patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+                        for _ in range(rng.randint(1, 5))]
+            texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+                     for _ in range(rng.randint(0, 4))]
+            expected = {i for i, p in enumerate(patterns) if any(p.lower() in t.lower() for t in texts)}
+            assert contained_in_any(patterns, texts) == expected
+
+
+class TestJDMatcher:
+    def test_scan_groups_hits(self):
+        jd = JDData(keywords=["REST", "scalable"], must_have_skills=["Python"],
+                    nice_to_have_skills=["Docker"])
+        hits = jd_matcher(jd).scan("Scalable REST services in Docker")
+        assert hits.keyword_count == 2
+        assert not hits.must_have
+        assert hits.nice_to_have
+
+    def test_compiled_once_per_jd(self):
+        a = JDData(keywords=["python"], must_have_skills=["sql"])
+        b = JDData(keywords=["python"], must_have_skills=["sql"])
+        assert jd_matcher(a) is jd_matcher(b)
+
+    def test_scan_many_matches_scan(self):
+        rng = random.Random(3)
+        alphabet = "abAB c"
+        word = lambda n: "".join(rng.choice(alphabet) for _ in range(rng.randint(0, n)))  # noqa: E731
+        for _ in range(500):
+            jd = JDData(keywords=[word(3) for _ in range(3)],
+                        must_have_skills=[word(3) for _ in range(2)],
+                        nice_to_have_skills=[word(3) for _ in range(2)])
+            texts = [word(12) for _ in range(rng.randint(0, 5))]
+            matcher = jd_matcher(jd)
+            counts, must, nice = matcher.scan_many(texts)
+            singles = [matcher.scan(t) for t in texts]
+            assert counts == [h.keyword_count for h in singles]
+            assert must == [h.must_have for h in singles]
+            assert nice == [h.nice_to_have for h in singles]
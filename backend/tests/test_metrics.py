@@ -0,0 +1,92 @@
+"""Tests for pipeline metrics and the /metrics endpoint."""
+
+import logging
+
+import pytest
+
+from app.services import metrics, orchestrator
+from app.services.metrics import Counter, Histogram, PipelineTrace, track_call
+from tests.conftest import BACKEND_JD, seed_profile
+
+
+class TestPrimitives:
+    def test_counter_exposition(self):
+        c = Counter("test_things_total", "Things", ("kind",))
+        c.inc(kind="a")
+        c.inc(2, kind='quote"d')
+        lines = c.collect()
+        assert lines[:2] == ["# HELP test_things_total Things", "# TYPE test_things_total counter"]
+        assert 'test_things_total{kind="a"} 1.0' in lines
+        assert 'test_things_total{kind="quote\\"d"} 2.0' in lines
+
+    def test_histogram_buckets_are_cumulative(self):
+        h = Histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 3.0):
+            h.observe(v)
+        lines = h.collect()
+        assert 'test_latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'test_latency_seconds_bucket{le="1.0"} 3' in lines
+        assert 'test_latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "test_latency_seconds_count 4" in lines
+        assert "test_latency_seconds_sum 3.65" in lines
+
+    def test_label_names_are_enforced(self):
+        with pytest.raises(ValueError):
+            Counter("test_x_total", "x", ("a",)).inc(b="1")
+
+
+class TestInstrumentation:
+    def test_track_call_counts_errors(self):
+        before = metrics.OUTBOUND_CALLS.value(service="test", operation="op", outcome="error")
+        with pytest.raises(RuntimeError):
+            with track_call("test", "op"):
+                raise RuntimeError("down")
+        after = metrics.OUTBOUND_CALLS.value(service="test", operation="op", outcome="error")
+        assert after == before + 1
+        assert metrics.OUTBOUND_SECONDS.count(service="test", operation="op") >= 1
+
+    def test_trace_records_stages_and_failures(self):
+        trace = PipelineTrace("test")
+        errors_before = metrics.STAGE_ERRORS.value(stage="test_fail")
+        with pytest.raises(ValueError):
+            with trace.run():
+                with trace.stage("test_ok"):
+                    pass
+                with trace.stage("test_fail"):
+                    raise ValueError
+        assert set(trace.stages) == {"test_ok", "test_fail"}
+        assert metrics.STAGE_ERRORS.value(stage="test_fail") == errors_before + 1
+        assert trace.total is not None
+
+    def test_generate_resume_times_every_stage(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        before = metrics.STAGE_SECONDS.count(stage="rewrite_bullets")
+        orchestrator.generate_resume(db, profile.id, BACKEND_JD)
+        assert metrics.STAGE_SECONDS.count(stage="rewrite_bullets") == before + 1
+        for stage in ("analyze_jd", "embed_jd", "select_content", "assemble", "store_resume"):
+            assert metrics.STAGE_SECONDS.count(stage=stage) >= 1
+
+
+class TestEndpoint:
+    def test_metrics_endpoint(self, client):
+        client.get("/")
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert 'oneresume_http_request_seconds_count{method="GET",route="/",status="200"}' in resp.text
+
+    def test_route_template_used_as_label(self, client):
+        client.get("/api/resumes/jobs/some-missing-id")
+        body = client.get("/metrics").text
+        assert 'route="/api/resumes/jobs/{job_id}",status="404"' in body
+
+    def test_slow_request_log_has_stage_breakdown(
+        self, client, db, offline, monkeypatch, caplog, strong_fit_profile_data,
+    ):
+        monkeypatch.setattr(metrics.settings, "SLOW_REQUEST_MS", 0)
+        profile = seed_profile(db, strong_fit_profile_data)
+        with caplog.at_level(logging.WARNING, logger="app.services.metrics"):
+            resp = client.post("/api/resumes/generate", json={"profile_id": profile.id, "jd_text": BACKEND_JD})
+        assert resp.status_code == 201
+        slow = [r.getMessage() for r in caplog.records if "Slow request POST" in r.getMessage()]
+        assert slow and "analyze_jd=" in slow[0] and "store_resume=" in slow[0]
@@ -0,0 +1,152 @@
+"""Tests for startup migrations."""
+
+import json
+
+import numpy as np
+from sqlalchemy import text
+
+from app.migrations import run_migrations, MIGRATIONS
+from app.models.profile import ExperienceBullet
+from app.models.schema_migration import SchemaMigration
+from app.services.embedding_service import embedding_from_blob
+from tests.conftest import engine
+
+
+class TestEmbeddingBlobMigration:
+    def test_json_embeddings_converted(self, db):
+        vector = [0.25, -0.5, 1.0]
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO experience_bullets (id, experience_id, bullet_text, embedding) "
+                "VALUES ('b1', 'e1', 'Built APIs', :emb), ('b2', 'e1', 'No vector', NULL)"
+            ), {"emb": json.dumps(vector)})
+
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            kind = conn.execute(text(
+                "SELECT typeof(embedding) FROM experience_bullets WHERE id = 'b1'"
+            )).scalar()
+        assert kind == "blob"
+
+        bullet = db.get(ExperienceBullet, "b1")
+        assert np.array_equal(embedding_from_blob(bullet.embedding), np.float32(vector))
+        assert db.get(ExperienceBullet, "b2").embedding is None
+
+    def test_migrations_recorded_once(self, db):
+        run_migrations(engine)
+        run_migrations(engine)
+        assert db.query(SchemaMigration).count() == len(MIGRATIONS)
+
+
+
+class TestProfileContentVersionMigration:
+    def test_column_added_to_existing_table(self, tmp_path):
+        from sqlalchemy import create_engine, inspect
+        from app.migrations import _profile_content_version
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as conn:
+            conn.execute(text("CREATE TABLE profiles (id VARCHAR(36) PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO profiles (id) VALUES ('p1')"))
+            _profile_content_version(conn)
+            _profile_content_version(conn)  # idempotent
+
+        assert "content_version" in {c["name"] for c in inspect(legacy).get_columns("profiles")}
+        with legacy.connect() as conn:
+            assert conn.execute(text("SELECT content_version FROM profiles")).scalar() == 0
+
+
+class TestResumeInputHashMigration:
+    def test_columns_and_index_added(self, tmp_path):
+        from sqlalchemy import create_engine, inspect
+        from app.migrations import _resume_input_hash
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as conn:
+            conn.execute(text("CREATE TABLE resumes (id VARCHAR(36) PRIMARY KEY)"))
+            conn.execute(text("CREATE TABLE generation_jobs (id VARCHAR(36) PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO generation_jobs (id) VALUES ('j1')"))
+            _resume_input_hash(conn)
+            _resume_input_hash(conn)  # idempotent
+
+        inspector = inspect(legacy)
+        assert "input_hash" in {c["name"] for c in inspector.get_columns("resumes")}
+        assert "ix_resumes_input_hash" in {i["name"] for i in inspector.get_indexes("resumes")}
+        with legacy.connect() as conn:
+            assert conn.execute(text("SELECT force FROM generation_jobs")).scalar() == 0
+
+
+class TestGenerationJobLeaseMigration:
+    def test_columns_added(self, tmp_path):
+        from sqlalchemy import create_engine, inspect
+        from app.migrations import _generation_job_lease
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with legacy.begin() as conn:
+            conn.execute(text("CREATE TABLE generation_jobs (id VARCHAR(36) PRIMARY KEY)"))
+            _generation_job_lease(conn)
+            _generation_job_lease(conn)  # idempotent
+
+        columns = {c["name"] for c in inspect(legacy).get_columns("generation_jobs")}
+        assert {"owner", "lease_expires_at"} <= columns
+
+
+class TestForeignKeyIndexMigration:
+    def _plans(self, legacy, profile_id):
+        """EXPLAIN QUERY PLAN for every query a profile load and a version lookup issue."""
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+        from app.repositories import ProfileRepository, ResumeRepo
+
+        statements = []
+        record = lambda conn, cursor, stmt, params, ctx, many: statements.append((stmt, params))  # noqa: E731
+        event.listen(legacy, "before_cursor_execute", record)
+        try:
+            with Session(legacy) as session:
+                ProfileRepository.get_full(session, profile_id)
+                ResumeRepo.get_next_version(session, profile_id, "Backend Engineer")
+        finally:
+            event.remove(legacy, "before_cursor_execute", record)
+
+        with legacy.connect() as conn:
+            return [
+                " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {stmt}", params))
+                for stmt, params in statements
+            ]
+
+    def test_indexes_added_and_used(self, tmp_path):
+        from sqlalchemy import create_engine, inspect
+        from sqlalchemy.orm import Session
+        from app.database import Base
+        from app.migrations import _foreign_key_indexes, _FOREIGN_KEY_INDEXES
+        from app.models import User, Profile, Experience, ExperienceBullet, Resume
+
+        legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        Base.metadata.create_all(bind=legacy)
+        with legacy.begin() as conn:
+            for name, _, _ in _FOREIGN_KEY_INDEXES:
+                conn.execute(text(f"DROP INDEX {name}"))  # as created before the indexes existed
+
+        with Session(legacy) as session:
+            user = User(username="u", email="u@example.com", password_hash="x")
+            profile = Profile(user=user)
+            exp = Experience(profile=profile, company="Acme", role="Engineer")
+            exp.bullets = [ExperienceBullet(bullet_text="Built APIs")]
+            session.add_all([profile, exp, Resume(profile=profile, job_title="Backend Engineer", version=1)])
+            session.commit()
+            profile_id = profile.id
+
+        assert any(plan.startswith("SCAN") for plan in self._plans(legacy, profile_id))
+
+        with legacy.begin() as conn:
+            _foreign_key_indexes(conn)
+            _foreign_key_indexes(conn)  # idempotent
+
+        indexes = {name for table in inspect(legacy).get_table_names()
+                   for name in (i["name"] for i in inspect(legacy).get_indexes(table))}
+        assert {name for name, _, _ in _FOREIGN_KEY_INDEXES} <= indexes
+
+        plans = self._plans(legacy, profile_id)
+        assert not [plan for plan in plans if "SCAN" in plan], plans
+        assert any("COVERING INDEX ix_resumes_profile_title_version" in plan for plan in plans)
@@ -0,0 +1,287 @@
+"""Unit tests for the generation orchestrator."""
+
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.models.resume import Resume
+from app.repositories import ExperienceBulletRepo, SkillRepo
+from app.services import embedding_service, orchestrator
+from app.services.embedding_service import embedding_from_blob
+from app.models.jd import JDAnalysis
+from app.services.orchestrator import (
+    _ensure_embeddings, generate_resume, generate_resume_async,
+    generate_resumes_batch_async, preview_resume_async,
+)
+from tests.conftest import BACKEND_JD, seed_profile
+
+
+@pytest.fixture
+def remote_calls(monkeypatch):
+    """Fake embedding backend: returns a distinct vector per text, records batches."""
+    calls = []
+
+    def _fake_remote(texts, input_type):
+        calls.append(list(texts))
+        return [[float(len(t)), float(sum(map(ord, t)) % 97), 1.0] for t in texts]
+
+    monkeypatch.setattr(embedding_service, "_provider_embed", _fake_remote)
+    return calls
+
+
+class TestEnsureEmbeddings:
+    def test_single_batched_call(self, db, remote_calls, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        _ensure_embeddings(db, profile)
+
+        assert len(remote_calls) == 1
+        assert len(remote_calls[0]) == 6  # 4 experience + 2 project bullets
+        for section in profile.experience + profile.projects:
+            assert all(b.embedding for b in section.bullets)
+
+    def test_centroid_from_bullet_vectors(self, db, remote_calls, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        _ensure_embeddings(db, profile)
+
+        exp = profile.experience[0]
+        expected = np.mean([embedding_from_blob(b.embedding) for b in exp.bullets], axis=0)
+        assert np.allclose(embedding_from_blob(exp.experience_embedding), expected)
+
+    def test_no_calls_when_up_to_date(self, db, remote_calls, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        _ensure_embeddings(db, profile)
+        _ensure_embeddings(db, profile)
+        assert len(remote_calls) == 1
+
+    def test_edited_bullet_is_reembedded(self, db, remote_calls, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        _ensure_embeddings(db, profile)
+        exp = profile.experience[0]
+        old_centroid = exp.experience_embedding
+
+        ExperienceBulletRepo.update(db, exp.bullets[0].id, bullet_text="Cut p99 latency by 40%")
+        db.refresh(profile)
+        _ensure_embeddings(db, profile)
+
+        assert remote_calls[-1] == ["Cut p99 latency by 40%"]
+        assert exp.experience_embedding and exp.experience_embedding != old_centroid
+
+    def test_large_batches_are_chunked(self, monkeypatch, remote_calls):
+        monkeypatch.setattr(embedding_service.settings, "EMBEDDING_BATCH_SIZE", 4)
+        embedding_service.generate_embeddings([f"bullet {i}" for i in range(10)])
+        assert [len(c) for c in remote_calls] == [4, 4, 2]
+
+
+class TestGenerateResume:
+    def test_sync_pipeline(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        result = generate_resume(db, profile.id, BACKEND_JD)
+
+        assert result["version"] == 1
+        assert db.get(Resume, result["resume_id"]).sections
+        assert not os.listdir(orchestrator.settings.OUTPUT_DIR)  # rendered on download
+
+    @pytest.mark.parametrize("run_async", [False, True])
+    async def test_result_stored_in_one_commit(self, db, offline, run_async, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        _ensure_embeddings(db, profile)
+        commits = []
+        listener = lambda session: commits.append(session)  # noqa: E731
+        event.listen(db, "after_commit", listener)
+        try:
+            if run_async:
+                result = await generate_resume_async(db, profile.id, BACKEND_JD)
+            else:
+                result = generate_resume(db, profile.id, BACKEND_JD)
+        finally:
+            event.remove(db, "after_commit", listener)
+
+        assert len(commits) == 1  # JD analysis, resume and sections together
+        assert db.get(Resume, result["resume_id"]).sections
+
+    async def test_async_matches_sync(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        sync_result = generate_resume(db, profile.id, BACKEND_JD)
+        async_result = await generate_resume_async(db, profile.id, BACKEND_JD, force=True)
+
+        assert async_result["version"] == sync_result["version"] + 1
+        for key in ("job_title", "resume_data", "jd_analysis",
+                    "skill_confidence", "keyword_coverage"):
+            assert async_result[key] == sync_result[key]
+
+    async def test_async_embeds_profile_while_analyzing_jd(
+        self, db, offline, monkeypatch, strong_fit_profile_data,
+    ):
+        """The bullet embedding batch starts before JD analysis finishes."""
+        profile = seed_profile(db, strong_fit_profile_data)
+        bullets_started = threading.Event()
+        real_analyze = orchestrator.analyze_jd
+
+        def slow_analyze(text, deadline=None):
+            assert bullets_started.wait(timeout=5)
+            return real_analyze(text)
+
+        def embed(texts, input_type="passage"):
+            if len(texts) > 1:
+                bullets_started.set()
+            return embedding_service.generate_embeddings(texts, input_type)
+
+        monkeypatch.setattr(orchestrator, "analyze_jd", slow_analyze)
+        monkeypatch.setattr(orchestrator, "generate_embeddings", embed)
+
+        result = await generate_resume_async(db, profile.id, BACKEND_JD)
+        assert result["resume_id"]
+
+    async def test_async_paths_keep_sql_off_the_loop(self, db, offline, strong_fit_profile_data):
+        profile_id = seed_profile(db, strong_fit_profile_data).id
+        on_loop = []
+
+        def record(conn, cursor, statement, *args):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return  # a worker thread
+            on_loop.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            await generate_resume_async(db, profile_id, BACKEND_JD)
+            await generate_resume_async(db, profile_id, BACKEND_JD)  # cache hit
+            await preview_resume_async(db, profile_id, BACKEND_JD + " Kafka.")
+            await generate_resumes_batch_async(db, profile_id, [BACKEND_JD, BACKEND_JD + " Redis."])
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        assert on_loop == []
+
+    async def test_cancelled_generation_waits_for_session_work(
+        self, db, offline, monkeypatch, strong_fit_profile_data,
+    ):
+        """A cancelled caller gets control back only once its store thread is done."""
+        profile = seed_profile(db, strong_fit_profile_data)
+        storing, stored = threading.Event(), threading.Event()
+        real_store = orchestrator._store_generation
+
+        def slow_store(*args):
+            storing.set()
+            time.sleep(0.2)
+            result = real_store(*args)
+            stored.set()
+            return result
+
+        monkeypatch.setattr(orchestrator, "_store_generation", slow_store)
+        task = asyncio.create_task(generate_resume_async(db, profile.id, BACKEND_JD))
+        assert await asyncio.to_thread(storing.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert stored.is_set()
+
+
+class TestResultCache:
+    def test_identical_request_returns_stored_resume(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        first = generate_resume(db, profile.id, BACKEND_JD)
+        second = generate_resume(db, profile.id, "  " + BACKEND_JD.replace(". ", ".\n\n") + "\n")
+
+        assert first["cached"] is False and second["cached"] is True
+        assert second["resume_id"] == first["resume_id"]
+        assert second["resume_data"] == first["resume_data"]
+        assert second["keyword_coverage"] == first["keyword_coverage"]
+        assert second["jd_analysis"]["role_title"] == first["jd_analysis"]["role_title"]
+        assert db.query(Resume).count() == 1
+
+    async def test_async_hit_skips_pipeline(self, db, offline, monkeypatch, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        first = await generate_resume_async(db, profile.id, BACKEND_JD)
+        monkeypatch.setattr(orchestrator, "analyze_jd", lambda text: pytest.fail("pipeline ran"))
+
+        second = await generate_resume_async(db, profile.id, BACKEND_JD)
+        assert second["cached"] and second["resume_id"] == first["resume_id"]
+
+    async def test_hit_skips_profile_load(self, db, offline, monkeypatch, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        first = generate_resume(db, profile.id, BACKEND_JD)
+        monkeypatch.setattr(orchestrator.ProfileRepository, "get_full",
+                            staticmethod(lambda db, pid: pytest.fail("profile loaded")))
+
+        assert generate_resume(db, profile.id, BACKEND_JD)["resume_id"] == first["resume_id"]
+        assert (await generate_resume_async(db, profile.id, BACKEND_JD))["cached"]
+        assert (await preview_resume_async(db, profile.id, BACKEND_JD))["cached"]
+
+    def test_force_regenerates(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        generate_resume(db, profile.id, BACKEND_JD)
+        forced = generate_resume(db, profile.id, BACKEND_JD, force=True)
+
+        assert forced["cached"] is False and forced["version"] == 2
+        # The newest identical resume is the one served afterwards
+        assert generate_resume(db, profile.id, BACKEND_JD)["resume_id"] == forced["resume_id"]
+
+    def test_profile_edit_invalidates(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        first = generate_resume(db, profile.id, BACKEND_JD)
+        SkillRepo.create(db, profile.id, skill_name="Kubernetes", skill_category="DevOps")
+
+        second = generate_resume(db, profile.id, BACKEND_JD)
+        assert not second["cached"] and second["resume_id"] != first["resume_id"]
+
+    async def test_concurrent_identical_requests_generate_once(
+        self, db, offline, monkeypatch, strong_fit_profile_data,
+    ):
+        profile = seed_profile(db, strong_fit_profile_data)
+        calls = []
+        real_analyze = orchestrator.analyze_jd
+
+        def counting_analyze(text, deadline=None):
+            calls.append(text)
+            return real_analyze(text)
+
+        monkeypatch.setattr(orchestrator, "analyze_jd", counting_analyze)
+        results = await asyncio.gather(*(
+            generate_resume_async(db, profile.id, BACKEND_JD) for _ in range(3)
+        ))
+
+        assert len(calls) == 1
+        assert len({r["resume_id"] for r in results}) == 1
+        assert sorted(r["cached"] for r in results) == [False, True, True]
+
+
+class TestPreview:
+    async def test_matches_generation_without_persisting(self, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        preview = await preview_resume_async(db, profile.id, BACKEND_JD)
+
+        assert preview["cached"] is False
+        assert db.query(Resume).count() == 0
+        assert db.query(JDAnalysis).count() == 0
+        assert not os.listdir(orchestrator.settings.OUTPUT_DIR)
+
+        result = await generate_resume_async(db, profile.id, BACKEND_JD)
+        assert result["version"] == 1  # the preview did not use up a version
+        for key in ("job_title", "resume_data", "jd_analysis", "skill_confidence", "keyword_coverage"):
+            assert preview[key] == result[key]
+
+    async def test_reuses_generated_resume(self, db, offline, monkeypatch, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        result = generate_resume(db, profile.id, BACKEND_JD)
+        monkeypatch.setattr(orchestrator, "analyze_jd", lambda text: pytest.fail("pipeline ran"))
+
+        preview = await preview_resume_async(db, profile.id, BACKEND_JD)
+        assert preview["cached"] is True
+        assert preview["resume_data"] == result["resume_data"]
+
+    def test_endpoint(self, client, db, offline, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        resp = client.post("/api/resumes/preview", json={"profile_id": profile.id, "jd_text": BACKEND_JD})
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["resume_data"]["experience"]
+        assert "resume_id" not in body
+        assert db.query(Resume).count() == 0
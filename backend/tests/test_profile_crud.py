@@ -1,7 +1,42 @@
 """Unit tests for Profile CRUD operations."""
 
+import copy
+from contextlib import contextmanager
+
 import pytest
-from tests.conftest import create_full_profile
+from sqlalchemy import event
+
+from app.models.profile import Experience, ExperienceBullet
+from app.repositories import ExperienceBulletRepo, ExperienceRepo, ProfileRepository, unit_of_work
+from tests.conftest import create_full_profile, seed_profile
+
+
+@contextmanager
+def count_queries(db):
+    """Number of SQL statements executed on ``db``'s engine inside the block."""
+    statements = []
+    engine = db.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def count_commits(db):
+    """Number of commits of ``db`` inside the block."""
+    commits = []
+    listener = lambda session: commits.append(session)  # noqa: E731
+    event.listen(db, "after_commit", listener)
+    try:
+        yield commits
+    finally:
+        event.remove(db, "after_commit", listener)
 
 
 class TestUserCRUD:
@@ -222,3 +257,77 @@ class TestFullProfileCreation:
         assert len(data["certifications"]) == 1
         assert len(data["achievements"]) == 1
         assert len(data["external_profiles"]) == 2
+
+
+class TestFullProfileLoading:
+    @staticmethod
+    def _grown(profile_data, copies):
+        data = copy.deepcopy(profile_data)
+        for key in ("education", "skills", "experience", "projects",
+                    "certifications", "achievements", "external_profiles"):
+            data[key] = data.get(key, []) * copies
+        return data
+
+    def _load_queries(self, db, profile_data, username):
+        profile = seed_profile(db, profile_data, username=username, email=f"{username}@example.com")
+        db.expunge_all()
+        with count_queries(db) as statements:
+            loaded = ProfileRepository.get_full(db, profile.id)
+            assert loaded.personal_info is not None and loaded.skills
+            assert all(section.bullets for section in loaded.experience + loaded.projects)
+        return len(statements)
+
+    def test_query_count_independent_of_profile_size(self, db, strong_fit_profile_data):
+        small = self._load_queries(db, strong_fit_profile_data, "small")
+        large = self._load_queries(db, self._grown(strong_fit_profile_data, 5), "large")
+        assert small == large
+
+    def test_read_endpoint_uses_full_loader(self, client, db, strong_fit_profile_data):
+        counts = []
+        for copies, username in ((1, "small"), (4, "large")):
+            data = self._grown(strong_fit_profile_data, copies)
+            profile = seed_profile(db, data, username=username, email=f"{username}@example.com")
+            db.expunge_all()
+            with count_queries(db) as statements:
+                resp = client.get(f"/api/profiles/{profile.id}")
+            assert resp.status_code == 200
+            assert len(resp.json()["experience"]) == len(data["experience"])
+            counts.append(len(statements))
+        assert counts[0] == counts[1]
+
+    def test_missing_profile_is_404(self, db):
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as exc:
+            ProfileRepository.get_full(db, "missing")
+        assert exc.value.status_code == 404
+
+
+class TestUnitOfWork:
+    def test_nested_writes_commit_once(self, db, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        with count_commits(db) as commits:
+            with unit_of_work(db):
+                exp = ExperienceRepo.create(db, profile.id, company="Acme", role="Engineer")
+                ExperienceBulletRepo.create_many(
+                    db, exp.id, [{"bullet_text": f"Shipped feature {i}"} for i in range(8)],
+                )
+        assert len(commits) == 1
+        assert db.query(ExperienceBullet).filter(ExperienceBullet.experience_id == exp.id).count() == 8
+
+    def test_error_rolls_back_everything(self, db, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        before = db.query(Experience).count()
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db):
+                ExperienceRepo.create(db, profile.id, company="Acme", role="Engineer")
+                with unit_of_work(db):  # inner blocks leave the commit to the outer one
+                    ExperienceRepo.create(db, profile.id, company="Initech", role="Engineer")
+                raise RuntimeError("abort")
+        assert db.query(Experience).count() == before
+
+    def test_repositories_commit_on_their_own_outside(self, db, strong_fit_profile_data):
+        profile = seed_profile(db, strong_fit_profile_data)
+        with count_commits(db) as commits:
+            ExperienceRepo.create(db, profile.id, company="Acme", role="Engineer")
+        assert len(commits) == 1
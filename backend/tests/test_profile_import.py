@@ -0,0 +1,127 @@
+"""Tests for bulk profile import (own format and JSON Resume)."""
+
+from sqlalchemy import event
+
+from app.models.profile import ExperienceBullet, ProjectBullet
+from app.schemas import ProfileImport
+from app.services import orchestrator
+from app.services.profile_import import from_json_resume, import_profile
+from tests.conftest import seed_profile
+
+JSON_RESUME = {
+    "basics": {
+        "name": "Jane Roe",
+        "email": "jane@example.com",
+        "phone": "+1 555 0100",
+        "profiles": [{"network": "GitHub", "url": "https://github.com/janeroe"}],
+    },
+    "work": [{
+        "name": "Acme",
+        "position": "Backend Engineer",
+        "startDate": "2020-01-01",
+        "highlights": ["Built billing APIs in Python", "Cut p99 latency by 40%"],
+    }],
+    "education": [{
+        "institution": "State University", "area": "Computer Science",
+        "studyType": "B.Sc.", "startDate": "2014-09", "endDate": "2018-06",
+    }],
+    "skills": [{"name": "Backend", "keywords": ["Python", "PostgreSQL"]}, {"name": "Docker"}],
+    "projects": [{"name": "Ledger", "keywords": ["Go", "gRPC"], "highlights": ["Wrote a double-entry ledger"]}],
+    "certificates": [{"name": "CKA", "issuer": "CNCF", "date": "2022-03-01"}],
+    "awards": [{"title": "Hackathon winner", "summary": "First place"}],
+}
+
+
+def _empty_profile(db, username="importer"):
+    return seed_profile(db, {}, username=username, email=f"{username}@example.com")
+
+
+class TestJSONResumeMapping:
+    def test_sections_are_mapped(self):
+        data = ProfileImport.model_validate(from_json_resume(JSON_RESUME))
+
+        assert data.personal_info.full_name == "Jane Roe"
+        assert data.experience[0].company == "Acme"
+        assert [b.bullet_text for b in data.experience[0].bullets] == JSON_RESUME["work"][0]["highlights"]
+        assert (data.education[0].start_year, data.education[0].end_year) == (2014, 2018)
+        assert [(s.skill_name, s.skill_category) for s in data.skills] == [
+            ("Python", "Backend"), ("PostgreSQL", "Backend"), ("Docker", "Docker"),
+        ]
+        assert data.projects[0].tech_stack == "Go, gRPC"
+        assert data.certifications[0].year == 2022
+        assert data.external_profiles[0].platform == "GitHub"
+
+
+class TestImport:
+    def test_single_commit(self, db):
+        profile = _empty_profile(db)
+        data = ProfileImport.model_validate(from_json_resume(JSON_RESUME))
+        commits = []
+        listener = lambda session: commits.append(session)  # noqa: E731
+        event.listen(db, "after_commit", listener)
+        try:
+            assert import_profile(db, profile.id, data) == 3
+        finally:
+            event.remove(db, "after_commit", listener)
+        assert len(commits) == 1
+
+    def test_json_resume_endpoint(self, client, db):
+        profile = _empty_profile(db)
+        resp = client.post(f"/api/profiles/{profile.id}/import", json=JSON_RESUME)
+
+        assert resp.status_code == 201
+        body = resp.json()
+        assert body["personal_info"]["full_name"] == "Jane Roe"
+        assert len(body["experience"][0]["bullets"]) == 2
+        assert len(body["skills"]) == 3
+
+    def test_profile_out_round_trip(self, client, db, strong_fit_profile_data):
+        source = seed_profile(db, strong_fit_profile_data)
+        exported = client.get(f"/api/profiles/{source.id}").json()
+        target = _empty_profile(db)
+
+        resp = client.post(f"/api/profiles/{target.id}/import", json=exported)
+        assert resp.status_code == 201
+
+        def strip(doc):
+            keys = ("personal_info", "education", "skills", "experience", "projects",
+                    "certifications", "achievements", "external_profiles")
+            return _without_ids({k: doc[k] for k in keys})
+
+        assert strip(resp.json()) == strip(exported)
+
+    def test_bullets_embedded_in_one_batch(self, client, db, monkeypatch):
+        calls = []
+        real = orchestrator.generate_embeddings
+
+        def tracked(texts, *args, **kwargs):
+            calls.append(len(texts))
+            return real(texts, *args, **kwargs)
+
+        monkeypatch.setattr(orchestrator, "generate_embeddings", tracked)
+        profile = _empty_profile(db)
+        resp = client.post(f"/api/profiles/{profile.id}/import", json=JSON_RESUME)
+        assert resp.status_code == 201
+
+        assert calls == [3]
+        db.expire_all()
+        assert all(b.embedding for b in db.query(ExperienceBullet).all() + db.query(ProjectBullet).all())
+
+    def test_invalid_document_is_rejected(self, client, db):
+        profile = _empty_profile(db)
+        resp = client.post(f"/api/profiles/{profile.id}/import",
+                           json={"experience": [{"company": "Acme"}]})
+        assert resp.status_code == 422
+        assert db.query(ExperienceBullet).count() == 0
+
+    def test_unknown_profile_is_404(self, client):
+        resp = client.post("/api/profiles/missing/import", json=JSON_RESUME)
+        assert resp.status_code == 404
+
+
+def _without_ids(value):
+    if isinstance(value, dict):
+        return {k: _without_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return sorted((_without_ids(v) for v in value), key=repr)
+    return value
@@ -0,0 +1,111 @@
+"""Unit tests for the per-profile embedding matrix cache."""
+
+import numpy as np
+import pytest
+
+from app.models.profile import Profile
+from app.services import profile_matrix_cache
+from app.services.embedding_service import embedding_from_blob, embedding_to_blob
+from app.services.profile_matrix_cache import ProfileMatrixCache, profile_matrices
+from tests.conftest import seed_profile
+
+
+@pytest.fixture
+def embedded_profile(db, strong_fit_profile_data):
+    profile = seed_profile(db, strong_fit_profile_data)
+    rng = np.random.default_rng(5)
+    for section in profile.experience + profile.projects:
+        for b in section.bullets:
+            b.embedding = embedding_to_blob(rng.standard_normal(6) * 3)
+    db.commit()
+    return profile
+
+
+def _version(db, profile_id):
+    db.expire_all()
+    return db.get(Profile, profile_id).content_version
+
+
+class TestVersionStamps:
+    def test_section_writes_bump_version(self, client, db, embedded_profile):
+        pid = embedded_profile.id
+        v0 = _version(db, pid)
+
+        client.post(f"/api/profiles/{pid}/skills", json={"skill_name": "Go"})
+        v1 = _version(db, pid)
+        assert v1 > v0
+
+        client.put(f"/api/profiles/{pid}/personal-info", json={"full_name": "J. Doe"})
+        v2 = _version(db, pid)
+        assert v2 > v1
+
+        bullet_id = embedded_profile.experience[0].bullets[0].id
+        from app.repositories import ExperienceBulletRepo
+        ExperienceBulletRepo.update(db, bullet_id, bullet_text="Edited bullet")
+        assert _version(db, pid) > v2
+
+
+class TestProfileMatrixCache:
+    def test_rows_and_norms_in_selection_order(self, db, embedded_profile):
+        entry = profile_matrices.get_or_build(db, embedded_profile)
+        bullets = [b for s in embedded_profile.experience + embedded_profile.projects
+                   for b in s.bullets]
+        assert entry.bullet_ids == [b.id for b in bullets]
+        assert entry.matrix.dtype == np.float32
+        for row, bullet in zip(entry.matrix, bullets):
+            assert row.tolist() == embedding_from_blob(bullet.embedding).tolist()  # not normalized
+        assert entry.norms.dtype == np.float64
+        assert entry.norms.tolist() == np.linalg.norm(entry.matrix.astype(np.float64), axis=1).tolist()
+
+    def test_repeat_lookup_skips_decoding(self, db, embedded_profile, monkeypatch):
+        first = profile_matrices.get_or_build(db, embedded_profile)
+
+        def _no_decode(*args, **kwargs):
+            raise AssertionError("matrix should come from cache")
+
+        monkeypatch.setattr(profile_matrix_cache, "embedding_from_blob", _no_decode)
+        assert profile_matrices.get_or_build(db, embedded_profile) is first
+
+    def test_version_bump_invalidates(self, db, embedded_profile):
+        first = profile_matrices.get_or_build(db, embedded_profile)
+        from app.repositories import SkillRepo
+        SkillRepo.create(db, embedded_profile.id, skill_name="Rust")
+        second = profile_matrices.get_or_build(db, embedded_profile)
+        assert second is not first
+        assert second.version > first.version
+
+    def test_memory_bound_evicts_least_recent(self):
+        make = lambda: profile_matrix_cache.ProfileMatrix(
+            version=0, bullet_ids=list("abcd"),
+            matrix=np.zeros((4, 4), dtype=np.float32), has_embedding=np.ones(4, dtype=bool),
+        )
+        cache = ProfileMatrixCache(max_bytes=2 * make().nbytes)
+        cache.put("p1", make())
+        cache.put("p2", make())
+        cache.get("p1", 0)
+        cache.put("p3", make())
+        assert cache.get("p1", 0) is not None
+        assert cache.get("p2", 0) is None
+        assert cache.get("p3", 0) is not None
+
+    def test_bullet_added_without_version_bump_triggers_rebuild(self, db, embedded_profile):
+        from app.models.profile import ExperienceBullet
+        first = profile_matrices.get_or_build(db, embedded_profile)
+        bullet = ExperienceBullet(bullet_text="Wrote a new service",
+                                  embedding=embedding_to_blob(np.ones(6)))
+        embedded_profile.experience[0].bullets.append(bullet)
+        db.flush()  # bypasses the repositories, so content_version is unchanged
+
+        second = profile_matrices.get_or_build(db, embedded_profile)
+        assert second is not first
+        assert bullet.id in second.row_of
+
+    def test_unknown_bullet_scored_without_embedding(self):
+        entry = profile_matrix_cache.ProfileMatrix(
+            version=0, bullet_ids=["a", "b"],
+            matrix=np.eye(2, dtype=np.float32), has_embedding=np.ones(2, dtype=bool),
+        )
+        matrix, mask, norms = entry.rows_for(["b", "missing"])
+        assert matrix.tolist() == [[0.0, 1.0], [0.0, 0.0]]
+        assert mask.tolist() == [True, False]
+        assert norms.tolist() == [1.0, 0.0]
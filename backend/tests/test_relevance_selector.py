@@ -76,3 +76,88 @@ class TestKeywordCoverage:
         # "microservices" unlikely to appear
         if "microservices" in coverage:
             assert coverage["microservices"] is False
+
+
+class TestSkillConfidence:
+    def test_direct_and_text_matches_skip_embedding(self, monkeypatch):
+        from app.services import relevance_selector
+
+        def _fail(texts):
+            raise AssertionError("should not embed")
+
+        monkeypatch.setattr(relevance_selector, "generate_embeddings", _fail)
+        result = relevance_selector._check_skill_confidence(
+            ["Python", "Docker"], ["Python 3"], ["Shipped services with Docker"], None,
+        )
+        assert result == {"Python": "strong", "Docker": "inferred"}
+
+    def test_remaining_skills_embedded_in_one_batch(self, monkeypatch):
+        import numpy as np
+        from app.services import relevance_selector
+
+        calls = []
+        skill_vectors = {"Kubernetes": [1.0, 0.0], "Terraform": [0.0, 1.0]}
+
+        def _fake_embeddings(texts):
+            calls.append(list(texts))
+            return [skill_vectors[t] for t in texts]
+
+        monkeypatch.setattr(relevance_selector, "generate_embeddings", _fake_embeddings)
+        bullet_matrix = np.float32([[0.9, 0.1], [0.2, 0.1]])
+        result = relevance_selector._check_skill_confidence(
+            ["Kubernetes", "Terraform"], [],
+            ["Ran container clusters", "Wrote docs"], bullet_matrix,
+        )
+        assert calls == [["Kubernetes", "Terraform"]]
+        assert result == {"Kubernetes": "inferred", "Terraform": "weak"}
+
+    def test_embedding_failure_degrades_to_weak(self, monkeypatch):
+        import numpy as np
+        from app.services import relevance_selector
+
+        def _boom(texts):
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(relevance_selector, "generate_embeddings", _boom)
+        result = relevance_selector._check_skill_confidence(
+            ["Rust"], [], ["Wrote Go services"], np.float32([[1.0, 0.0]]),
+        )
+        assert result == {"Rust": "weak"}
+
+
+class TestSelectRelevantContent:
+    def test_scores_match_scalar_scoring(
+        self, db, monkeypatch, jd_data, strong_fit_profile_data
+    ):
+        import numpy as np
+        from app.services import relevance_selector
+        from app.services.embedding_service import embedding_to_blob, embedding_from_blob
+        from app.services.scoring_engine import score_bullet
+        from tests.conftest import seed_profile
+
+        monkeypatch.setattr(relevance_selector, "generate_embeddings",
+                            lambda texts: [[0.0] * 4 for _ in texts])
+        profile = seed_profile(db, strong_fit_profile_data)
+        rng = np.random.default_rng(3)
+        for section in profile.experience + profile.projects:
+            for b in section.bullets:
+                b.embedding = embedding_to_blob(rng.standard_normal(4))
+        db.commit()
+
+        jd_emb = [0.5, -0.2, 0.1, 0.7]
+        draft = relevance_selector.select_relevant_content(db, profile, jd_data, jd_emb)
+
+        by_id = {
+            b.id: (b, s)
+            for s in profile.experience + profile.projects for b in s.bullets
+        }
+        for section in draft.experience_sections + draft.project_sections:
+            assert section.bullets == sorted(section.bullets, key=lambda b: -b.score)
+            for scored in section.bullets:
+                bullet, owner = by_id[scored.id]
+                kind = "experience" if section.section_type == "experience" else "project"
+                end = getattr(owner, "end_date", None)
+                assert scored.score == score_bullet(
+                    bullet.bullet_text, embedding_from_blob(bullet.embedding),
+                    jd_emb, jd_data, kind, end,
+                )
@@ -3,7 +3,9 @@
 import json
 import pytest
 from app.domain.resume_draft import ResumeDraft, JDData, ScoredSection, ScoredBullet
-from app.services.resume_assembler import assemble_resume, resume_to_sections_json
+from app.services.resume_assembler import (
+    assemble_resume, resume_to_sections_json, sections_to_resume,
+)
 
 
 @pytest.fixture
@@ -106,3 +108,8 @@ class TestResumeSectionsJSON:
             # content should be valid JSON
             parsed = json.loads(section["content"])
             assert parsed is not None
+
+    def test_round_trip(self, complete_draft):
+        resume_data = assemble_resume(complete_draft)
+        sections = resume_to_sections_json(resume_data)
+        assert sections_to_resume(resume_data["job_title"], sections) == resume_data
@@ -1,5 +1,6 @@
 """Unit tests for Scoring Engine."""
 
+import numpy as np
 import pytest
 from app.services.scoring_engine import (
     compute_recency_weight, compute_keyword_bonus,
@@ -118,3 +119,84 @@ class TestScoreSection:
             jd_data, "experience", "Present",
         )
         assert score > 0
+
+
+class TestBatchScoring:
+    def _cases(self, jd_data):
+        rng = np.random.default_rng(7)
+        texts = [
+            "Built REST APIs using Python and FastAPI",
+            "Deployed using Docker containers",
+            "Organized team lunches",
+            "Python FastAPI PostgreSQL REST microservices Docker Kubernetes",
+            "Migrated PostgreSQL to microservices",
+            "No vector for this one",
+        ]
+        section_types = ["experience", "experience", "project", "experience", "skill", "project"]
+        end_dates = ["Present", "2019-03", None, "1990-01", "bogus", None]
+        embeddings = [rng.standard_normal(8).astype(np.float32) for _ in texts[:-1]] + [None]
+        return texts, section_types, end_dates, embeddings
+
+    def test_matches_scalar_path(self, jd_data):
+        from app.services.embedding_service import stack_embeddings
+        from app.services.scoring_engine import bullet_features, score_bullets
+
+        texts, section_types, end_dates, embeddings = self._cases(jd_data)
+        jd_emb = np.random.default_rng(11).standard_normal(8).astype(np.float32)
+
+        matrix, mask = stack_embeddings(embeddings)
+        hits, importance = bullet_features(texts, jd_data)
+        batch = score_bullets(matrix, jd_emb, section_types, end_dates, hits, importance,
+                              has_embedding=mask)
+
+        expected = [
+            score_bullet(t, e, jd_emb, jd_data, st, d)
+            for t, e, st, d in zip(texts, embeddings, section_types, end_dates)
+        ]
+        assert batch.tolist() == expected
+
+    def test_cached_row_norms_match_scalar_path(self, jd_data):
+        from app.services.embedding_service import stack_embeddings
+        from app.services.scoring_engine import bullet_features, score_bullets
+
+        texts, section_types, end_dates, embeddings = self._cases(jd_data)
+        jd_emb = np.random.default_rng(11).standard_normal(8).astype(np.float32)
+
+        matrix, mask = stack_embeddings(embeddings)
+        norms = np.linalg.norm(matrix.astype(np.float64), axis=1)
+        hits, importance = bullet_features(texts, jd_data)
+        batch = score_bullets(matrix, jd_emb, section_types, end_dates, hits, importance,
+                              has_embedding=mask, row_norms=norms)
+
+        expected = [
+            score_bullet(t, e, jd_emb, jd_data, st, d)
+            for t, e, st, d in zip(texts, embeddings, section_types, end_dates)
+        ]
+        assert batch.tolist() == expected
+
+    def test_without_jd_embedding_uses_default(self, jd_data):
+        from app.services.scoring_engine import bullet_features, score_bullets
+
+        texts = ["Organized team lunches"]
+        hits, importance = bullet_features(texts, jd_data)
+        batch = score_bullets(np.ones((1, 3)), [], ["experience"], ["Present"], hits, importance)
+        assert batch.tolist() == [score_bullet(texts[0], [1, 1, 1], [], jd_data)]
+
+    def test_keyword_bonus_cap(self):
+        from app.services.scoring_engine import KEYWORD_BONUS_CAP, bullet_features, score_bullets
+
+        terms = ["Python", "FastAPI", "PostgreSQL", "REST", "microservices",
+                 "Docker", "Kubernetes", "Redis", "Kafka"]
+        wide_jd = JDData(role_title="Backend Engineer", keywords=terms)
+        assert len(terms) * KEYWORD_BONUS > KEYWORD_BONUS_CAP  # the cap binds
+
+        texts = [" ".join(terms[:k]) for k in (5, 7, len(terms))]
+        hits, importance = bullet_features(texts, wide_jd)
+        assert hits.tolist() == [5, 7, len(terms)]
+        # A zero vector has zero cosine, so the score is the keyword bonus alone
+        bonus = score_bullets(np.zeros((3, 3)), [1.0, 0.0, 0.0], ["experience"] * 3,
+                              [None] * 3, hits, importance)
+        for text, count, value in zip(texts, hits, bonus):
+            assert value == round(min(count * KEYWORD_BONUS, KEYWORD_BONUS_CAP), 4)
+            assert value == compute_keyword_bonus(text, wide_jd)
+        assert bonus[-1] == KEYWORD_BONUS_CAP
@@ -0,0 +1,104 @@
+"""Unit tests for the stage cache behind incremental regeneration."""
+
+import pytest
+
+from app.domain.resume_draft import JDData, ScoredBullet
+from app.models.stage_cache import StageCacheEntry
+from app.services import jd_analyzer, llm_service
+from app.services.stage_cache import stage_cache, stage_key
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    monkeypatch.setattr(jd_analyzer.settings, "GEMINI_API_KEY", "test-key")
+
+
+class TestStageKey:
+    def test_every_input_is_part_of_key(self):
+        base = stage_key("rewrite", "m", "Engineer", ["Python"], "Built APIs")
+        assert stage_key("rewrite", "m", "Engineer", ["Python"], "Built APIs") == base
+        assert stage_key("rewrite", "m2", "Engineer", ["Python"], "Built APIs") != base
+        assert stage_key("rewrite", "m", "Engineer", ["Go"], "Built APIs") != base
+        assert stage_key("jd_analysis", "m", "Engineer", ["Python"], "Built APIs") != base
+
+
+class TestStageCache:
+    def test_persistent_layer_survives_memory_eviction(self, db):
+        stage_cache.put_many("rewrite", {"k1": "Built REST APIs"})
+        stage_cache.clear_memory()
+        assert stage_cache.get_many(["k1", "k2"]) == {"k1": "Built REST APIs"}
+        assert db.query(StageCacheEntry).count() == 1
+
+    def test_repeated_put_is_harmless(self, db):
+        stage_cache.put_many("rewrite", {"k1": "a"})
+        stage_cache.clear_memory()
+        stage_cache.put_many("rewrite", {"k1": "a"})
+        assert db.query(StageCacheEntry).count() == 1
+
+
+class TestCachedJDAnalysis:
+    def test_gemini_analysis_reused(self, gemini, monkeypatch):
+        calls = []
+
+        def fake_gemini(text, timeout=None):
+            calls.append(text)
+            return JDData(role_title="Backend Engineer", keywords=["Python"])
+
+        monkeypatch.setattr(jd_analyzer, "analyze_jd_with_gemini", fake_gemini)
+        first = jd_analyzer.analyze_jd("Backend Engineer. Python required.")
+        second = jd_analyzer.analyze_jd("Backend Engineer.  Python required.\n")
+
+        assert first == second
+        assert len(calls) == 1
+
+    def test_fallback_result_not_cached(self, db, gemini, monkeypatch):
+        def failing_gemini(text, timeout=None):
+            raise RuntimeError("quota exceeded")
+
+        monkeypatch.setattr(jd_analyzer, "analyze_jd_with_gemini", failing_gemini)
+        jd_analyzer.analyze_jd("Backend Engineer. Python required.")
+        assert db.query(StageCacheEntry).count() == 0
+
+
+class TestIncrementalRewrite:
+    @pytest.fixture
+    def gemini_calls(self, gemini, monkeypatch):
+        calls = []
+
+        def fake_gemini(bullets, job_title, keywords, timeout=None):
+            calls.append([b.text for b in bullets])
+            for b in bullets:
+                b.rewritten_text = f"Rewrote: {b.text}"
+            return bullets
+
+        monkeypatch.setattr(llm_service, "rewrite_bullets_with_gemini", fake_gemini)
+        return calls
+
+    @staticmethod
+    def _bullets(*texts):
+        return [ScoredBullet(id=str(i), text=t) for i, t in enumerate(texts)]
+
+    def test_only_changed_bullets_are_sent(self, gemini_calls):
+        llm_service.rewrite_bullets_incremental(
+            self._bullets("Built APIs", "Tuned queries"), "Engineer", ["Python"],
+        )
+        edited = llm_service.rewrite_bullets_incremental(
+            self._bullets("Built APIs", "Tuned slow SQL queries"), "Engineer", ["Python"],
+        )
+
+        assert gemini_calls == [["Built APIs", "Tuned queries"], ["Tuned slow SQL queries"]]
+        assert [b.rewritten_text for b in edited] == [
+            "Rewrote: Built APIs", "Rewrote: Tuned slow SQL queries",
+        ]
+
+    def test_new_title_or_keywords_rewrite_again(self, gemini_calls):
+        llm_service.rewrite_bullets_incremental(self._bullets("Built APIs"), "Engineer", ["Python"])
+        llm_service.rewrite_bullets_incremental(self._bullets("Built APIs"), "Engineer", ["Go"])
+        llm_service.rewrite_bullets_incremental(self._bullets("Built APIs"), "SRE", ["Go"])
+        assert len(gemini_calls) == 3
+
+    def test_disabled_cache_always_calls_gemini(self, gemini_calls, monkeypatch):
+        monkeypatch.setattr(llm_service.settings, "STAGE_CACHE_ENABLED", False)
+        for _ in range(2):
+            llm_service.rewrite_bullets_incremental(self._bullets("Built APIs"), "Engineer", [])
+        assert len(gemini_calls) == 2
@@ -139,11 +139,12 @@ export interface GenerateResult {
     resume_id: string;
     job_title: string;
     version: number;
-    pdf_path: string;
-    docx_path: string;
     jd_analysis: JDStructured;
     skill_confidence: Record<string, string>;
     keyword_coverage: Record<string, boolean>;
+    cached: boolean;
+    degraded: string[];
+    downloads: Record<"pdf" | "docx", string>;
 }
 
 /* ── Users ──────────────────────────────────────────────────── */